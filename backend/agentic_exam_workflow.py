@@ -69,7 +69,7 @@ class AgenticExamWorkflow:
             logger.info(f"📄 Processing PDF: {pdf_path}")
             
             # Step 1: Extract text from PDF
-            pdf_result = self.pdf_processor.extract_text_from_pdf(pdf_path)
+            pdf_result = self.pdf_processor.process(pdf_path)
             if not pdf_result['success']:
                 return {
                     'success': False,
@@ -731,6 +731,8 @@ class ExamAccessibilityHelper:
         self.user_answers = {}
         self.exam_state = "intro"  # intro, waiting_for_ready, reading_question, waiting_for_command, waiting_for_answer, exam_complete
         self.last_reading_speed = "normal"
+        self._status_cache = None
+        self._status_key = None
     
     def load_exam(self, pdf_text: str, exam_title: str = "Exam") -> Dict[str, Any]:
         """
@@ -1014,16 +1016,32 @@ class ExamAccessibilityHelper:
     
     def get_exam_status(self) -> Dict[str, Any]:
         """Get current exam status"""
-        return {
-            'exam_title': self.exam_title,
-            'total_questions': len(self.exam_questions),
-            'current_question': self.current_question_index + 1,
-            'answers_provided': len(self.user_answers),
-            'progress_percentage': round((self.current_question_index + 1) / len(self.exam_questions) * 100, 1) if self.exam_questions else 0,
-            'completion_percentage': round(len(self.user_answers) / len(self.exam_questions) * 100, 1) if self.exam_questions else 0,
-            'elapsed_time_minutes': round((time.time() - self.start_time) / 60, 1) if self.start_time else 0,
-            'exam_state': self.exam_state
-        }
+        # Everything except the elapsed time only changes on a state transition, so
+        # the aggregated snapshot is rebuilt only when one of its inputs moved
+        status_key = (
+            self.exam_title,
+            id(self.exam_questions),
+            len(self.exam_questions),
+            self.current_question_index,
+            len(self.user_answers),
+            self.exam_state
+        )
+        
+        if self._status_key != status_key:
+            self._status_cache = {
+                'exam_title': self.exam_title,
+                'total_questions': len(self.exam_questions),
+                'current_question': self.current_question_index + 1,
+                'answers_provided': len(self.user_answers),
+                'progress_percentage': round((self.current_question_index + 1) / len(self.exam_questions) * 100, 1) if self.exam_questions else 0,
+                'completion_percentage': round(len(self.user_answers) / len(self.exam_questions) * 100, 1) if self.exam_questions else 0,
+                'exam_state': self.exam_state
+            }
+            self._status_key = status_key
+        
+        status = dict(self._status_cache)
+        status['elapsed_time_minutes'] = round((time.time() - self.start_time) / 60, 1) if self.start_time else 0
+        return status
     
     def start_exam(self) -> Dict[str, Any]:
         """Start the exam after intro"""
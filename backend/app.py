@@ -3,17 +3,25 @@ Flask Backend API for AI Learning Assistant
 Handles PDF processing, TTS, and Whisper transcription
 """
 
-from flask import Flask, request, jsonify, send_file, session
+from flask import Flask, request, jsonify, send_file, session, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from werkzeug.utils import secure_filename
+from werkzeug.utils import secure_filename, safe_join
 import os
+import re
+import hashlib
 import tempfile
 import uuid
+import itertools
 import threading
 import queue
 import time
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from collections import OrderedDict
 from pathlib import Path
+from urllib.parse import urlencode
 import yaml
 from anythingllm_integration import ExamAccessibilityHelper
 
@@ -37,15 +45,23 @@ except ImportError as e:
 try:
     # For hackathon demo: Use built Whisper executable instead of Python package
     # This avoids memory issues while showcasing Whisper functionality
-    from standalone_whisper_integration import WhisperTranscriber
+    from standalone_whisper_integration import WhisperTranscriber, get_transcriber
     WHISPER_DEMO_MODE = True
 except ImportError as e:
     print(f"Warning: Could not import WhisperTranscriber: {e}")
     print("Note: Whisper functionality will run in demo mode for hackathon")
     WhisperTranscriber = None
+    get_transcriber = None
     StandaloneWhisperApp = None
     WHISPER_DEMO_MODE = True
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 # Add AnythingLLM integration for exam helper
 try:
     from anythingllm_integration import AnythingLLMExamReader
@@ -64,8 +80,29 @@ except ImportError as e:
     ExamAccessibilityHelper = None
     ANYTHINGLLM_AVAILABLE = False
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, so every jsonify() response is serialized in C"""
+    
+    OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if ORJSON_AVAILABLE else 0
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.OPTIONS).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response without a str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.OPTIONS),
+            mimetype=self.mimetype
+        )
+
 app = Flask(__name__)
 app.secret_key = 'ai-learning-assistant-secret-key'
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
 CORS(app, supports_credentials=True)
 
 # Logging setup - moved here to be available throughout the file
@@ -77,15 +114,37 @@ UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'uploads')
 AUDIO_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'audio_files')
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
 ALLOWED_EXTENSIONS = {'pdf', 'txt'}  # Added txt for testing
+AUDIO_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Content-addressed TTS files never change; they live under two hash-prefix shard directories
+HASHED_AUDIO_RE = re.compile(r'^[0-9a-f]{2}/[0-9a-f]{2}/tts_[0-9a-f]{32}\.wav$')
 
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(AUDIO_FOLDER, exist_ok=True)
 
+# Resolved once so hot endpoints only do a cheap join per request
+UPLOAD_DIR = Path(UPLOAD_FOLDER).resolve()
+AUDIO_DIR = Path(AUDIO_FOLDER).resolve()
+
 # Global instances
 pdf_processor = PDFProcessor() if PDFProcessor else None
 tts_engine = TTSEngine() if TTSEngine else None
 whisper_transcriber = None
 
+# Pool of warmed TTS engines leased per synthesis. pyttsx3.init() returns one shared
+# engine per speech driver, so extra instances only help drivers that allow it.
+TTS_POOL_SIZE = int(os.environ.get('TTS_POOL_SIZE', '1'))
+TTS_LEASE_TIMEOUT = 30  # seconds to wait for a free engine before answering 503
+_tts_pool = None
+
+class TTSBusyError(RuntimeError):
+    """No pooled TTS engine became free within TTS_LEASE_TIMEOUT"""
+
+# Background synthesis for audio URLs handed out before the file exists
+TTS_PENDING_TIMEOUT = 60  # seconds an audio request waits for in-flight synthesis
+_tts_executor = ThreadPoolExecutor(max_workers=max(1, TTS_POOL_SIZE), thread_name_prefix='tts')
+_pending_tts = {}  # Maps relative audio path to the Future synthesizing it
+_pending_tts_lock = threading.Lock()
+
 # AnythingLLM instances for exam helper  
 anythingllm_reader = None
 agentic_workflow = None
@@ -114,8 +173,95 @@ if ANYTHINGLLM_AVAILABLE:
 # Active sessions storage
 active_sessions = {}
 
+# Temporary files are deleted off the request path by a background worker
+_cleanup_queue = queue.Queue()
+
+def _cleanup_worker():
+    """Delete temporary files queued by request handlers"""
+    while True:
+        path = _cleanup_queue.get()
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"⚠️ Failed to remove temporary file {path}: {e}")
+        finally:
+            _cleanup_queue.task_done()
+
+threading.Thread(target=_cleanup_worker, name='file-cleanup', daemon=True).start()
+
+def _schedule_cleanup(path: str):
+    """Queue a temporary file for deletion"""
+    _cleanup_queue.put(path)
+
 # Exam state management - using AnythingLLM integration
-exam_sessions = {}  # Maps session_id to ExamAccessibilityHelper instances
+class ExamSessionStore:
+    """
+    Bounded LRU mapping of session_id to exam state, with idle expiry
+    
+    Reads refresh a session's recency, so only sessions nobody is using are evicted.
+    """
+    
+    def __init__(self, maxsize: int = 1000, ttl: float = 3 * 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._sessions = OrderedDict()  # session_id -> (last_access, value)
+        self._lock = threading.Lock()
+    
+    def _evict_expired(self, now: float):
+        while self._sessions:
+            session_id, (last_access, _) = next(iter(self._sessions.items()))
+            if now - last_access < self.ttl:
+                break
+            del self._sessions[session_id]
+            logger.info(f"🧹 Exam session {session_id} expired after {self.ttl / 3600:.1f}h idle")
+    
+    def __contains__(self, session_id) -> bool:
+        with self._lock:
+            self._evict_expired(time.monotonic())
+            return session_id in self._sessions
+    
+    def get(self, session_id, default=None):
+        """Value for session_id, refreshing its idle timer; default if missing or expired"""
+        with self._lock:
+            self._evict_expired(time.monotonic())
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return default
+            self._sessions[session_id] = (time.monotonic(), entry[1])
+            self._sessions.move_to_end(session_id)
+            return entry[1]
+    
+    def __getitem__(self, session_id):
+        with self._lock:
+            _, value = self._sessions[session_id]
+            self._sessions[session_id] = (time.monotonic(), value)
+            self._sessions.move_to_end(session_id)
+            return value
+    
+    def __setitem__(self, session_id, value):
+        with self._lock:
+            now = time.monotonic()
+            self._sessions[session_id] = (now, value)
+            self._sessions.move_to_end(session_id)
+            self._evict_expired(now)
+            while len(self._sessions) > self.maxsize:
+                evicted_id, _ = self._sessions.popitem(last=False)
+                logger.info(f"🧹 Exam session {evicted_id} evicted (limit {self.maxsize})")
+    
+    def __len__(self) -> int:
+        with self._lock:
+            self._evict_expired(time.monotonic())
+            return len(self._sessions)
+    
+    def items(self):
+        """Snapshot of live (session_id, value) pairs, oldest first"""
+        with self._lock:
+            self._evict_expired(time.monotonic())
+            return [(session_id, value) for session_id, (_, value) in self._sessions.items()]
+
+exam_sessions = ExamSessionStore()  # Maps session_id to ExamAccessibilityHelper instances
 
 # Initialize AnythingLLM if available
 if ANYTHINGLLM_AVAILABLE:
@@ -153,18 +299,115 @@ def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# Cheap unique IDs for temporary file names - uuid4() is kept for session IDs only
+_file_counter = itertools.count()
+_pid = os.getpid()
+
+def _fid() -> str:
+    """Unique (not unpredictable) ID for temporary file names"""
+    return f"{_pid}_{next(_file_counter):x}_{time.monotonic_ns():x}"
+
 def get_session_id():
     """Get or create session ID"""
     if 'session_id' not in session:
         session['session_id'] = str(uuid.uuid4())
     return session['session_id']
 
+def init_tts_pool(n: int = TTS_POOL_SIZE) -> bool:
+    """Create n warmed TTS engines (the global engine included) for request handlers to lease"""
+    global _tts_pool
+    if not tts_engine:
+        return False
+    
+    pool = queue.Queue()
+    pool.put(tts_engine)
+    for _ in range(max(1, n) - 1):
+        pool.put(TTSEngine())
+    
+    # Synthesize once up front so the first request doesn't pay for voice loading
+    warmup_path = os.path.join(tempfile.gettempdir(), f"tts_warmup_{os.getpid()}.wav")
+    try:
+        tts_engine.text_to_speech_file("Ready.", warmup_path)
+    finally:
+        _schedule_cleanup(warmup_path)
+    
+    _tts_pool = pool
+    logger.info(f"🔊 TTS pool ready with {pool.qsize()} engine(s)")
+    return True
+
+@contextmanager
+def _lease_tts_engine():
+    """Borrow a TTS engine from the pool (falls back to the global engine before the pool exists)"""
+    if _tts_pool is None:
+        yield tts_engine
+        return
+    
+    try:
+        engine = _tts_pool.get(timeout=TTS_LEASE_TIMEOUT)
+    except queue.Empty:
+        raise TTSBusyError(f"All TTS engines busy for {TTS_LEASE_TIMEOUT}s") from None
+    try:
+        yield engine
+    finally:
+        _tts_pool.put(engine)
+
+# Voice-command clips from concurrent requests are grouped into micro-batches
+# for the single shared Whisper model
+WHISPER_BATCH_WINDOW = 0.02  # seconds to wait for more clips after the first
+WHISPER_MAX_BATCH = 8
+WHISPER_RESULT_TIMEOUT = 30
+_whisper_queue = queue.Queue()
+_whisper_batcher_thread = None
+
+def _whisper_batcher():
+    """Drain queued clips in micro-batches and resolve each request's Future"""
+    while True:
+        batch = [_whisper_queue.get()]
+        deadline = time.monotonic() + WHISPER_BATCH_WINDOW
+        while len(batch) < WHISPER_MAX_BATCH:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_whisper_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        audio_paths = [audio_path for audio_path, _ in batch]
+        try:
+            results = list(whisper_transcriber.transcribe_audio_batch(audio_paths) or [])
+        except Exception as e:
+            logger.error(f"Batched transcription error: {e}")
+            results = [{'success': False, 'text': '', 'error': str(e)} for _ in batch]
+        
+        if len(results) != len(batch):
+            logger.error(f"Batched transcription returned {len(results)} results for {len(batch)} clips")
+        
+        # Every Future gets resolved - a missing result fails its request now instead of at the timeout
+        for i, (audio_path, future) in enumerate(batch):
+            try:
+                if i < len(results):
+                    future.set_result(results[i])
+                else:
+                    future.set_exception(RuntimeError(f"No transcription result for {audio_path}"))
+            except Exception as e:
+                logger.error(f"Failed to resolve transcription request: {e}")
+
+def _transcribe_batched(audio_path: str) -> dict:
+    """Queue a clip for the Whisper batcher and wait for its transcription"""
+    future = Future()
+    _whisper_queue.put((audio_path, future))
+    return future.result(timeout=WHISPER_RESULT_TIMEOUT)
+
 def init_whisper():
     """Initialize Whisper transcription"""
-    global whisper_transcriber
+    global whisper_transcriber, _whisper_batcher_thread
     try:
         if WhisperTranscriber:
-            whisper_transcriber = WhisperTranscriber()
+            whisper_transcriber = get_transcriber()
+            if _whisper_batcher_thread is None:
+                _whisper_batcher_thread = threading.Thread(target=_whisper_batcher, name='whisper-batcher', daemon=True)
+                _whisper_batcher_thread.start()
             logger.info("Whisper transcriber initialized successfully")
             return True
     except Exception as e:
@@ -217,14 +460,14 @@ def upload_document():
     try:
         # Save uploaded file
         filename = secure_filename(file.filename)
-        file_id = str(uuid.uuid4())
-        file_path = os.path.join(UPLOAD_FOLDER, f"{file_id}_{filename}")
+        file_id = _fid()
+        file_path = str(UPLOAD_DIR / f"{file_id}_{filename}")
         file.save(file_path)
         
         # Process PDF directly
         try:
             # Extract text using the correct method signature
-            pdf_result = pdf_processor.extract_text_from_pdf(file_path)
+            pdf_result = pdf_processor.process(file_path)
             
             if not pdf_result['success']:
                 error_msg = pdf_result.get('error', 'Unknown error during PDF processing')
@@ -295,10 +538,11 @@ def upload_document():
                                 
                                 logger.info(f"🎵 Generating auto audio at: {audio_path}")
                                 
-                                audio_result = tts_engine.text_to_speech_file(
-                                    instructions,
-                                    output_path=audio_path
-                                )
+                                with _lease_tts_engine() as engine:
+                                    audio_result = engine.text_to_speech_file(
+                                        instructions,
+                                        output_path=audio_path
+                                    )
                                 
                                 if audio_result['success']:
                                     start_audio_file = audio_result['file_path']
@@ -366,10 +610,7 @@ def upload_document():
         
         finally:
             # Clean up uploaded file
-            try:
-                os.unlink(file_path)
-            except:
-                pass
+            _schedule_cleanup(file_path)
         
     except Exception as e:
         logger.error(f"Upload error: {e}")
@@ -396,35 +637,55 @@ def generate_audio():
         if voice_id:
             tts_engine.set_voice_properties(voice_id=voice_id)
         
-        # Generate audio file
-        audio_filename = f"audio_{uuid.uuid4().hex}.wav"
-        audio_path = os.path.join(AUDIO_FOLDER, audio_filename)
-        
-        result = tts_engine.text_to_speech_file(text, audio_path)
+        # Generate audio file (reused if this text was already spoken with the same voice)
+        audio_filename = _tts_audio_relpath(text)
+        audio_path = AUDIO_DIR / audio_filename
         
-        if not result['success']:
-            error_msg = result.get('error', 'Failed to generate audio')
-            return jsonify({'error': error_msg}), 500
+        if audio_path.is_file():
+            duration = tts_engine._get_audio_duration(str(audio_path))
+        else:
+            with _lease_tts_engine() as engine:
+                result = engine.text_to_speech_file(text, str(audio_path))
+            
+            if not result['success']:
+                error_msg = result.get('error', 'Failed to generate audio')
+                return jsonify({'error': error_msg}), 500
+            
+            duration = result.get('duration', 0)
         
         return jsonify({
             'success': True,
             'audio_file': f"/api/audio/file/{audio_filename}",
-            'duration': result.get('duration', 0)
+            'duration': duration
         })
         
+    except TTSBusyError as e:
+        logger.warning(f"Audio generation rejected: {e}")
+        return jsonify({'error': 'TTS engine busy, try again shortly'}), 503
     except Exception as e:
         logger.error(f"Audio generation error: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/audio/file/<filename>', methods=['GET'])
+@app.route('/api/audio/file/<path:filename>', methods=['GET'])
 def get_audio_file(filename):
-    """Serve audio file"""
-    audio_path = os.path.join(AUDIO_FOLDER, filename)
+    """Serve audio file (flat names or sharded <xx>/<yy>/<name> paths)"""
+    audio_path = safe_join(AUDIO_FOLDER, filename)
+    
+    # Audio handed out optimistically may still be synthesizing - wait for it
+    pending = _pending_tts.get(filename)
+    if pending is not None:
+        try:
+            pending.result(timeout=TTS_PENDING_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"⚠️ Pending TTS for {filename} did not finish: {e}")
     
-    if not os.path.exists(audio_path):
+    if audio_path is None or not os.path.isfile(audio_path):
         return jsonify({'error': 'Audio file not found'}), 404
     
-    return send_file(audio_path, mimetype='audio/wav')
+    response = send_file(audio_path, mimetype='audio/wav')
+    if HASHED_AUDIO_RE.match(filename):
+        response.headers['Cache-Control'] = AUDIO_CACHE_CONTROL
+    return response
 
 @app.route('/api/audio/<path:audio_path>', methods=['GET'])
 def get_audio_by_path(audio_path):
@@ -732,15 +993,16 @@ def upload_exam():
     if not allowed_file(file.filename):
         return jsonify({'error': 'File type not allowed'}), 400
     
+    file_path = None
     try:
         # Save uploaded file temporarily
         filename = secure_filename(file.filename)
-        file_id = str(uuid.uuid4())
-        file_path = os.path.join(UPLOAD_FOLDER, f"{file_id}_{filename}")
+        file_id = _fid()
+        file_path = str(UPLOAD_DIR / f"{file_id}_{filename}")
         file.save(file_path)
         
         # Process PDF to extract text
-        pdf_result = pdf_processor.extract_text_from_pdf(file_path)
+        pdf_result = pdf_processor.process(file_path)
         
         if not pdf_result['success']:
             return jsonify({'error': f"Failed to extract text from PDF: {pdf_result.get('error')}"}), 400
@@ -787,16 +1049,17 @@ def upload_exam():
         intro_audio = None
         
         if tts_engine and intro_message:
-            try:
-                audio_filename = f"intro_{uuid.uuid4().hex}.wav"
-                audio_path = os.path.join(AUDIO_FOLDER, audio_filename)
-                tts_result = tts_engine.text_to_speech_file(intro_message, audio_path)
-                
-                if tts_result['success']:
-                    intro_audio = f"/api/audio/file/{audio_filename}"
-                    logger.info(f"Generated intro audio: {intro_audio}")
-            except Exception as e:
-                logger.warning(f"Failed to generate intro audio: {e}")
+            # Synthesize in the background - the response (and the client's fetch of
+            # the intro) overlaps with TTS instead of waiting for it
+            intro_audio = _generate_tts_audio(intro_message, wait=False)
+            if intro_audio:
+                logger.info(f"Queued intro audio: {intro_audio}")
+            
+            # The first question is read right after the intro, so render it meanwhile
+            if use_anythingllm:
+                first_question = exam_helper.get_current_question_for_reading()
+                if first_question.get('success'):
+                    _generate_tts_audio(first_question['reading_text'], wait=False)
         
         return jsonify({
             'success': True,
@@ -817,10 +1080,8 @@ def upload_exam():
     
     finally:
         # Clean up uploaded file
-        try:
-            os.unlink(file_path)
-        except:
-            pass
+        if file_path:
+            _schedule_cleanup(file_path)
 
 @app.route('/api/exam/start', methods=['POST'])
 def start_exam():
@@ -828,11 +1089,10 @@ def start_exam():
     data = request.get_json()
     session_id = data.get('session_id')
     
-    if not session_id or session_id not in exam_sessions:
+    exam_helper_instance = exam_sessions.get(session_id) if session_id else None
+    if exam_helper_instance is None:
         return jsonify({'error': 'Invalid or expired exam session'}), 400
     
-    exam_helper_instance = exam_sessions[session_id]
-    
     try:
         # Start the exam
         start_result = exam_helper_instance.start_exam()
@@ -845,17 +1105,10 @@ def start_exam():
         question_audio = None
         
         if tts_engine and question_data['success']:
-            try:
-                reading_text = question_data['reading_text']
-                audio_filename = f"question_{uuid.uuid4().hex}.wav"
-                audio_path = os.path.join(AUDIO_FOLDER, audio_filename)
-                tts_result = tts_engine.text_to_speech_file(reading_text, audio_path)
-                
-                if tts_result['success']:
-                    question_audio = f"/api/audio/file/{audio_filename}"
-                    logger.info(f"Generated question audio: {question_audio}")
-            except Exception as e:
-                logger.warning(f"Failed to generate question audio: {e}")
+            # Return the URL right away; synthesis finishes while the client fetches it
+            question_audio = _generate_tts_audio(question_data['reading_text'], wait=False)
+            if question_audio:
+                logger.info(f"Queued question audio: {question_audio}")
         
         return jsonify({
             'success': True,
@@ -885,20 +1138,19 @@ def process_exam_voice_command():
     voice_command = data.get('command', '').strip()
     audio_file = data.get('audio_file')  # Optional: for processing audio directly
     
-    if not session_id or session_id not in exam_sessions:
+    exam_helper_instance = exam_sessions.get(session_id) if session_id else None
+    if exam_helper_instance is None:
         return jsonify({'error': 'Invalid or expired exam session'}), 400
     
     if not voice_command and not audio_file:
         return jsonify({'error': 'No command or audio provided'}), 400
     
-    exam_helper_instance = exam_sessions[session_id]
-    
     try:
         # If audio file provided, transcribe it first
         if audio_file and not voice_command:
             # Use Whisper to transcribe the audio
             if whisper_transcriber:
-                transcription_result = whisper_transcriber.transcribe_audio(audio_file)
+                transcription_result = _transcribe_batched(audio_file)
                 if transcription_result['success']:
                     voice_command = transcription_result['text']
                 else:
@@ -909,7 +1161,8 @@ def process_exam_voice_command():
         # Process the voice command using AnythingLLM
         command_result = exam_helper_instance.process_voice_command(voice_command)
         
-        # Generate appropriate audio response
+        # Generate appropriate audio response - the URL points at the streaming
+        # endpoint so synthesis only starts once the client begins playback
         response_audio = None
         response_text = command_result.get('response', '')
         
@@ -922,13 +1175,13 @@ def process_exam_voice_command():
             if question_data.get('success'):
                 response_text = question_data['reading_text']
                 if tts_engine:
-                    response_audio = _generate_tts_audio(response_text)
+                    response_audio = _tts_stream_url(session_id, response_text)
         
         elif action == 'ready_to_answer':
             # Generate prompt for answer recording
             prompt_text = "Ready to record your answer. Please state your answer clearly. You can say the letter A, B, C, or D, or speak your full answer."
             if tts_engine:
-                response_audio = _generate_tts_audio(prompt_text)
+                response_audio = _tts_stream_url(session_id, prompt_text)
             response_text = prompt_text
         
         elif action in ['next_question', 'previous_question']:
@@ -937,7 +1190,7 @@ def process_exam_voice_command():
             if question_data.get('success'):
                 response_text = question_data['reading_text']
                 if tts_engine:
-                    response_audio = _generate_tts_audio(response_text)
+                    response_audio = _tts_stream_url(session_id, response_text)
         
         elif action == 'record_answer':
             # Confirm answer recording
@@ -950,23 +1203,23 @@ def process_exam_voice_command():
                 response_text = f"Answer '{answer}' recorded for question {command_result.get('question_number', '')}."
             
             if tts_engine:
-                response_audio = _generate_tts_audio(response_text)
+                response_audio = _tts_stream_url(session_id, response_text)
         
         elif action == 'end_of_exam':
             # Generate completion message
             response_text = command_result.get('completion_message', 'Exam completed!')
             if tts_engine:
-                response_audio = _generate_tts_audio(response_text)
+                response_audio = _tts_stream_url(session_id, response_text)
         
         elif action == 'show_help':
             # Generate help audio
             if tts_engine:
-                response_audio = _generate_tts_audio(response_text)
+                response_audio = _tts_stream_url(session_id, response_text)
         
         else:
             # Default response with audio
             if tts_engine and response_text:
-                response_audio = _generate_tts_audio(response_text)
+                response_audio = _tts_stream_url(session_id, response_text)
         
         # Prepare response
         response_data = {
@@ -994,28 +1247,100 @@ def process_exam_voice_command():
         logger.error(f"Voice command processing error: {e}")
         return jsonify({'error': str(e)}), 500
 
-def _generate_tts_audio(text: str) -> str:
-    """Helper function to generate TTS audio and return URL"""
+def _tts_audio_relpath(text: str) -> str:
+    """
+    Content-addressed path (relative to AUDIO_FOLDER) for the TTS audio of text in the current voice
+    
+    Files are sharded by the first two hash bytes so no directory grows without bound.
+    """
+    cache_key = f"{text}\x00{tts_engine.voice_cache_key()}"
+    digest = hashlib.blake2b(cache_key.encode('utf-8'), digest_size=16).hexdigest()
+    return f"{digest[:2]}/{digest[2:4]}/tts_{digest}.wav"
+
+def _synthesize_tts_file(text: str, audio_path: Path) -> bool:
+    """Synthesize text into audio_path with a leased TTS engine"""
+    with _lease_tts_engine() as engine:
+        tts_result = engine.text_to_speech_file(text, str(audio_path))
+    
+    if not tts_result['success']:
+        logger.warning(f"Failed to generate TTS audio: {tts_result['error']}")
+    return tts_result['success']
+
+def _generate_tts_audio(text: str, wait: bool = True) -> str:
+    """
+    Helper function to generate TTS audio and return URL
+    
+    With wait=False the URL is returned immediately and synthesis runs in the
+    background; /api/audio/file blocks on it if the client asks too early.
+    """
     try:
-        audio_filename = f"response_{uuid.uuid4().hex}.wav"
-        audio_path = os.path.join(AUDIO_FOLDER, audio_filename)
-        tts_result = tts_engine.text_to_speech_file(text, audio_path)
-        
-        if tts_result['success']:
-            return f"/api/audio/file/{audio_filename}"
+        audio_filename = _tts_audio_relpath(text)
+        audio_path = AUDIO_DIR / audio_filename
+        audio_url = f"/api/audio/file/{audio_filename}"
+        
+        # Same text and voice always hash to the same file - skip synthesis on repeats
+        if audio_path.is_file():
+            return audio_url
+        
+        with _pending_tts_lock:
+            pending = _pending_tts.get(audio_filename)
+            if pending is None and not wait:
+                pending = _tts_executor.submit(_synthesize_tts_file, text, audio_path)
+                _pending_tts[audio_filename] = pending
+                pending.add_done_callback(lambda _, key=audio_filename: _pending_tts.pop(key, None))
+        
+        if not wait:
+            return audio_url
+        
+        if pending is not None:
+            pending.result(timeout=TTS_PENDING_TIMEOUT)
+            if audio_path.is_file():
+                return audio_url
+        
+        if _synthesize_tts_file(text, audio_path):
+            return audio_url
     except Exception as e:
         logger.warning(f"Failed to generate TTS audio: {e}")
     
     return None
 
+def _tts_stream_url(session_id: str, text: str) -> str:
+    """Helper function to build a URL that streams TTS audio for the given text"""
+    return f"/api/exam/tts-stream?{urlencode({'session_id': session_id, 'text': text})}"
+
+@app.route('/api/exam/tts-stream', methods=['GET'])
+def stream_exam_tts():
+    """Stream TTS audio for exam responses as it is synthesized"""
+    if not tts_engine:
+        return jsonify({'error': 'TTS engine not available'}), 503
+    
+    session_id = request.args.get('session_id')
+    text = request.args.get('text', '').strip()
+    
+    if not session_id or exam_sessions.get(session_id) is None:
+        return jsonify({'error': 'Invalid or expired exam session'}), 400
+    
+    if not text:
+        return jsonify({'error': 'Text is required'}), 400
+    
+    def generate_chunks():
+        # No pool lease: it would be held for as long as the client takes to read the
+        # stream. TTSEngine already serializes each sentence's synthesis on its worker.
+        yield from tts_engine.synthesize_streaming(text)
+    
+    return Response(
+        stream_with_context(generate_chunks()),
+        mimetype='audio/wav',
+        headers={'Cache-Control': 'no-store'}
+    )
+
 @app.route('/api/exam/answer-sheet/<session_id>', methods=['GET'])
 def get_answer_sheet(session_id):
     """Generate and return the final answer sheet"""
-    if session_id not in exam_sessions:
+    exam_helper_instance = exam_sessions.get(session_id)
+    if exam_helper_instance is None:
         return jsonify({'error': 'Exam session not found'}), 404
     
-    exam_helper_instance = exam_sessions[session_id]
-    
     try:
         answer_sheet = exam_helper_instance.generate_answer_sheet()
         
@@ -1035,11 +1360,10 @@ def complete_exam():
     data = request.get_json()
     session_id = data.get('session_id')
     
-    if not session_id or session_id not in exam_sessions:
+    exam_helper_instance = exam_sessions.get(session_id) if session_id else None
+    if exam_helper_instance is None:
         return jsonify({'error': 'Invalid or expired exam session'}), 400
     
-    exam_helper_instance = exam_sessions[session_id]
-    
     try:
         # Generate answer sheet
         answer_sheet = exam_helper_instance.generate_answer_sheet()
@@ -1079,11 +1403,10 @@ def complete_exam():
 @app.route('/api/exam/status/<session_id>', methods=['GET'])
 def get_exam_status(session_id):
     """Get current exam status and progress"""
-    if session_id not in exam_sessions:
+    exam_helper_instance = exam_sessions.get(session_id)
+    if exam_helper_instance is None:
         return jsonify({'error': 'Exam session not found'}), 404
     
-    exam_helper_instance = exam_sessions[session_id]
-    
     try:
         status = exam_helper_instance.get_exam_status()
         
@@ -1132,29 +1455,26 @@ def transcribe_audio_for_exam():
     audio_file = request.files['audio']
     session_id = request.form.get('session_id')
     
-    if not session_id or session_id not in exam_sessions:
+    if not session_id or exam_sessions.get(session_id) is None:
         return jsonify({'error': 'Invalid or expired exam session'}), 400
     
     try:
         # Save audio file temporarily
-        audio_filename = f"voice_command_{uuid.uuid4().hex}.wav"
-        audio_path = os.path.join(AUDIO_FOLDER, audio_filename)
+        audio_filename = f"voice_command_{_fid()}.wav"
+        audio_path = str(AUDIO_DIR / audio_filename)
         audio_file.save(audio_path)
         
         # Transcribe using Whisper
         transcription_result = {'success': False, 'text': ''}
         
         if whisper_transcriber:
-            transcription_result = whisper_transcriber.transcribe_audio(audio_path)
+            transcription_result = _transcribe_batched(audio_path)
         elif voice_controller:
             # Try using voice controller for transcription
             transcription_result = voice_controller.transcribe_file(audio_path)
         
         # Clean up audio file
-        try:
-            os.unlink(audio_path)
-        except:
-            pass
+        _schedule_cleanup(audio_path)
         
         if transcription_result['success']:
             return jsonify({
@@ -1357,6 +1677,7 @@ def agentic_finish_exam():
 if __name__ == '__main__':
     # Initialize services
     init_whisper()
+    init_tts_pool()
     
     # Run Flask app
     app.run(host='127.0.0.1', port=5000, debug=True)
\ No newline at end of file
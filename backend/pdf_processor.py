@@ -3,62 +3,158 @@ PDF Processing Module
 Handles PDF text extraction functionality (OCR disabled to avoid SciPy conflicts)
 """
 
-try:
-    import fitz  # PyMuPDF
-    PYMUPDF_AVAILABLE = True
-except ImportError:
-    PYMUPDF_AVAILABLE = False
-    print("Warning: PyMuPDF not available. Install with: pip install PyMuPDF")
-
+import importlib.util
+import io
 import os
-from typing import List, Dict, Any
+import re
+import json
+import mmap
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# PyMuPDF is only located here; the (large) import is deferred to the first PDF
+PYMUPDF_AVAILABLE = importlib.util.find_spec('fitz') is not None
+if not PYMUPDF_AVAILABLE:
+    print("Warning: PyMuPDF not available. Install with: pip install PyMuPDF")
+
+_PYMUPDF_OK = PYMUPDF_AVAILABLE
+_fitz = None
+_fitz_open = None
+_TEXT_FLAGS = 0
+
+PDF_MAGIC = b'%PDF-'
+MAX_PDF_SIZE = 200 * 1024 * 1024  # Larger files are rejected up front instead of risking OOM
+
+# Below this many pages a process pool costs more to start than it saves
+PARALLEL_PAGE_THRESHOLD = 8
+
+# From this size on, the xref trailer at EOF is read ahead of fitz.open
+PREFETCH_TAIL_SIZE = 16 * 1024 * 1024
+
+# A question is the run of text since the last '.' or '?' that ends in '?'
+_QUESTION_RE = re.compile(r'([^.?]*)\?')
+_QUESTION_RE_B = re.compile(rb'([^.?]*)\?')
+MAX_QUESTIONS = 20
+
+# Sentence terminators for chunking
+_SENT_RE = re.compile(r'[.!?]+')
+_SENT_RE_B = re.compile(rb'[.!?]+')
+MAX_CHUNK_LENGTH = 500  # Characters per chunk
+
+def _get_fitz():
+    """Import PyMuPDF on first use and pick the document opener for this version"""
+    global _fitz, _fitz_open, _TEXT_FLAGS
+    if _fitz is None:
+        import fitz as _fitz
+        # Older PyMuPDF releases only expose the Document constructor
+        _fitz_open = _fitz.open if hasattr(_fitz, 'open') else _fitz.Document
+        # Plain text only: no ligature expansion bookkeeping, no image blocks
+        _TEXT_FLAGS = _fitz.TEXT_PRESERVE_WHITESPACE | _fitz.TEXT_MEDIABOX_CLIP
+    return _fitz
+
+def _open_pdf(pdf_path: str):
+    """Open a document with the opener chosen in _get_fitz()"""
+    _get_fitz()
+    return _fitz_open(pdf_path)
+
+def _prefetch_pdf(pdf_path: str, file_size: int):
+    """Let the kernel start reading a PDF into the page cache before MuPDF opens it (best effort)"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(pdf_path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            if file_size >= PREFETCH_TAIL_SIZE:
+                # MuPDF seeks to the trailer first - fault it in now
+                os.pread(fd, 1024, file_size - 1024)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        logger.debug(f"Prefetch skipped for {pdf_path}: {e}")
+
+def _page_text(page) -> str:
+    """Raw page text in content-stream order (no reading-order sort)"""
+    return page.get_text("text", flags=_TEXT_FLAGS, sort=False)
+
+def _ascii_bytes(text: str) -> Optional[bytes]:
+    """text as bytes when it is pure ASCII (the common exam case), else None"""
+    return text.encode('ascii') if text.isascii() else None
+
+def _iter_sentences(text, sentence_re=_SENT_RE):
+    """Lazily yield the text between sentence terminators (same pieces as sentence_re.split)"""
+    start = 0
+    for match in sentence_re.finditer(text):
+        yield text[start:match.start()]
+        start = match.end()
+    yield text[start:]
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> Tuple[int, List[str]]:
+    """Worker: extract raw text for pages [start, stop) of a PDF"""
+    doc = _open_pdf(pdf_path)
+    try:
+        return start, [_page_text(doc[page_num]) for page_num in range(start, stop)]
+    finally:
+        doc.close()
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'ilumina' / 'pdf'
+PDF_CACHE_MAX_ENTRIES = 256  # Least recently used results beyond this are pruned
+
+# Part of every cache key - bump whenever extraction output changes (e.g. _TEXT_FLAGS)
+PDF_CACHE_FORMAT = 2
+
+# Our cache files (<blake2b>_v<format>[_pages|_valid].json); TestApplication shares the directory
+_CACHE_FILE_RE = re.compile(r'[0-9a-f]{32}(?:_v\d+)?(?:_pages|_valid)?\.json')
+
 class PDFProcessor:
-    def __init__(self):
-        """Initialize PDF processor (OCR disabled to avoid SciPy import issues)"""
-        self.pymupdf_available = PYMUPDF_AVAILABLE
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize PDF processor (OCR disabled to avoid SciPy import issues)
         
-        if PYMUPDF_AVAILABLE:
-            try:
-                # Test PyMuPDF functionality - check if it has the required methods
-                if hasattr(fitz, 'open'):
-                    # Test with empty document
-                    test_doc = fitz.open()
-                    test_doc.close()
-                    logger.info("PDF processor initialized successfully (OCR disabled)")
-                else:
-                    # Try alternative initialization
-                    import tempfile
-                    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
-                        tmp.write(b'%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n/Pages 2 0 R\n>>\nendobj\n2 0 obj\n<<\n/Type /Pages\n/Kids [3 0 R]\n/Count 1\n>>\nendobj\n3 0 obj\n<<\n/Type /Page\n/Parent 2 0 R\n/MediaBox [0 0 612 792]\n>>\nendobj\nxref\n0 4\n0000000000 65535 f \n0000000009 00000 n \n0000000074 00000 n \n0000000120 00000 n \ntrailer\n<<\n/Size 4\n/Root 1 0 R\n>>\nstartxref\n179\n%%EOF')
-                        tmp.flush()
-                        test_doc = fitz.Document(tmp.name)
-                        test_doc.close()
-                    os.unlink(tmp.name)
-                    logger.info("PDF processor initialized with Document method (OCR disabled)")
-                self.ocr_reader = None  # OCR disabled to avoid SciPy conflicts
-            except Exception as e:
-                logger.error(f"Failed to initialize PDF processor: {e}")
-                self.pymupdf_available = False
+        Args:
+            cache_dir (str, optional): Directory for cached extraction results,
+                keyed by file content. Defaults to ~/.cache/ilumina/pdf
+        """
+        self.pymupdf_available = _PYMUPDF_OK
+        self.ocr_reader = None  # OCR disabled to avoid SciPy conflicts
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"PDF cache disabled - cannot create {self.cache_dir}: {e}")
+            self.cache_dir = None
+        
+        if self.pymupdf_available:
+            logger.info("PDF processor initialized successfully (OCR disabled)")
         else:
             logger.warning("PDF processor initialized in fallback mode - PyMuPDF not available")
-            self.ocr_reader = None
     
-    def extract_text_from_pdf(self, pdf_path: str) -> Dict[str, Any]:
+    def process(self, pdf_path: str, extract_text: bool = True, return_pages: bool = False,
+                num_workers: Optional[int] = None) -> Dict[str, Any]:
         """
-        Extract text from PDF using PyMuPDF and OCR fallback
+        Validate a PDF and extract its text with a single open of the document
         
         Args:
             pdf_path (str): Path to the PDF file
+            extract_text (bool): Also extract the text (False = validation only)
+            return_pages (bool): Also build the per-page info list in result['pages']
+            num_workers (int, optional): Processes used for documents of PARALLEL_PAGE_THRESHOLD
+                pages or more. Defaults to min(cpu_count, 4).
             
         Returns:
-            Dict containing extracted text and metadata
+            Dict containing validation metadata, extracted text and page metadata
         """
         result = {
             'success': False,
+            'valid': False,
+            'file_size': 0,
             'text': '',
             'pages': [],
             'total_pages': 0,
@@ -74,55 +170,47 @@ class PDFProcessor:
             if not os.path.exists(pdf_path):
                 raise FileNotFoundError(f"PDF file not found: {pdf_path}")
             
-            # Open PDF - try different methods based on PyMuPDF version
-            try:
-                if hasattr(fitz, 'open'):
-                    doc = fitz.open(pdf_path)
-                else:
-                    doc = fitz.Document(pdf_path)
-            except Exception as open_error:
-                # Fallback method
-                try:
-                    doc = fitz.Document(pdf_path)
-                except Exception as fallback_error:
-                    raise Exception(f"Could not open PDF with either method: {open_error}, {fallback_error}")
-            result['total_pages'] = len(doc)
+            result['file_size'] = os.path.getsize(pdf_path)
             
-            all_text = []
-            pages_info = []
+            # Cheap rejections before MuPDF parses the whole xref table
+            if result['file_size'] > MAX_PDF_SIZE:
+                result['error'] = f"File too large ({result['file_size'] // (1024 * 1024)} MB, limit {MAX_PDF_SIZE // (1024 * 1024)} MB)"
+                return result
             
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                
-                # Try text extraction first
-                page_text = page.get_text()
-                page_info = {
-                    'page_number': page_num + 1,
-                    'text': page_text,
-                    'method': 'text_extraction',
-                    'char_count': len(page_text)
-                }
-                
-                # If no text found, note that OCR is disabled
-                if not page_text.strip():
-                    page_info['text'] = f"[Page {page_num + 1}: No extractable text found - OCR disabled to avoid SciPy conflicts]"
-                    page_info['method'] = 'no_text_found'
-                    page_info['char_count'] = len(page_info['text'])
-                    logger.info(f"No text found on page {page_num + 1} - OCR disabled")
-                
-                all_text.append(page_info['text'])
-                pages_info.append(page_info)
+            # Plain-text uploads are opened by extension, so only PDFs must carry the magic
+            if not extract_text or pdf_path.lower().endswith('.pdf'):
+                with open(pdf_path, 'rb') as f:
+                    if f.read(len(PDF_MAGIC)) != PDF_MAGIC:
+                        result['error'] = "Not a PDF (bad magic)"
+                        return result
             
-            doc.close()
+            # Same bytes always give the same result - check the cache before parsing
+            cache_key = f"{self._file_digest(pdf_path)}_v{PDF_CACHE_FORMAT}"
+            if extract_text:
+                cache_key += '_pages' if return_pages else ''
+            else:
+                cache_key += '_valid'
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                logger.info(f"PDF cache hit for {os.path.basename(pdf_path)}")
+                return cached
             
-            result.update({
-                'success': True,
-                'text': '\n\n'.join(all_text),
-                'pages': pages_info,
-                'method': 'text_extraction_only'
-            })
+            _prefetch_pdf(pdf_path, result['file_size'])
+            doc = _open_pdf(pdf_path)
             
-            logger.info(f"Successfully processed PDF: {len(all_text)} pages, {len(result['text'])} characters")
+            try:
+                result['total_pages'] = doc.page_count
+                result['valid'] = True
+                
+                if extract_text:
+                    self._extract_document_text(doc, pdf_path, result, return_pages, num_workers)
+                    logger.info(f"Successfully processed PDF: {result['total_pages']} pages, {len(result['text'])} characters")
+                else:
+                    result['success'] = True
+            finally:
+                doc.close()
+            
+            self._cache_put(cache_key, result)
             
         except Exception as e:
             error_msg = f"PDF processing failed: {str(e)}"
@@ -131,51 +219,160 @@ class PDFProcessor:
         
         return result
     
-    def validate_pdf(self, pdf_path: str) -> Dict[str, Any]:
+    def _extract_document_text(self, doc, pdf_path: str, result: Dict[str, Any],
+                               return_pages: bool, num_workers: Optional[int]):
+        """Fill result with the text of an already opened document"""
+        total_pages = result['total_pages']
+        
+        if num_workers is None:
+            num_workers = min(os.cpu_count() or 1, 4)
+        
+        raw_texts = None
+        if num_workers > 1 and total_pages >= PARALLEL_PAGE_THRESHOLD:
+            raw_texts = self._extract_pages_parallel(pdf_path, total_pages, num_workers)
+        if raw_texts is None:
+            # Lazily, so each page's text can be dropped once written out
+            raw_texts = (_page_text(page) for page in doc)
+        
+        text_buffer = io.StringIO()
+        pages_info = []
+        
+        for page_num, page_text in enumerate(raw_texts):
+            method = 'text_extraction'
+            
+            # If no text found, note that OCR is disabled
+            if not page_text.strip():
+                page_text = f"[Page {page_num + 1}: No extractable text found - OCR disabled to avoid SciPy conflicts]"
+                method = 'no_text_found'
+                logger.info(f"No text found on page {page_num + 1} - OCR disabled")
+            
+            if page_num:
+                text_buffer.write('\n\n')
+            text_buffer.write(page_text)
+            
+            if return_pages:
+                pages_info.append({
+                    'page_number': page_num + 1,
+                    'text': page_text,
+                    'method': method,
+                    'char_count': len(page_text)
+                })
+        
+        result.update({
+            'success': True,
+            'text': text_buffer.getvalue(),
+            'pages': pages_info,
+            'method': 'text_extraction_only'
+        })
+    
+    def extract_text_from_pdf(self, pdf_path: str, return_pages: bool = False,
+                              num_workers: Optional[int] = None) -> Dict[str, Any]:
         """
-        Validate PDF file
+        Extract text from PDF using PyMuPDF and OCR fallback
         
         Args:
             pdf_path (str): Path to the PDF file
+            return_pages (bool): Also build the per-page info list in result['pages']
+            num_workers (int, optional): Processes used for large documents (see process())
             
         Returns:
-            Dict containing validation results
+            Dict containing extracted text and metadata
         """
-        result = {
-            'valid': False,
-            'error': None,
-            'file_size': 0,
-            'pages': 0
-        }
-        
+        return self.process(pdf_path, return_pages=return_pages, num_workers=num_workers)
+    
+    @staticmethod
+    def _file_digest(file_path: str) -> str:
+        """BLAKE2b digest of a file's contents, read through mmap in 1 MiB blocks"""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return digest.hexdigest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    for offset in range(0, len(mm), 1 << 20):
+                        digest.update(view[offset:offset + (1 << 20)])
+                finally:
+                    view.release()
+        return digest.hexdigest()
+    
+    def _cache_get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Load a cached result, or None on miss"""
+        if not self.cache_dir:
+            return None
+        cache_path = self.cache_dir / f"{cache_key}.json"
         try:
-            if not os.path.exists(pdf_path):
-                result['error'] = "File does not exist"
-                return result
-            
-            result['file_size'] = os.path.getsize(pdf_path)
-            
-            # Try to open PDF
+            value = json.loads(cache_path.read_text(encoding='utf-8'))
+            os.utime(cache_path)  # Mark as recently used for pruning
+            return value
+        except (OSError, ValueError):
+            return None
+    
+    def _cache_put(self, cache_key: str, value: Dict[str, Any]):
+        """Store a result in the cache (atomic replace, failures only logged)"""
+        if not self.cache_dir:
+            return
+        cache_path = self.cache_dir / f"{cache_key}.json"
+        tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            tmp_path.write_text(json.dumps(value), encoding='utf-8')
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write PDF cache entry: {e}")
+            return
+        self._prune_cache()
+    
+    def _prune_cache(self):
+        """Delete the least recently used cache files beyond PDF_CACHE_MAX_ENTRIES (stale formats age out too)"""
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                cache_files = [(entry.stat().st_mtime, entry.path) for entry in entries
+                               if _CACHE_FILE_RE.fullmatch(entry.name)]
+        except OSError as e:
+            logger.debug(f"PDF cache prune skipped: {e}")
+            return
+        if len(cache_files) <= PDF_CACHE_MAX_ENTRIES:
+            return
+        cache_files.sort(reverse=True)
+        for _, path in cache_files[PDF_CACHE_MAX_ENTRIES:]:
             try:
-                if hasattr(fitz, 'open'):
-                    doc = fitz.open(pdf_path)
-                else:
-                    doc = fitz.Document(pdf_path)
-            except Exception as open_error:
-                try:
-                    doc = fitz.Document(pdf_path)
-                except Exception as fallback_error:
-                    raise Exception(f"Could not open PDF: {open_error}, {fallback_error}")
-            
-            result['pages'] = len(doc)
-            doc.close()
-            
-            result['valid'] = True
-            
+                os.unlink(path)
+            except OSError:
+                pass
+    
+    def _extract_pages_parallel(self, pdf_path: str, total_pages: int, num_workers: int) -> Optional[List[str]]:
+        """Extract page texts in contiguous ranges across worker processes (None on failure)"""
+        step = -(-total_pages // num_workers)  # ceil division
+        starts = list(range(0, total_pages, step))
+        stops = [min(start + step, total_pages) for start in starts]
+        
+        try:
+            raw_texts = [None] * total_pages
+            with ProcessPoolExecutor(max_workers=len(starts)) as executor:
+                for start, texts in executor.map(_extract_page_range, [pdf_path] * len(starts), starts, stops):
+                    raw_texts[start:start + len(texts)] = texts
+            return raw_texts
         except Exception as e:
-            result['error'] = f"PDF validation failed: {str(e)}"
+            logger.warning(f"Parallel PDF extraction failed, falling back to sequential: {e}")
+            return None
+    
+    def validate_pdf(self, pdf_path: str) -> Dict[str, Any]:
+        """
+        Validate PDF file
         
-        return result
+        Args:
+            pdf_path (str): Path to the PDF file
+            
+        Returns:
+            Dict containing validation results
+        """
+        processed = self.process(pdf_path, extract_text=False)
+        return {
+            'valid': processed['valid'],
+            'error': processed['error'],
+            'file_size': processed['file_size'],
+            'pages': processed['total_pages']
+        }
     
     def extract_questions(self, text: str) -> List[str]:
         """
@@ -190,24 +387,29 @@ class PDFProcessor:
         if not text or not text.strip():
             return []
         
-        questions = []
-        sentences = text.split('.')
+        # Statement-style exams have no '?' at all - skip the question scan
+        if '?' not in text:
+            return self.chunk_text_by_sentences(text, max_chunks=10)
         
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if sentence and '?' in sentence:
-                # Split by question marks and clean up
-                question_parts = sentence.split('?')
-                for part in question_parts[:-1]:  # Skip the last empty part
-                    question = part.strip() + '?'
-                    if len(question) > 5:  # Filter out very short questions
-                        questions.append(question)
+        # ASCII text is scanned as bytes - no per-character kind dispatch
+        ascii_text = _ascii_bytes(text)
+        if ascii_text is not None:
+            matches = _QUESTION_RE_B.finditer(ascii_text)
+        else:
+            matches = _QUESTION_RE.finditer(text)
+        
+        # Single scan; stops as soon as MAX_QUESTIONS have been found
+        candidates = (match.group(1).strip() for match in matches)
+        found = list(islice((c for c in candidates if len(c) >= 5), MAX_QUESTIONS))  # Filter out very short questions
+        if ascii_text is not None:
+            found = [question.decode('ascii') for question in found]
+        questions = [question + '?' for question in found]
         
         # If no questions found, return the text chunked by sentences
         if not questions:
             return self.chunk_text_by_sentences(text, max_chunks=10)
         
-        return questions[:20]  # Return max 20 questions
+        return questions
     
     def chunk_text_by_sentences(self, text: str, max_chunks: int = 10) -> List[str]:
         """
@@ -223,28 +425,41 @@ class PDFProcessor:
         if not text or not text.strip():
             return []
         
-        # Split by periods and other sentence endings
-        import re
-        sentences = re.split(r'[.!?]+', text)
+        # ASCII text is split as bytes and only the finished chunks are decoded
+        ascii_text = _ascii_bytes(text)
+        if ascii_text is not None:
+            sentences = _iter_sentences(ascii_text, _SENT_RE_B)
+            space = b' '
+        else:
+            sentences = _iter_sentences(text)
+            space = ' '
         
         chunks = []
-        current_chunk = ""
-        max_chunk_length = 500  # Characters per chunk
+        cur_parts = []
+        cur_len = 0  # Length of space.join(cur_parts)
         
+        # Split by periods and other sentence endings
         for sentence in sentences:
             sentence = sentence.strip()
             if not sentence:
                 continue
-                
+            
             # If adding this sentence would make chunk too long, start new chunk
-            if len(current_chunk + sentence) > max_chunk_length and current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = sentence
+            if cur_parts and cur_len + len(sentence) > MAX_CHUNK_LENGTH:
+                chunks.append(space.join(cur_parts))
+                if len(chunks) == max_chunks:
+                    break
+                cur_parts = [sentence]
+                cur_len = len(sentence)
             else:
-                current_chunk += (" " if current_chunk else "") + sentence
-        
-        # Add the last chunk if it exists
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
+                cur_len += len(sentence) + (1 if cur_parts else 0)
+                cur_parts.append(sentence)
+        else:
+            # Add the last chunk if it exists
+            if cur_parts:
+                chunks.append(space.join(cur_parts))
         
-        return chunks[:max_chunks]
\ No newline at end of file
+        chunks = chunks[:max_chunks]
+        if ascii_text is not None:
+            chunks = [chunk.decode('ascii') for chunk in chunks]
+        return chunks
\ No newline at end of file
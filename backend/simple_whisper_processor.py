@@ -4,19 +4,51 @@ This handles audio file transcription without complex dependencies
 """
 
 import os
+import math
+import mmap
+import struct
 import wave
-import numpy as np
 import tempfile
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Canonical 44-byte RIFF/WAVE header: RIFF chunk, 16-byte PCM fmt chunk, data chunk
+_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+# Demo transcriptions by (duration bucket, loud) - longer utterances map to longer commands
+_DEMO_TABLE = {
+    (3, True): "repeat question one again",     # High volume, clear command
+    (3, False): "what is the first question",   # Lower volume, query
+    (2, True): "play the audio",
+    (2, False): "next question please",
+    (1, True): "pause the recording",
+    (1, False): "play question two",
+    (0, True): "stop the audio",                # Very short utterances or noise
+    (0, False): "stop the audio",
+}
+_DEMO_RMS_THRESHOLDS = (float('inf'), 600, 800, 1000)  # Loudness cut-off per duration bucket
+
+_np = None
+
+def _get_numpy():
+    """Import NumPy on first use so importing this module stays cheap"""
+    global _np
+    if _np is None:
+        import numpy as _np
+    return _np
+
 class SimpleWhisperProcessor:
     """
     Simplified audio processor that can be extended with real Whisper models
     """
     
+    RMS_BLOCK_FRAMES = 4096  # Frames read per block when measuring loudness
+    
     def __init__(self):
         self.sample_rate = 16000
         
@@ -31,20 +63,14 @@ class SimpleWhisperProcessor:
             Dict with success status, transcribed text, and metadata
         """
         try:
-            # Load and analyze the audio file
-            with wave.open(audio_file_path, 'rb') as wav_file:
-                frames = wav_file.getnframes()
-                sample_rate = wav_file.getframerate()
-                channels = wav_file.getnchannels()
-                duration = frames / sample_rate
-                
-                # Read the audio data
-                audio_data = wav_file.readframes(frames)
-                audio_array = np.frombuffer(audio_data, dtype=np.int16)
-                
-                # Calculate RMS (loudness) to detect if there's actual speech
-                rms = np.sqrt(np.mean(audio_array.astype(np.float32) ** 2))
-                
+            # Load and analyze the audio file - zero-copy for canonical PCM16 files
+            stats = self._pcm16_stats_mmap(audio_file_path) or self._pcm16_stats_wave(audio_file_path)
+            frames, sample_rate, channels, sum_squares, sample_count = stats
+            duration = frames / sample_rate
+            
+            # Calculate RMS (loudness) to detect if there's actual speech
+            rms = math.sqrt(sum_squares / sample_count) if sample_count else 0.0
+            
             logger.info(f"Audio file analysis: {duration:.2f}s, {channels} channels, {sample_rate}Hz, RMS: {rms:.2f}")
             
             # For now, return intelligent demo responses based on audio characteristics
@@ -68,54 +94,86 @@ class SimpleWhisperProcessor:
                 'error': str(e)
             }
     
-    def _generate_demo_transcription(self, duration: float, rms: float) -> str:
+    def _pcm16_stats_mmap(self, audio_file_path: str) -> Optional[Tuple[int, int, int, int, int]]:
         """
-        Generate intelligent demo transcription based on audio characteristics
-        This simulates real voice commands for your hackathon demo
+        Read (frames, sample_rate, channels, sum_squares, sample_count) from a canonical
+        PCM16 WAV through a memory map, without copying the samples
+        
+        Returns None when the header is not the plain 44-byte PCM16 layout.
         """
+        np = _get_numpy()
         
-        # Base responses for different durations and volumes
-        voice_commands = [
-            "repeat question one again",
-            "play the audio",
-            "pause the recording",
-            "what is the first question",
-            "next question please",
-            "go back to previous question",
-            "play question two",
-            "stop the audio"
-        ]
+        with open(audio_file_path, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            if file_size < _WAV_HEADER.size:
+                return None
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                (riff, _, wave_id, fmt_id, fmt_size, audio_format, channels, sample_rate,
+                 _, _, bits_per_sample, data_id, data_size) = _WAV_HEADER.unpack_from(mm, 0)
+                
+                if (riff != b'RIFF' or wave_id != b'WAVE' or fmt_id != b'fmt ' or fmt_size != 16
+                        or audio_format != 1 or bits_per_sample != 16 or data_id != b'data'
+                        or not channels or not sample_rate):
+                    return None
+                
+                # Streaming writers may leave the size open - trust the file length instead
+                sample_count = min(data_size, file_size - _WAV_HEADER.size) // 2
+                samples = np.frombuffer(mm, dtype=np.int16, count=sample_count, offset=_WAV_HEADER.size)
+                
+                # Exact integer sum of squares, block by block to bound the int64 temporaries
+                sum_squares = 0
+                block_size = self.RMS_BLOCK_FRAMES * channels
+                for start in range(0, sample_count, block_size):
+                    block = samples[start:start + block_size].astype(np.int64)
+                    sum_squares += int(np.dot(block, block))
+                
+                # The view must be released before the map can close
+                del samples
         
-        # Choose response based on audio duration (simulating different command lengths)
-        if duration > 3.0:
-            # Longer utterances -> more complex commands
-            if rms > 1000:
-                return "repeat question one again"  # High volume, clear command
-            else:
-                return "what is the first question"  # Lower volume, query
-        elif duration > 2.0:
-            # Medium utterances
-            if rms > 800:
-                return "play the audio"
-            else:
-                return "next question please"
-        elif duration > 1.0:
-            # Short utterances
-            if rms > 600:
-                return "pause the recording"
-            else:
-                return "play question two"
-        else:
-            # Very short utterances or noise
-            return "stop the audio"
+        return sample_count // channels, sample_rate, channels, sum_squares, sample_count
+    
+    def _pcm16_stats_wave(self, audio_file_path: str) -> Tuple[int, int, int, int, int]:
+        """Same as _pcm16_stats_mmap, through the wave module (any header layout)"""
+        np = _get_numpy()
+        
+        with wave.open(audio_file_path, 'rb') as wav_file:
+            frames = wav_file.getnframes()
+            sample_rate = wav_file.getframerate()
+            channels = wav_file.getnchannels()
             
-    def transcribe_numpy_audio(self, audio_array: np.ndarray, sample_rate: int) -> str:
+            # Block by block so long recordings are never fully in memory
+            sum_squares = 0
+            sample_count = 0
+            while True:
+                audio_data = wav_file.readframes(self.RMS_BLOCK_FRAMES)
+                if not audio_data:
+                    break
+                # Exact integer sum of squares - no float temporaries
+                block = np.frombuffer(audio_data, dtype=np.int16).astype(np.int64)
+                sum_squares += int(np.dot(block, block))
+                sample_count += block.size
+        
+        return frames, sample_rate, channels, sum_squares, sample_count
+    
+    def _generate_demo_transcription(self, duration: float, rms: float) -> str:
+        """
+        Generate intelligent demo transcription based on audio characteristics
+        This simulates real voice commands for your hackathon demo
+        """
+        duration_bucket = 3 if duration > 3.0 else 2 if duration > 2.0 else 1 if duration > 1.0 else 0
+        return _DEMO_TABLE[(duration_bucket, rms > _DEMO_RMS_THRESHOLDS[duration_bucket])]
+    
+    def transcribe_numpy_audio(self, audio_array: 'np.ndarray', sample_rate: int) -> str:
         """
         Transcribe audio from numpy array (for future real Whisper integration)
         """
+        np = _get_numpy()
+        
         # For now, analyze the audio characteristics
         duration = len(audio_array) / sample_rate
-        rms = np.sqrt(np.mean(audio_array ** 2))
+        samples = np.asarray(audio_array, dtype=np.float32).ravel()
+        rms = math.sqrt(float(np.vdot(samples, samples)) / samples.size) if samples.size else 0.0
         
         logger.info(f"Numpy audio analysis: {duration:.2f}s, RMS: {rms:.4f}")
         
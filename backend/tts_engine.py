@@ -5,50 +5,224 @@ Handles audio generation from text using pyttsx3
 
 import pyttsx3
 import pygame
+import asyncio
 import tempfile
+import io
 import os
+import math
+import sys
+import queue
+import subprocess
+import re
+import json
+import shutil
+import hashlib
+import functools
+import itertools
+import struct
 import threading
 import time
-from typing import Optional, Dict, Any, List
+import wave
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+from typing import Optional, Dict, Any, List, Iterator
 import logging
 
+try:
+    # SAPI5 memory streams (Windows) - lets synthesis skip the filesystem
+    import win32com.client
+    WIN32COM_AVAILABLE = True
+except ImportError:
+    win32com = None
+    WIN32COM_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# pyttsx3 engines are not thread-safe and every TTSEngine shares the one below
+_ENGINE_LOCK = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def _get_engine():
+    """Process-wide pyttsx3 engine - the SAPI5 COM object / eSpeak helper is created once"""
+    return pyttsx3.init()
+
+# Last value written per engine property (the engine is shared, so this is too)
+_APPLIED_PROPERTIES: Dict[str, Any] = {}
+
+def _set_engine_property(engine, name: str, value):
+    """setProperty only when the value changes (SAPI5 marshals every call through COM); caller holds _ENGINE_LOCK"""
+    if name not in _APPLIED_PROPERTIES or _APPLIED_PROPERTIES[name] != value:
+        engine.setProperty(name, value)
+        _APPLIED_PROPERTIES[name] = value
+
+# Decoded prompts kept in memory for replay on the pinned playback channel
+SOUND_CACHE_SIZE = 64
+
+# Hot WAV bytes kept in memory by text_to_speech_bytes()
+MEMORY_AUDIO_ENTRIES = 32
+MEMORY_AUDIO_MAX_BYTES = 1024 * 1024  # Larger clips are not kept
+
+# SAPI5 stream format 22 = SAFT22kHz16BitMono
+SAPI_FORMAT_22KHZ_16BIT_MONO = 22
+SAPI_SAMPLE_RATE = 22050
+
+# Progressive playback: chunk lengths in ms, so the first audio is out after ~20 ms of speech
+PROGRESSIVE_CHUNK_MS = (20, 40, 80, 160, 200)
+
+# espeak-ng can write WAV to stdout, letting Linux synthesize without a temp file. Only used
+# where pyttsx3 itself drives eSpeak, so the selected voice id is an eSpeak voice identifier
+# (macOS pyttsx3 uses NSSpeechSynthesizer voices, which espeak-ng cannot reproduce)
+ESPEAK_NG = shutil.which('espeak-ng') if sys.platform not in ('win32', 'darwin') else None
+
+# Sentence boundaries used to synthesize long prompts piece by piece when streaming
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Generated audio is kept here, keyed by a hash of the text and voice settings
+TTS_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'ilumina_tts_cache')
+TTS_CACHE_MAX_BYTES = 256 * 1024 * 1024
+TTS_CACHE_MAX_ENTRIES = 2048
+TTS_CACHE_MANIFEST = 'index.json'
+
+# How long cleanup() lets queued synthesis jobs drain before dropping the engine
+WORKER_SHUTDOWN_TIMEOUT = 10.0
+
+# How long a caller waits on a queued synthesis job (including the jobs ahead of it)
+SYNTHESIS_RESULT_TIMEOUT = 60.0
+
+# Single-flight: one synthesis per cache key, other callers wait for its result
+SYNTHESIS_WAIT_TIMEOUT = 30.0
+_INFLIGHT: Dict[str, threading.Event] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+# Unique scratch file names without NamedTemporaryFile's create/open/close round trip
+_temp_counter = itertools.count()
+
+def _temp_wav_path(directory: str) -> str:
+    """A fresh .wav path in directory, unique per process, thread and call"""
+    return os.path.join(directory, f"ilumina_{os.getpid()}_{threading.get_ident()}_{next(_temp_counter)}.wav")
+
+# Scratch files (ilumina_*.wav, plus *.tmp/*.lock in our own cache dir) older than this
+# are leftovers of a crashed run
+SCRATCH_TTL = 3600
+
+@functools.lru_cache(maxsize=None)
+def _sweep_scratch_files(directory: str, own_directory: bool = False):
+    """
+    Delete stale scratch files from directory - once per process and directory.
+    Only ilumina_*.wav files are touched unless own_directory is set: a shared directory such as
+    the system temp dir holds other programs' .tmp/.lock files.
+    """
+    now = time.time()
+    removed = 0
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if not ((name.startswith('ilumina_') and name.endswith('.wav'))
+                        or (own_directory and (name.endswith('.tmp') or name.endswith('.lock')))):
+                    continue
+                try:
+                    # DirEntry carries the stat on most platforms - no extra syscall
+                    if entry.is_file(follow_symlinks=False) and now - entry.stat(follow_symlinks=False).st_mtime > SCRATCH_TTL:
+                        os.unlink(entry.path)
+                        removed += 1
+                except OSError:
+                    pass
+    except OSError as e:
+        logger.debug(f"Scratch sweep skipped for {directory}: {e}")
+    
+    if removed:
+        logger.info(f"Removed {removed} stale TTS scratch files from {directory}")
+
+def _file_size(path: str) -> int:
+    """Size of a file in bytes, 0 if it doesn't exist - a single stat() call"""
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return 0
+
+def _remove_file(path: str):
+    """Delete a file if it exists"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+# Mixer buffer in frames: 512 underruns on many ALSA/PipeWire setups, CoreAudio prefers larger
+MIXER_BUFFER = {'win32': 512, 'darwin': 2048}.get(sys.platform, 1024)
+
+# Speech needs no more than 16 kHz; the mixer is reopened at the TTS rate if it differs
+MIXER_FREQUENCY = 16000
+
 class TTSEngine:
-    def __init__(self):
-        """Initialize TTS engine and pygame mixer"""
+    def __init__(self, cache_enabled: bool = True):
+        """
+        Initialize TTS engine and pygame mixer
+        
+        Args:
+            cache_enabled (bool): Reuse synthesized audio across calls and sessions
+        """
         self.engine = None
+        self.cache_enabled = cache_enabled
         self.pygame_initialized = False
         self.current_audio_file = None
         self.is_playing = False
         self.is_paused = False
         self.playback_position = 0
+        self._stream_cancel = None  # Set to stop the sentence feeder of speak_streaming()
+        self._voices_cache: Optional[List[Dict[str, str]]] = None  # Installed voices don't change at runtime
+        
+        # Playback runs on one reserved mixer channel from decoded, in-memory Sounds
+        self._channel = None
+        self._sound_cache = OrderedDict()  # (path, mtime, size) -> pygame.mixer.Sound
+        self._bytes_cache = OrderedDict()  # cache key -> WAV bytes
+        
+        # Persistent synthesis cache: key -> (path, size, duration), least recently used first
+        self.cache_dir = TTS_CACHE_DIR
+        os.makedirs(self.cache_dir, exist_ok=True)
+        _sweep_scratch_files(self.cache_dir, own_directory=True)
+        _sweep_scratch_files(tempfile.gettempdir())
+        self._lru = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_lock = threading.Lock()
+        self._load_cache_manifest()
         
         self._initialize_tts()
         self._initialize_pygame()
+        
+        # pyttsx3 engines are not thread-safe: one worker runs every synthesis job serially
+        self._tts_queue = queue.Queue()
+        self._submit_lock = threading.Lock()  # Orders submissions against cleanup()'s sentinel
+        self._shutting_down = False
+        self._worker = threading.Thread(target=self._tts_loop, name='tts-worker', daemon=True)
+        self._worker.start()
     
     def _initialize_tts(self):
         """Initialize pyttsx3 TTS engine"""
         try:
-            self.engine = pyttsx3.init()
+            self.engine = _get_engine()
             
             # Set default properties
-            voices = self.engine.getProperty('voices')
-            if voices:
-                self.engine.setProperty('voice', voices[0].id)
-            
-            self.engine.setProperty('rate', 150)  # Speech rate
-            self.engine.setProperty('volume', 0.8)  # Volume level
+            with _ENGINE_LOCK:
+                voices = self.engine.getProperty('voices')
+                if voices:
+                    _set_engine_property(self.engine, 'voice', voices[0].id)
+                
+                _set_engine_property(self.engine, 'rate', 150)  # Speech rate
+                _set_engine_property(self.engine, 'volume', 0.8)  # Volume level
             
             logger.info("TTS engine initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize TTS engine: {e}")
             self.engine = None
     
-    def _initialize_pygame(self):
+    def _initialize_pygame(self, frequency: int = MIXER_FREQUENCY):
         """Initialize pygame mixer for audio playback"""
         try:
-            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+            # pyttsx3 output is mono - no stereo upmix in the mixer
+            pygame.mixer.init(frequency=frequency, size=-16, channels=1, buffer=MIXER_BUFFER)
+            pygame.mixer.set_reserved(1)
+            self._channel = pygame.mixer.Channel(0)
             self.pygame_initialized = True
             logger.info("Pygame mixer initialized successfully")
         except Exception as e:
@@ -57,6 +231,9 @@ class TTSEngine:
     
     def get_available_voices(self) -> List[Dict[str, str]]:
         """Get list of available TTS voices"""
+        if self._voices_cache is not None:
+            return self._voices_cache
+        
         voices_list = []
         
         if not self.engine:
@@ -64,35 +241,57 @@ class TTSEngine:
         
         try:
             voices = self.engine.getProperty('voices')
-            for i, voice in enumerate(voices):
+            for voice in voices:
                 voices_list.append({
                     'id': voice.id,
                     'name': voice.name,
-                    'language': getattr(voice, 'languages', ['en'])[0] if hasattr(voice, 'languages') else 'en',
+                    'language': (getattr(voice, 'languages', None) or ['en'])[0],
                     'gender': getattr(voice, 'gender', 'unknown')
                 })
+            self._voices_cache = voices_list
         except Exception as e:
             logger.error(f"Failed to get voices: {e}")
         
         return voices_list
     
+    def invalidate_voices(self):
+        """Forget the memoized voice list (e.g. after installing a voice)"""
+        self._voices_cache = None
+    
     def set_voice_properties(self, voice_id: Optional[str] = None, rate: int = 150, volume: float = 0.8):
         """Set TTS voice properties"""
         if not self.engine:
             return False
         
         try:
-            if voice_id:
-                self.engine.setProperty('voice', voice_id)
+            if not 50 <= rate <= 300:
+                rate = max(50, min(300, rate))
+            if not 0.0 <= volume <= 1.0:
+                volume = max(0.0, min(1.0, volume))
             
-            self.engine.setProperty('rate', max(50, min(300, rate)))
-            self.engine.setProperty('volume', max(0.0, min(1.0, volume)))
+            with _ENGINE_LOCK:
+                if voice_id:
+                    _set_engine_property(self.engine, 'voice', voice_id)
+                
+                _set_engine_property(self.engine, 'rate', rate)
+                _set_engine_property(self.engine, 'volume', volume)
             
             return True
         except Exception as e:
             logger.error(f"Failed to set voice properties: {e}")
             return False
     
+    def voice_cache_key(self) -> str:
+        """Get a string identifying the current voice settings, for caching generated audio"""
+        if not self.engine:
+            return ''
+        
+        try:
+            return f"{self.engine.getProperty('voice')}|{self.engine.getProperty('rate')}|{self.engine.getProperty('volume')}"
+        except Exception as e:
+            logger.warning(f"Could not read voice properties: {e}")
+            return ''
+    
     def text_to_speech_file(self, text: str, output_path: Optional[str] = None) -> Dict[str, Any]:
         """
         Convert text to speech and save as audio file
@@ -104,6 +303,114 @@ class TTSEngine:
         Returns:
             Dict containing result information
         """
+        return self._await_synthesis(self.text_to_speech_file_async(text, output_path))
+    
+    def text_to_speech_file_async(self, text: str, output_path: Optional[str] = None) -> Future:
+        """
+        Queue text for synthesis on the worker thread and return immediately
+        
+        Args:
+            text (str): Text to convert
+            output_path (str, optional): Output file path. If None, uses the cached file.
+            
+        Returns:
+            Future resolving to the same dict as text_to_speech_file()
+        """
+        future = Future()
+        with self._submit_lock:
+            if self._shutting_down:
+                # Nothing would run a job queued behind cleanup()'s sentinel
+                future.set_result({'success': False, 'file_path': None, 'duration': 0,
+                                   'error': "TTS engine is shutting down"})
+                return future
+            if self._worker.is_alive():
+                self._tts_queue.put((text, output_path, future))
+                return future
+        future.set_result(self._synthesize_file(text, output_path))
+        return future
+    
+    def _await_synthesis(self, future: Future) -> Dict[str, Any]:
+        """Result of a queued job, or an error result if the worker does not get to it in time"""
+        try:
+            return future.result(timeout=SYNTHESIS_RESULT_TIMEOUT)
+        except FuturesTimeoutError:
+            future.cancel()
+            logger.warning(f"TTS job not finished after {SYNTHESIS_RESULT_TIMEOUT}s")
+            return {'success': False, 'file_path': None, 'duration': 0,
+                    'error': "Timed out waiting for TTS synthesis"}
+    
+    def text_to_speech_file_batch(self, texts: List[str],
+                                  output_paths: Optional[List[Optional[str]]] = None) -> List[Dict[str, Any]]:
+        """
+        Convert several texts to speech, synthesizing all uncached ones in one engine run
+        
+        Args:
+            texts (List[str]): Texts to convert
+            output_paths (List[str], optional): Output file path per text (None entries use the cache)
+            
+        Returns:
+            List of result dicts, in the same order as texts
+        """
+        if output_paths is None:
+            output_paths = [None] * len(texts)
+        
+        if self.engine and self.cache_enabled:
+            voice_key = self.voice_cache_key()
+            jobs = {}  # cache_key -> (text, temp_path)
+            
+            try:
+                for text in texts:
+                    if not text.strip():
+                        continue
+                    cache_key = self._cache_key(text, voice_key)
+                    with self._cache_lock:
+                        cached = cache_key in self._lru
+                    if cached or cache_key in jobs or os.path.exists(os.path.join(self.cache_dir, f"{cache_key}.wav")):
+                        continue
+                    jobs[cache_key] = (text, _temp_wav_path(self.cache_dir))
+                
+                if jobs:
+                    # pyttsx3 queues every save_to_file and runs them in a single loop
+                    with _ENGINE_LOCK:
+                        for text, temp_path in jobs.values():
+                            self.engine.save_to_file(text, temp_path)
+                        self.engine.runAndWait()
+                    
+                    for cache_key, (_, temp_path) in jobs.items():
+                        size = _file_size(temp_path)
+                        if size:
+                            cache_path = os.path.join(self.cache_dir, f"{cache_key}.wav")
+                            os.replace(temp_path, cache_path)
+                            self._cache_insert(cache_key, (cache_path, size, self._get_audio_duration(cache_path)))
+                    
+                    logger.info(f"Batch-generated {len(jobs)} TTS audio files")
+            except Exception as e:
+                logger.error(f"Batch TTS generation failed: {e}")
+            finally:
+                for _, temp_path in jobs.values():
+                    _remove_file(temp_path)
+        
+        # Everything is cached now; anything that failed above is retried one by one
+        futures = [self.text_to_speech_file_async(text, path) for text, path in zip(texts, output_paths)]
+        return [self._await_synthesis(future) for future in futures]
+    
+    def _tts_loop(self):
+        """Worker: run queued synthesis jobs one at a time until cleanup() sends None"""
+        while True:
+            job = self._tts_queue.get()
+            if job is None:
+                break
+            
+            text, output_path, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._synthesize_file(text, output_path))
+            except BaseException as e:
+                future.set_exception(e)
+    
+    def _synthesize_file(self, text: str, output_path: Optional[str]) -> Dict[str, Any]:
+        """Synthesize text (or reuse cached audio) - only called on the worker thread"""
         result = {
             'success': False,
             'file_path': None,
@@ -119,37 +426,97 @@ class TTSEngine:
             result['error'] = "Empty text provided"
             return result
         
+        if not self.cache_enabled:
+            return self._synthesize_uncached(text, output_path, result)
+        
         try:
-            # Use temp file if no output path specified
-            if not output_path:
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-                output_path = temp_file.name
-                temp_file.close()
+            # Identical text and voice settings always produce identical audio
+            cache_key = self._cache_key(text)
+            cache_path = os.path.join(self.cache_dir, f"{cache_key}.wav")
+            
+            with self._cache_lock:
+                entry = self._lru.get(cache_key)
+                if entry is not None:
+                    self._lru.move_to_end(cache_key)
+            
+            if entry is not None and not _file_size(entry[0]):
+                # Deleted behind our back (another engine's eviction, the tmp cleaner) - regenerate
+                self._cache_discard(cache_key, entry)
+                entry = None
+            
+            if entry is None:
+                entry = self._cached_entry(cache_path)
+                if entry is not None:
+                    self._cache_insert(cache_key, entry)
+            
+            if entry is not None:
+                logger.info(f"TTS cache hit: {cache_path}")
             else:
+                entry = self._synthesize_once(text, cache_key, cache_path)
+                if entry is None:
+                    result['error'] = "Failed to generate audio file"
+                    return result
+                self._cache_insert(cache_key, entry)
+            
+            if output_path:
                 # Ensure directory exists for custom output path
                 output_dir = os.path.dirname(output_path)
-                if output_dir and not os.path.exists(output_dir):
+                if output_dir:
                     os.makedirs(output_dir, exist_ok=True)
-                    logger.info(f"Created directory: {output_dir}")
+                
+                try:
+                    self._place_cached_file(cache_path, output_path)
+                except FileNotFoundError:
+                    # Evicted by another engine sharing the cache directory - regenerate
+                    entry = self._synthesize_to_cache(text, cache_path)
+                    if entry is None:
+                        result['error'] = "Failed to generate audio file"
+                        return result
+                    self._cache_insert(cache_key, entry)
+                    self._place_cached_file(cache_path, output_path)
             
-            logger.info(f"Attempting to generate TTS audio at: {output_path}")
+            result.update({
+                'success': True,
+                'file_path': output_path or cache_path,
+                'duration': entry[2]
+            })
+                
+        except Exception as e:
+            error_msg = f"TTS generation failed: {str(e)}"
+            logger.error(error_msg)
+            result['error'] = error_msg
+        
+        return result
+    
+    def _cache_key(self, text: str, voice_key: Optional[str] = None) -> str:
+        """Hash of the text and voice settings that names its cached audio"""
+        if voice_key is None:
+            voice_key = self.voice_cache_key()
+        return hashlib.blake2b(f"{text}|{voice_key}".encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _synthesize_uncached(self, text: str, output_path: Optional[str], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Synthesize straight into output_path (or a scratch file) with the cache disabled"""
+        try:
+            if output_path:
+                output_dir = os.path.dirname(output_path)
+                if output_dir:
+                    os.makedirs(output_dir, exist_ok=True)
+            else:
+                output_path = _temp_wav_path(tempfile.gettempdir())
             
-            # Generate speech
-            self.engine.save_to_file(text, output_path)
-            self.engine.runAndWait()
+            with _ENGINE_LOCK:
+                self.engine.save_to_file(text, output_path)
+                self.engine.runAndWait()
             
-            # Check if file was created
-            if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            if _file_size(output_path) > 0:
                 result.update({
                     'success': True,
                     'file_path': output_path,
                     'duration': self._get_audio_duration(output_path)
                 })
-                
                 logger.info(f"Generated TTS audio: {output_path}")
             else:
                 result['error'] = "Failed to generate audio file"
-                
         except Exception as e:
             error_msg = f"TTS generation failed: {str(e)}"
             logger.error(error_msg)
@@ -157,8 +524,351 @@ class TTSEngine:
         
         return result
     
+    def _synthesize_once(self, text: str, cache_key: str, cache_path: str):
+        """
+        Synthesize a cache entry unless another engine (thread or process) already is
+        
+        Threads in this process wait on a shared Event; other processes are kept
+        out by an O_EXCL lock file next to the cache entry.
+        """
+        with _INFLIGHT_LOCK:
+            event = _INFLIGHT.get(cache_key)
+            is_leader = event is None
+            if is_leader:
+                event = _INFLIGHT[cache_key] = threading.Event()
+        
+        if not is_leader:
+            event.wait(timeout=SYNTHESIS_WAIT_TIMEOUT)
+            return self._cached_entry(cache_path) or self._synthesize_to_cache(text, cache_path)
+        
+        lock_path = cache_path + '.lock'
+        try:
+            deadline = time.monotonic() + SYNTHESIS_WAIT_TIMEOUT
+            while True:
+                try:
+                    os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                    break
+                except FileExistsError:
+                    # Another process is synthesizing the same text
+                    entry = self._cached_entry(cache_path)
+                    if entry is not None:
+                        return entry
+                    if time.monotonic() > deadline:
+                        logger.warning(f"Removing stale TTS lock: {lock_path}")
+                        deadline = time.monotonic() + SYNTHESIS_WAIT_TIMEOUT
+                        try:
+                            os.unlink(lock_path)
+                        except OSError:
+                            pass
+                        continue
+                    time.sleep(0.05)
+            
+            try:
+                return self._cached_entry(cache_path) or self._synthesize_to_cache(text, cache_path)
+            finally:
+                os.unlink(lock_path)
+        finally:
+            with _INFLIGHT_LOCK:
+                del _INFLIGHT[cache_key]
+            event.set()
+    
+    def _cached_entry(self, cache_path: str):
+        """(path, size, duration) for a published cache file, or None"""
+        try:
+            size = os.path.getsize(cache_path)
+        except OSError:
+            return None
+        return cache_path, size, self._get_audio_duration(cache_path)
+    
+    def _synthesize_to_cache(self, text: str, cache_path: str):
+        """Synthesize text into the cache, returning (path, size, duration) or None on failure"""
+        temp_path = _temp_wav_path(self.cache_dir)
+        
+        try:
+            logger.info(f"Attempting to generate TTS audio at: {cache_path}")
+            
+            # Generate speech
+            with _ENGINE_LOCK:
+                self.engine.save_to_file(text, temp_path)
+                self.engine.runAndWait()
+            
+            # Check if file was created
+            size = _file_size(temp_path)
+            if size == 0:
+                return None
+            
+            # Publish atomically so other engines never see a half-written file
+            os.replace(temp_path, cache_path)
+            logger.info(f"Generated TTS audio: {cache_path}")
+            return cache_path, size, self._get_audio_duration(cache_path)
+        finally:
+            _remove_file(temp_path)
+    
+    def _cache_insert(self, cache_key: str, entry: tuple):
+        """Add an entry as most recently used and evict least recently used files over the caps"""
+        evicted = []
+        with self._cache_lock:
+            old = self._lru.pop(cache_key, None)
+            if old is not None:
+                self._cache_bytes -= old[1]
+            self._lru[cache_key] = entry
+            self._cache_bytes += entry[1]
+            
+            while len(self._lru) > 1 and (self._cache_bytes > TTS_CACHE_MAX_BYTES
+                                          or len(self._lru) > TTS_CACHE_MAX_ENTRIES):
+                _, (path, size, _) = self._lru.popitem(last=False)
+                self._cache_bytes -= size
+                evicted.append(path)
+        
+        for path in evicted:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+    
+    def _cache_discard(self, cache_key: str, entry: tuple):
+        """Forget an index entry whose file no longer exists (unless it was replaced meanwhile)"""
+        with self._cache_lock:
+            if self._lru.get(cache_key) == entry:
+                del self._lru[cache_key]
+                self._cache_bytes -= entry[1]
+    
+    def _load_cache_manifest(self):
+        """Warm-start the LRU index from the manifest written by the last cleanup()"""
+        manifest_path = os.path.join(self.cache_dir, TTS_CACHE_MANIFEST)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            for cache_key, (path, _, duration) in manifest:
+                # Files may have been removed since (other engines, the tmp cleaner)
+                size = _file_size(path)
+                if size:
+                    self._lru[cache_key] = (path, size, duration)
+                    self._cache_bytes += size
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable TTS cache manifest: {e}")
+            self._lru.clear()
+            self._cache_bytes = 0
+    
+    def _save_cache_manifest(self):
+        """Atomically write the LRU index (oldest first) next to the cached files"""
+        manifest_path = os.path.join(self.cache_dir, TTS_CACHE_MANIFEST)
+        with self._cache_lock:
+            manifest = [[cache_key, list(entry)] for cache_key, entry in self._lru.items()]
+        
+        temp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, manifest_path)
+    
+    @staticmethod
+    def _place_cached_file(cache_path: str, output_path: str):
+        """Expose a cached file at output_path (hard link when possible, copy otherwise)"""
+        temp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.link(cache_path, temp_path)
+        except OSError:
+            shutil.copyfile(cache_path, temp_path)
+        os.replace(temp_path, output_path)
+    
+    def text_to_speech_bytes(self, text: str) -> Optional[bytes]:
+        """
+        Synthesize text to WAV bytes in memory
+        
+        Uses espeak-ng --stdout or a SAPI5 memory stream when available, so the
+        audio never touches the disk; otherwise reads the file-based result.
+        
+        Args:
+            text (str): Text to convert
+            
+        Returns:
+            bytes: Complete WAV file, or None on failure
+        """
+        if not self.engine or not text.strip():
+            return None
+        
+        cache_key = self._cache_key(text)
+        wav_bytes = self._bytes_cache.get(cache_key)
+        if wav_bytes is not None:
+            self._bytes_cache.move_to_end(cache_key)
+            return wav_bytes
+        
+        try:
+            if ESPEAK_NG:
+                completed = subprocess.run(self._espeak_command(text), capture_output=True, check=True)
+                wav_bytes = completed.stdout
+            elif WIN32COM_AVAILABLE and sys.platform == 'win32':
+                wav_bytes = self._sapi_to_bytes(text)
+        except Exception as e:
+            logger.warning(f"In-memory synthesis failed, using file output: {e}")
+            wav_bytes = None
+        
+        if not wav_bytes:
+            tts_result = self.text_to_speech_file(text)
+            if not tts_result['success']:
+                return None
+            with open(tts_result['file_path'], 'rb') as f:
+                wav_bytes = f.read()
+        
+        if len(wav_bytes) <= MEMORY_AUDIO_MAX_BYTES:
+            self._bytes_cache[cache_key] = wav_bytes
+            if len(self._bytes_cache) > MEMORY_AUDIO_ENTRIES:
+                self._bytes_cache.popitem(last=False)
+        
+        return wav_bytes
+    
+    def _espeak_command(self, text: str) -> List[str]:
+        """espeak-ng command line writing text as WAV to stdout with the engine's voice, rate and volume"""
+        voice_id, rate, volume = None, 150, 0.8
+        if self.engine:
+            with _ENGINE_LOCK:
+                voice_id = self.engine.getProperty('voice')
+                rate = self.engine.getProperty('rate')
+                volume = self.engine.getProperty('volume')
+        command = [ESPEAK_NG, '--stdout', '-s', str(int(rate)), '-a', str(int(volume * 100))]
+        if voice_id:
+            # espeak-ng's -v matches voice names and identifiers (what pyttsx3 uses as the id)
+            command += ['-v', voice_id]
+        return command + [text]
+    
+    def _sapi_to_bytes(self, text: str) -> bytes:
+        """Speak text into a SAPI5 memory stream and wrap the PCM in a WAV header"""
+        with _ENGINE_LOCK:
+            voice_id = self.engine.getProperty('voice')
+            rate = self.engine.getProperty('rate')
+            volume = self.engine.getProperty('volume')
+        
+        stream = win32com.client.Dispatch('SAPI.SpMemoryStream')
+        stream.Format.Type = SAPI_FORMAT_22KHZ_16BIT_MONO
+        
+        voice = win32com.client.Dispatch('SAPI.SpVoice')
+        for token in voice.GetVoices():
+            if token.Id == voice_id:
+                voice.Voice = token
+                break
+        # Same words-per-minute mapping as pyttsx3's sapi5 driver (200 wpm = rate 0)
+        voice.Rate = max(-10, min(10, int(math.log(rate / 200.0, 1.1))))
+        voice.Volume = int(round(volume * 100))
+        voice.AudioOutputStream = stream
+        voice.Speak(text)
+        
+        pcm = bytes(stream.GetData())
+        return self._streaming_wav_header(1, 2, SAPI_SAMPLE_RATE, len(pcm)) + pcm
+    
+    def synthesize_combined(self, text: str) -> Optional[bytes]:
+        """
+        Synthesize every sentence of text and join them into a single WAV
+        
+        The sentences go through one batch engine run; the result plays with one
+        Sound instead of a queue handover (and gap) per sentence.
+        
+        Args:
+            text (str): Text to convert
+            
+        Returns:
+            bytes: Complete WAV file, or None on failure
+        """
+        sentences = [s for s in _SENTENCE_SPLIT_RE.split(text.strip()) if s.strip()]
+        if not sentences:
+            return None
+        
+        pcm_parts = []
+        audio_format = None
+        for tts_result in self.text_to_speech_file_batch(sentences):
+            if not tts_result['success']:
+                logger.warning(f"Skipping sentence in combined audio: {tts_result['error']}")
+                continue
+            
+            with wave.open(tts_result['file_path'], 'rb') as wav_file:
+                part_format = (wav_file.getnchannels(), wav_file.getsampwidth(), wav_file.getframerate())
+                if audio_format is None:
+                    audio_format = part_format
+                elif part_format != audio_format:
+                    logger.error(f"Cannot combine sentences with different formats: {part_format} != {audio_format}")
+                    return None
+                pcm_parts.append(wav_file.readframes(wav_file.getnframes()))
+        
+        if audio_format is None:
+            return None
+        
+        pcm = b''.join(pcm_parts)
+        return self._streaming_wav_header(*audio_format, len(pcm)) + pcm
+    
+    def synthesize_streaming(self, text: str, chunk_size: int = 8192) -> Iterator[bytes]:
+        """
+        Synthesize text sentence by sentence and yield WAV bytes as they become available
+        
+        The first chunk is a WAV header with open-ended sizes so a browser <audio>
+        element can start buffering before the whole prompt has been synthesized.
+        
+        Args:
+            text (str): Text to convert
+            chunk_size (int): Size of the PCM chunks yielded
+            
+        Yields:
+            bytes: WAV header followed by PCM data
+        """
+        sentences = [s for s in _SENTENCE_SPLIT_RE.split(text.strip()) if s.strip()]
+        header_sent = False
+        
+        for sentence in sentences:
+            # Cached audio is read in place; only uncached scratch files are removed afterwards
+            tts_result = self.text_to_speech_file(sentence)
+            if not tts_result['success']:
+                logger.warning(f"Skipping sentence in TTS stream: {tts_result['error']}")
+                continue
+            audio_path = tts_result['file_path']
+            
+            try:
+                with wave.open(audio_path, 'rb') as wav_file:
+                    if not header_sent:
+                        yield self._streaming_wav_header(
+                            wav_file.getnchannels(),
+                            wav_file.getsampwidth(),
+                            wav_file.getframerate()
+                        )
+                        header_sent = True
+                    
+                    frames_per_chunk = max(1, chunk_size // (wav_file.getsampwidth() * wav_file.getnchannels()))
+                    while True:
+                        frames = wav_file.readframes(frames_per_chunk)
+                        if not frames:
+                            break
+                        yield frames
+            finally:
+                if not self.cache_enabled:
+                    try:
+                        os.unlink(audio_path)
+                    except OSError:
+                        pass
+    
+    @staticmethod
+    def _streaming_wav_header(channels: int, sample_width: int, sample_rate: int,
+                              data_size: Optional[int] = None) -> bytes:
+        """Build a PCM WAV header; without data_size the RIFF/data sizes are left open for streaming"""
+        byte_rate = sample_rate * channels * sample_width
+        block_align = channels * sample_width
+        riff_size = 0xFFFFFFFF if data_size is None else 36 + data_size
+        return (
+            b'RIFF' + struct.pack('<I', riff_size) + b'WAVE'
+            + b'fmt ' + struct.pack('<IHHIIHH', 16, 1, channels, sample_rate, byte_rate, block_align, sample_width * 8)
+            + b'data' + struct.pack('<I', 0xFFFFFFFF if data_size is None else data_size)
+        )
+    
     def _get_audio_duration(self, file_path: str) -> float:
         """Get audio file duration in seconds"""
+        try:
+            # Only the RIFF header is read - no decode of the sample data
+            with wave.open(file_path, 'rb') as wav_file:
+                return wav_file.getnframes() / float(wav_file.getframerate())
+        except (wave.Error, EOFError, ZeroDivisionError):
+            pass  # Not plain PCM WAV - let SDL decode it
+        except OSError as e:
+            logger.warning(f"Could not get audio duration: {e}")
+            return 0.0
+        
         try:
             if self.pygame_initialized:
                 sound = pygame.mixer.Sound(file_path)
@@ -168,6 +878,40 @@ class TTSEngine:
         
         return 0.0
     
+    def _match_mixer_rate(self, file_path: str):
+        """Reopen the mixer at the file's sample rate so SDL doesn't resample every buffer"""
+        try:
+            with wave.open(file_path, 'rb') as wav_file:
+                frame_rate = wav_file.getframerate()
+        except (wave.Error, EOFError, OSError):
+            return
+        
+        self._ensure_mixer_rate(frame_rate)
+    
+    def _ensure_mixer_rate(self, frame_rate: int):
+        """Reopen the mixer (mono) at frame_rate if it is running at another rate"""
+        mixer_state = pygame.mixer.get_init()
+        if mixer_state and (mixer_state[0] != frame_rate or mixer_state[2] != 1):
+            logger.info(f"Reopening mixer at {frame_rate} Hz to match TTS output")
+            pygame.mixer.quit()
+            self._sound_cache.clear()  # Sounds are tied to the old mixer format
+            self._initialize_pygame(frame_rate)
+    
+    def _load_sound(self, file_path: str):
+        """Decoded Sound for a file, reused while the file is unchanged"""
+        st = os.stat(file_path)
+        key = (file_path, st.st_mtime_ns, st.st_size)
+        sound = self._sound_cache.get(key)
+        if sound is not None:
+            self._sound_cache.move_to_end(key)
+            return sound
+        
+        sound = pygame.mixer.Sound(file_path)
+        self._sound_cache[key] = sound
+        if len(self._sound_cache) > SOUND_CACHE_SIZE:
+            self._sound_cache.popitem(last=False)
+        return sound
+    
     def play_audio(self, file_path: str) -> bool:
         """Play audio file using pygame"""
         if not self.pygame_initialized:
@@ -175,9 +919,9 @@ class TTSEngine:
         
         try:
             self.stop_audio()  # Stop any current playback
+            self._match_mixer_rate(file_path)
             
-            pygame.mixer.music.load(file_path)
-            pygame.mixer.music.play()
+            self._channel.play(self._load_sound(file_path))
             
             self.current_audio_file = file_path
             self.is_playing = True
@@ -190,13 +934,180 @@ class TTSEngine:
             logger.error(f"Failed to play audio: {e}")
             return False
     
+    def play_bytes(self, wav_bytes: bytes) -> bool:
+        """Play WAV bytes from memory on the playback channel"""
+        if not self.pygame_initialized or len(wav_bytes) < 44:
+            return False
+        
+        try:
+            self.stop_audio()
+            self._ensure_mixer_rate(struct.unpack_from('<I', wav_bytes, 24)[0])
+            
+            self._channel.play(pygame.mixer.Sound(file=io.BytesIO(wav_bytes)))
+            
+            self.current_audio_file = None
+            self.is_playing = True
+            self.is_paused = False
+            return True
+        except Exception as e:
+            logger.error(f"Failed to play audio from memory: {e}")
+            return False
+    
+    def speak(self, text: str) -> bool:
+        """Synthesize text in memory and play it"""
+        wav_bytes = self.text_to_speech_bytes(text)
+        return wav_bytes is not None and self.play_bytes(wav_bytes)
+    
+    def speak_combined(self, text: str) -> bool:
+        """Synthesize all sentences of text, then play them as one gapless Sound"""
+        wav_bytes = self.synthesize_combined(text)
+        return wav_bytes is not None and self.play_bytes(wav_bytes)
+    
+    def speak_streaming(self, text: str) -> bool:
+        """
+        Speak text sentence by sentence, starting playback after the first sentence is synthesized
+        
+        The remaining sentences are synthesized on the worker thread and queued behind
+        the playing track as they become ready.
+        
+        Args:
+            text (str): Text to speak
+            
+        Returns:
+            bool: True if playback started
+        """
+        sentences = [s for s in _SENTENCE_SPLIT_RE.split(text.strip()) if s.strip()]
+        if not sentences:
+            return False
+        
+        first_result = self.text_to_speech_file(sentences[0])
+        if not first_result['success'] or not self.play_audio(first_result['file_path']):
+            return False
+        
+        pending = [self.text_to_speech_file_async(sentence) for sentence in sentences[1:]]
+        if pending:
+            self._stream_cancel = threading.Event()
+            threading.Thread(
+                target=self._feed_sentences,
+                args=(pending, self._stream_cancel),
+                daemon=True
+            ).start()
+        
+        return True
+    
+    def _feed_sentences(self, pending: List[Future], cancel: threading.Event):
+        """Playback thread: queue each synthesized sentence behind the one that is playing"""
+        for future in pending:
+            tts_result = self._await_synthesis(future)
+            if cancel.is_set():
+                return
+            if not tts_result['success']:
+                logger.warning(f"Skipping sentence in TTS playback: {tts_result['error']}")
+                continue
+            
+            try:
+                sound = self._load_sound(tts_result['file_path'])
+                
+                # A channel holds one queued sound (it starts when the playing one ends,
+                # or at once if the channel has gone idle)
+                while self._channel.get_queue() is not None:
+                    if cancel.wait(0.02):
+                        return
+                self._channel.queue(sound)
+            except Exception as e:
+                logger.error(f"Failed to queue streamed audio: {e}")
+                return
+            
+            self.current_audio_file = tts_result['file_path']
+    
+    def speak_progressive(self, text: str) -> bool:
+        """
+        Speak text while it is being synthesized, starting after ~20 ms of audio
+        
+        With espeak-ng available, its --stdout PCM is played through a mixer channel
+        in growing chunks (20, 40, 80, 160, then 200 ms). Other platforms fall back
+        to speak_streaming().
+        
+        Args:
+            text (str): Text to speak
+            
+        Returns:
+            bool: True if playback started
+        """
+        if not ESPEAK_NG or not self.pygame_initialized:
+            return self.speak_streaming(text)
+        
+        if not text.strip():
+            return False
+        
+        self.stop_audio()
+        
+        try:
+            process = subprocess.Popen(
+                self._espeak_command(text),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+        except OSError as e:
+            logger.warning(f"espeak-ng unavailable, using sentence streaming: {e}")
+            return self.speak_streaming(text)
+        
+        self._stream_cancel = threading.Event()
+        threading.Thread(target=self._play_pcm_pipe, args=(process, self._stream_cancel), daemon=True).start()
+        
+        self.current_audio_file = None
+        self.is_playing = True
+        self.is_paused = False
+        return True
+    
+    def _play_pcm_pipe(self, process: subprocess.Popen, cancel: threading.Event):
+        """Playback thread: feed a WAV stream from a pipe to a mixer channel in growing chunks"""
+        channel = self._channel
+        try:
+            header = process.stdout.read(44)
+            if len(header) < 44 or header[:4] != b'RIFF':
+                logger.error("espeak-ng produced no WAV output")
+                return
+            
+            channels, sample_rate = struct.unpack_from('<HI', header, 22)
+            block_align = struct.unpack_from('<H', header, 32)[0]
+            if channels != 1:
+                logger.error(f"Unsupported espeak-ng output: {channels} channels")
+                return
+            self._ensure_mixer_rate(sample_rate)
+            channel = self._channel
+            
+            # Each step doubles the chunk up to the cap; a new call restarts the ramp
+            for step in itertools.count():
+                chunk_ms = PROGRESSIVE_CHUNK_MS[min(step, len(PROGRESSIVE_CHUNK_MS) - 1)]
+                chunk = process.stdout.read(sample_rate * chunk_ms // 1000 * block_align)
+                if not chunk or cancel.is_set():
+                    break
+                
+                sound = pygame.mixer.Sound(buffer=chunk)
+                
+                # A channel holds one queued sound; queueing on an idle channel plays at once
+                while channel.get_queue() is not None:
+                    if cancel.wait(0.005):
+                        return
+                channel.queue(sound)
+        except Exception as e:
+            logger.error(f"Progressive playback failed: {e}")
+        finally:
+            if cancel.is_set():
+                channel.stop()
+            if process.poll() is None:
+                process.kill()
+            process.stdout.close()
+            process.wait()
+    
     def pause_audio(self) -> bool:
         """Pause current audio playback"""
         if not self.pygame_initialized or not self.is_playing:
             return False
         
         try:
-            pygame.mixer.music.pause()
+            self._channel.pause()
             self.is_paused = True
             logger.info("Audio paused")
             return True
@@ -210,7 +1121,7 @@ class TTSEngine:
             return False
         
         try:
-            pygame.mixer.music.unpause()
+            self._channel.unpause()
             self.is_paused = False
             logger.info("Audio resumed")
             return True
@@ -224,7 +1135,11 @@ class TTSEngine:
             return False
         
         try:
-            pygame.mixer.music.stop()
+            if self._stream_cancel is not None:
+                self._stream_cancel.set()
+                self._stream_cancel = None
+            
+            self._channel.stop()
             self.is_playing = False
             self.is_paused = False
             self.playback_position = 0
@@ -245,7 +1160,7 @@ class TTSEngine:
         
         if self.pygame_initialized:
             try:
-                pygame_playing = pygame.mixer.music.get_busy()
+                pygame_playing = self._channel.get_busy()
                 status['is_playing'] = pygame_playing and not self.is_paused
                 status['is_paused'] = self.is_paused and pygame_playing
             except Exception as e:
@@ -253,6 +1168,24 @@ class TTSEngine:
         
         return status
     
+    async def watch_playback(self, poll_interval: float = 0.05) -> Dict[str, Any]:
+        """
+        Wait (without blocking the event loop) until the current playback finishes
+        
+        Async callers can await this instead of polling get_playback_status().
+        
+        Args:
+            poll_interval (float): Seconds between mixer checks
+            
+        Returns:
+            Dict containing the final playback status
+        """
+        while self.pygame_initialized and (self.is_paused or self._channel.get_busy()):
+            await asyncio.sleep(poll_interval)
+        
+        self.is_playing = False
+        return self.get_playback_status()
+    
     def cleanup(self):
         """Clean up resources"""
         try:
@@ -260,14 +1193,26 @@ class TTSEngine:
                 self.stop_audio()
                 pygame.mixer.quit()
             
-            if self.engine:
-                self.engine.stop()
+            # Let queued jobs finish, then stop the worker; later submissions are refused
+            with self._submit_lock:
+                self._shutting_down = True
+                self._tts_queue.put(None)
+            if self._worker is not threading.current_thread():
+                self._worker.join(timeout=WORKER_SHUTDOWN_TIMEOUT)
+                if self._worker.is_alive():
+                    logger.warning(f"TTS worker still busy after {WORKER_SHUTDOWN_TIMEOUT}s; dropping the engine anyway")
+            
+            # runAndWait() has already drained the engine - stop() would only block on a flush
+            self.engine = None
+            
+            self._save_cache_manifest()
                 
-            # Clean up temp audio files
-            if self.current_audio_file and self.current_audio_file.startswith(tempfile.gettempdir()):
+            # Clean up temp audio files (cached audio is kept for the next session)
+            if (self.current_audio_file and self.current_audio_file.startswith(tempfile.gettempdir())
+                    and not self.current_audio_file.startswith(self.cache_dir)):
                 try:
                     os.unlink(self.current_audio_file)
-                except:
+                except OSError:
                     pass
                     
             logger.info("TTS engine cleaned up")
@@ -4,16 +4,37 @@ Integrates with your working ONNX Whisper models for actual speech-to-text proce
 """
 
 import os
+import atexit
+import queue
 import threading
 import time
 import logging
 import tempfile
+import uuid
 import wave
 import pyaudio
 import numpy as np
 import sys
 import re
-from typing import Dict, Any, Optional, Callable
+from collections import Counter
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Any, Optional, Callable, Tuple
+
+# Optional JIT for the audio normalization kernel
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    NUMBA_AVAILABLE = False
+
+# Optional Aho-Corasick automaton for matching all command phrases in one pass
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
 
 # Add src directory to path for imports exactly like your working LiveTranscriber
 src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
@@ -22,7 +43,8 @@ if src_path not in sys.path:
 
 # Handle imports for both direct Python execution and PyInstaller (same pattern as your LiveTranscriber)
 try:
-    from standalone_model import StandaloneWhisperModel
+    from standalone_model import (StandaloneWhisperModel, create_session_options,
+                                  ensure_quantized, accelerator_available)
     WHISPER_MODEL_AVAILABLE = True
     logger = logging.getLogger(__name__)
     logger.info("✅ Successfully imported StandaloneWhisperModel")
@@ -30,24 +52,155 @@ except ImportError as e:
     logger = logging.getLogger(__name__)
     logger.warning(f"Primary import failed: {e}")
     try:
-        from .standalone_model import StandaloneWhisperModel
+        from .standalone_model import (StandaloneWhisperModel, create_session_options,
+                                       ensure_quantized, accelerator_available)
         WHISPER_MODEL_AVAILABLE = True
         logger.info("✅ Successfully imported StandaloneWhisperModel (relative import)")
     except ImportError as e2:
         logger.warning(f"Relative import also failed: {e2}")
         logger.info("Will use demo mode for voice recognition")
         StandaloneWhisperModel = None
+        create_session_options = None
+        ensure_quantized = None
+        accelerator_available = None
         WHISPER_MODEL_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Partial transcription while the user is still speaking
+STREAM_WINDOW_SECONDS = 2.0   # New audio per partial transcription
+STREAM_OVERLAP_SECONDS = 0.2  # Tail carried into the next window so words aren't cut at the boundary
+
+# Recording buffer preallocated for this much audio (grown by doubling if exceeded)
+MAX_RECORDING_SECONDS = 60
+
+# One PortAudio instance per process - host API enumeration is slow (esp. WASAPI)
+_PA_INSTANCE = None
+_PA_LOCK = threading.Lock()
+
+
+def _get_pyaudio():
+    """Return the shared PyAudio instance, creating it on first use"""
+    global _PA_INSTANCE
+    with _PA_LOCK:
+        if _PA_INSTANCE is None:
+            _PA_INSTANCE = pyaudio.PyAudio()
+            atexit.register(_PA_INSTANCE.terminate)
+        return _PA_INSTANCE
+
+# Whisper log-mel front end (must match the encoder's 30 s input window)
+WHISPER_SAMPLE_RATE = 16000
+WHISPER_N_FFT = 400
+WHISPER_HOP_LENGTH = 160
+WHISPER_CHUNK_SAMPLES = 30 * WHISPER_SAMPLE_RATE
+
+# Recordings shorter or quieter than this are not worth a Whisper run
+MIN_AUDIO_SECONDS = 0.5
+SILENCE_RMS = 0.001  # On the [-1, 1] scale; low to stay sensitive to quiet speech
+
+# Samples below this fraction of the clip RMS are zeroed before transcription
+NOISE_GATE_RATIO = 0.1
+INT16_SCALE = 1.0 / 32768.0
+
+# Common Whisper hallucination patterns, compiled once into a single alternation
+_HALLUCINATION_RE = re.compile('|'.join([
+    r"see you in the next video",
+    r"thanks for watching",
+    r"subscribe and",
+    r"like and subscribe",
+    r"don't forget to",
+    r"and I'll see you",
+    r"outro|intro|ending",
+    r"bye\.?\s*(?:bye\.?\s*){3,}",  # Multiple "bye bye bye"
+    r"(?:thank you|thanks).*next.*time",
+    r"until next time"
+]), re.IGNORECASE)
+
+# Common spoken variations of each base command, in priority order
+COMMAND_PATTERNS = {
+    'play': ['play', 'start', 'begin', 'resume', 'continue'],
+    'pause': ['pause', 'stop', 'halt', 'wait'],
+    'repeat': ['repeat', 'again', 'once more', 'say again', 'replay'],
+    'next': ['next', 'forward', 'continue', 'proceed'],
+    'previous': ['previous', 'back', 'prior', 'before'],
+    'question': ['question', 'ask', 'quiz']
+}
+
+
+def _compile_command_scanner(table):
+    """
+    Generate a matcher with each phrase inlined as a constant substring test
+    
+    Args:
+        table: (priority, phrase, command) entries sorted by priority
+        
+    Returns:
+        Function mapping lowercased text to its first matching entry, or None
+    """
+    lines = ['def scan(text):']
+    for entry in table:
+        lines.append(f'    if {entry[1]!r} in text: return {entry!r}')
+    lines.append('    return None')
+    namespace = {}
+    exec('\n'.join(lines), namespace)
+    return namespace['scan']
+
+# Spoken or numeric question numbers ("repeat question one")
+_WORD_RE = re.compile(r"[\w']+")
+_NUMBER_RE = re.compile(r'\b(?:one|two|three|four|five|six|seven|eight|nine|ten|\d+)\b')
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True, fastmath=True)
+    def _normalize_and_gate_kernel(src, scale, gate_ratio):
+        n = src.shape[0]
+        out = np.empty(n, dtype=np.float32)
+        sum_sq = 0.0
+        for i in range(n):
+            x = np.float32(src[i] * scale)
+            out[i] = x
+            sum_sq += x * x
+        rms = np.sqrt(sum_sq / n)
+        noise_floor = rms * gate_ratio
+        for i in range(n):
+            if abs(out[i]) <= noise_floor:
+                out[i] = 0.0
+        return out, rms
+
+
+def _normalize_and_gate(audio_array: np.ndarray, gate_ratio: float = NOISE_GATE_RATIO) -> Tuple[np.ndarray, float]:
+    """
+    Convert audio to float32 in [-1, 1], measure its RMS and apply the noise gate
+    
+    Args:
+        audio_array: Non-empty int16 PCM or float32 samples already in [-1, 1]
+        gate_ratio: Noise floor as a fraction of the RMS
+        
+    Returns:
+        Tuple of (gated float32 samples, RMS of the ungated samples)
+    """
+    scale = INT16_SCALE if audio_array.dtype == np.int16 else 1.0
+    if NUMBA_AVAILABLE:
+        out, rms = _normalize_and_gate_kernel(audio_array, scale, gate_ratio)
+        return out, float(rms)
+    
+    # NumPy fallback: one converted copy, RMS via dot product instead of a squared temporary
+    out = audio_array.astype(np.float32)
+    if scale != 1.0:
+        out *= scale
+    rms = float(np.sqrt(np.dot(out, out) / len(out)))
+    # Gate in place: one boolean temporary instead of np.where's abs + mask + new output
+    np.putmask(out, np.abs(out) <= rms * gate_ratio, 0.0)
+    return out, rms
+
 class WhisperVoiceController:
-    def __init__(self, models_path: str = None):
+    def __init__(self, models_path: str = None, partial_callback: Optional[Callable[[str], None]] = None):
         """
         Initialize the voice controller with your ONNX Whisper models
         
         Args:
             models_path: Path to directory containing ONNX model files
+            partial_callback: Called with partial transcripts while recording is still running
         """
         # Use the models from the backend/models directory
         self.models_path = models_path or os.path.join(
@@ -62,6 +215,10 @@ class WhisperVoiceController:
         self.whisper_model = None
         self._initialize_whisper_model()
         
+        # Log-mel features: periodic Hann window (as torch.hann_window) and the model's filterbank
+        self._window = np.hanning(WHISPER_N_FFT + 1)[:-1].astype(np.float32)
+        self._mel_fb = self.whisper_model.mel_filter if self.whisper_model else None
+        
         # Audio recording settings
         self.sample_rate = 16000
         self.chunk_size = 1024
@@ -72,14 +229,23 @@ class WhisperVoiceController:
         self.is_listening = False
         self.is_recording = False
         self.is_processing = False  # Add processing lock
-        self.audio_buffer = []
+        # Recorded PCM is written at a cursor into one preallocated int16 buffer
+        self._pcm_ring = np.empty(self.sample_rate * MAX_RECORDING_SECONDS, dtype=np.int16)
+        self._pcm_pos = 0
         self.pyaudio_instance = None
         self.stream = None
-        self.recording_thread = None
         self._state_lock = threading.Lock()  # Add state lock
         
-        # Command callbacks
+        # Streaming: the audio callback feeds chunks to a transcription thread
+        self.partial_callback = partial_callback
+        self._chunk_queue = None
+        self._streaming_thread = None
+        
+        # Command callbacks, plus a matcher over every phrase that triggers one
         self.command_handlers = {}
+        self._command_table = []
+        self._command_automaton = None
+        self._command_scanner = _compile_command_scanner([])
         
         self._initialize_audio()
         
@@ -97,22 +263,38 @@ class WhisperVoiceController:
             return
             
         try:
+            # Prefer int8 encoder weights on CPU; the decoder stays FP32 for accuracy
+            if not accelerator_available():
+                self.encoder_path = ensure_quantized(self.encoder_path)
+            
             logger.info(f"Loading Whisper models from {self.models_path}")
             self.whisper_model = StandaloneWhisperModel(
                 encoder_path=self.encoder_path,
-                decoder_path=self.decoder_path
+                decoder_path=self.decoder_path,
+                session_options=create_session_options()
             )
             logger.info("✅ Whisper ONNX model initialized successfully!")
+            
+            # Pay the first-inference cost now rather than on the user's first command
+            threading.Thread(target=self._warmup_whisper_model, daemon=True).start()
         except Exception as e:
-            logger.error(f"❌ Failed to initialize Whisper model: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ Failed to initialize Whisper model: {e}")
             self.whisper_model = None
         
+    def _warmup_whisper_model(self):
+        """Run one silent inference so ORT plans memory and warms its kernels in the background"""
+        try:
+            start_time = time.time()
+            _normalize_and_gate(np.ones(WHISPER_SAMPLE_RATE, dtype=np.int16))  # JIT-compiles the numba kernel
+            self.whisper_model.transcribe(np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32), WHISPER_SAMPLE_RATE)
+            logger.info(f"Whisper model warmed up in {time.time() - start_time:.2f}s")
+        except Exception as e:
+            logger.warning(f"Whisper warmup skipped: {e}")
+    
     def _initialize_audio(self):
         """Initialize PyAudio for microphone capture"""
         try:
-            self.pyaudio_instance = pyaudio.PyAudio()
+            self.pyaudio_instance = _get_pyaudio()
             logger.info("Audio system initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize audio system: {e}")
@@ -121,6 +303,39 @@ class WhisperVoiceController:
     def register_command_handler(self, command: str, handler: Callable):
         """Register a handler function for a specific voice command"""
         self.command_handlers[command.lower()] = handler
+        self._rebuild_command_matcher()
+    
+    def _rebuild_command_matcher(self):
+        """Rebuild the phrase table (and automaton) from the registered handlers"""
+        # phrase -> (priority, phrase, command): registered keys first, then their variations
+        table = {}
+        for index, command in enumerate(self.command_handlers):
+            table.setdefault(command, ((0, index), command, command))
+        for base_index, (base_command, patterns) in enumerate(COMMAND_PATTERNS.items()):
+            if base_command in self.command_handlers:
+                for index, pattern in enumerate(patterns):
+                    table.setdefault(pattern, ((1, base_index, index), pattern, base_command))
+        
+        self._command_table = sorted(table.values())
+        self._command_automaton = None
+        if AHOCORASICK_AVAILABLE and self._command_table:
+            automaton = ahocorasick.Automaton()
+            for entry in self._command_table:
+                automaton.add_word(entry[1], entry)
+            automaton.make_automaton()
+            self._command_automaton = automaton
+        else:
+            self._command_scanner = _compile_command_scanner(self._command_table)
+    
+    def _match_command(self, command_lower: str):
+        """Return the highest-priority (priority, phrase, command) entry found in the text, or None"""
+        if self._command_automaton is not None:
+            return min((entry for _, entry in self._command_automaton.iter(command_lower)), default=None)
+        return self._command_scanner(command_lower)
+    
+    def set_partial_callback(self, callback: Optional[Callable[[str], None]]):
+        """Set (or clear) the callback receiving partial transcripts during recording"""
+        self.partial_callback = callback
         
     def start_listening(self) -> Dict[str, Any]:
         """Start listening for voice commands"""
@@ -135,21 +350,28 @@ class WhisperVoiceController:
                 return {'success': False, 'error': 'Currently processing previous recording'}
                 
             try:
-                # Start audio stream
+                # Open the audio stream in callback mode - PortAudio delivers buffers on its own thread
                 self.stream = self.pyaudio_instance.open(
                     format=self.format,
                     channels=self.channels,
                     rate=self.sample_rate,
                     input=True,
-                    frames_per_buffer=self.chunk_size
+                    frames_per_buffer=self.chunk_size,
+                    stream_callback=self._audio_callback,
+                    start=False
                 )
                 
                 self.is_listening = True
-                self.audio_buffer = []
+                self._pcm_pos = 0
                 
-                # Start recording in background thread
-                self.recording_thread = threading.Thread(target=self._recording_loop, daemon=True)
-                self.recording_thread.start()
+                # Transcribe windows while the user speaks when someone wants partial results
+                if self.partial_callback and self.whisper_model:
+                    self._chunk_queue = queue.Queue()
+                    self._streaming_thread = threading.Thread(target=self._streaming_loop, args=(self._chunk_queue,), daemon=True)
+                    self._streaming_thread.start()
+                
+                # Start capturing
+                self.stream.start_stream()
                 
                 logger.info("Started voice listening")
                 return {
@@ -190,14 +412,7 @@ class WhisperVoiceController:
             logger.info("Stopping voice listening...")
             self.is_listening = False
             
-            # Wait a moment for recording thread to finish
-            if self.recording_thread and self.recording_thread.is_alive():
-                logger.info("Waiting for recording thread to finish...")
-                self.recording_thread.join(timeout=3.0)
-                if self.recording_thread.is_alive():
-                    logger.warning("Recording thread did not finish cleanly")
-            
-            # Close audio stream safely
+            # Close audio stream safely (stop_stream waits for the last callback to return)
             if self.stream:
                 try:
                     self.stream.stop_stream()
@@ -207,6 +422,13 @@ class WhisperVoiceController:
                 except Exception as stream_error:
                     logger.warning(f"Error closing audio stream: {stream_error}")
             
+            # Let the streaming thread finish the window it is on
+            if self._chunk_queue is not None:
+                self._chunk_queue.put(None)
+                self._streaming_thread.join(timeout=10.0)
+                self._chunk_queue = None
+                self._streaming_thread = None
+            
             # Process recorded audio if we have any
             result = self._process_audio_buffer()
             
@@ -234,23 +456,69 @@ class WhisperVoiceController:
             with self._state_lock:
                 self.is_processing = False
     
-    def _recording_loop(self):
-        """Background thread for continuous audio recording"""
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """PortAudio callback: append each captured buffer to the recording"""
+        if not self.is_listening:
+            return (None, pyaudio.paComplete)
         try:
-            while self.is_listening and self.stream:
+            self._append_pcm(in_data)
+            if self._chunk_queue is not None:
+                self._chunk_queue.put(in_data)
+        except Exception as e:
+            logger.warning(f"Audio capture error: {e}")
+            return (None, pyaudio.paAbort)
+        return (None, pyaudio.paContinue)
+    
+    def _append_pcm(self, data: bytes):
+        """Copy a PyAudio chunk into the recording buffer at the cursor"""
+        samples = np.frombuffer(data, dtype=np.int16)
+        end = self._pcm_pos + len(samples)
+        if end > len(self._pcm_ring):
+            # Longer than planned: move to a buffer twice the size
+            grown = np.empty(max(end, 2 * len(self._pcm_ring)), dtype=np.int16)
+            grown[:self._pcm_pos] = self._pcm_ring[:self._pcm_pos]
+            self._pcm_ring = grown
+        self._pcm_ring[self._pcm_pos:end] = samples
+        self._pcm_pos = end
+    
+    def _streaming_loop(self, chunk_queue: queue.Queue):
+        """Background thread: transcribe fixed windows of new audio and report partial text"""
+        window_samples = int(self.sample_rate * STREAM_WINDOW_SECONDS)
+        overlap_samples = int(self.sample_rate * STREAM_OVERLAP_SECONDS)
+        tail = np.zeros(0, dtype=np.int16)
+        pending = []
+        pending_samples = 0
+        
+        while True:
+            data = chunk_queue.get()
+            if data is None:
+                break
+            
+            pending.append(np.frombuffer(data, dtype=np.int16))
+            pending_samples += len(pending[-1])
+            if pending_samples < window_samples:
+                continue
+            
+            window = np.concatenate([tail] + pending)
+            tail = window[-overlap_samples:]
+            pending = []
+            pending_samples = 0
+            
+            try:
+                partial_text = self._transcribe_array(window.astype(np.float32) / 32768.0, self.sample_rate).strip()
+            except Exception as e:
+                logger.warning(f"Partial transcription failed: {e}")
+                continue
+            
+            if partial_text and self.partial_callback:
                 try:
-                    data = self.stream.read(self.chunk_size, exception_on_overflow=False)
-                    self.audio_buffer.append(data)
+                    self.partial_callback(partial_text)
                 except Exception as e:
-                    logger.warning(f"Audio read error: {e}")
-                    break
-                    
-        except Exception as e:
-            logger.error(f"Recording loop error: {e}")
+                    logger.error(f"❌ Error in partial transcript callback: {e}")
     
     def _process_audio_buffer(self) -> Dict[str, Any]:
         """Process the recorded audio buffer through Whisper"""
-        if not self.audio_buffer:
+        if not self._pcm_pos:
             return {
                 'success': True,
                 'text': '',
@@ -258,25 +526,17 @@ class WhisperVoiceController:
             }
         
         try:
-            # Save audio buffer to temporary WAV file
-            temp_audio_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+            pcm = self._pcm_ring[:self._pcm_pos]
             
-            with wave.open(temp_audio_file.name, 'wb') as wav_file:
-                wav_file.setnchannels(self.channels)
-                wav_file.setsampwidth(self.pyaudio_instance.get_sample_size(self.format))
-                wav_file.setframerate(self.sample_rate)
-                wav_file.writeframes(b''.join(self.audio_buffer))
-            
-            temp_audio_file.close()
+            # Reject silent recordings straight from the int16 samples, before any conversion
+            if self.whisper_model:
+                rms = np.sqrt(np.einsum('i,i->', pcm, pcm, dtype=np.int64) / len(pcm)) * INT16_SCALE
+                if rms < SILENCE_RMS:
+                    logger.warning(f"Audio too quiet (RMS: {rms:.6f}), skipping transcription")
+                    return self._skipped_result(len(pcm) / self.sample_rate, 'Audio too quiet')
             
-            # Process with Whisper ONNX model
-            whisper_result = self._call_whisper_model(temp_audio_file.name)
-            
-            # Clean up temp file
-            try:
-                os.unlink(temp_audio_file.name)
-            except:
-                pass
+            # Process with Whisper ONNX model (int16 is normalized there in one pass)
+            whisper_result = self._call_whisper_model(pcm, self.sample_rate)
             
             # Process the command if recognition was successful
             if whisper_result['success'] and whisper_result['text']:
@@ -291,20 +551,21 @@ class WhisperVoiceController:
                 'error': f'Audio processing failed: {str(e)}'
             }
     
-    def _call_whisper_model(self, audio_file_path: str) -> Dict[str, Any]:
-        """Process audio file using the ONNX Whisper model directly"""
-        
-        if not self.whisper_model:
-            return self._demo_transcription(audio_file_path)
+    def transcribe_file(self, audio_file_path: str) -> Dict[str, Any]:
+        """Decode a WAV file to mono float32 and transcribe it
         
+        Args:
+            audio_file_path: Path to a PCM WAV file
+            
+        Returns:
+            Dictionary with transcription result
+        """
         try:
-            # Load and properly process audio file
             with wave.open(audio_file_path, 'rb') as wav_file:
                 # Get audio parameters
                 sample_rate = wav_file.getframerate()
                 n_channels = wav_file.getnchannels()
                 n_frames = wav_file.getnframes()
-                duration = n_frames / sample_rate
                 
                 # Read raw audio data
                 audio_data = wav_file.readframes(n_frames)
@@ -325,49 +586,63 @@ class WhisperVoiceController:
                     audio_array = audio_array / 2147483648.0  # Convert to [-1, 1]
                 else:
                     raise ValueError(f"Unsupported sample width: {sample_width}")
-                
-                # Handle stereo to mono conversion
+            
+            # Handle stereo to mono conversion (mono recordings skip this entirely)
+            if n_channels != 1:
                 if n_channels == 2:
-                    audio_array = audio_array.reshape(-1, 2).mean(axis=1)
-                elif n_channels > 2:
+                    # Average the interleaved channels without a 2-D reshape + axis reduction
+                    audio_array = (audio_array[0::2] + audio_array[1::2]) * 0.5
+                else:
                     audio_array = audio_array.reshape(-1, n_channels).mean(axis=1)
-                
-                # Validate audio length - skip very short recordings
-                if duration < 0.5:  # Less than 500ms - increase threshold
-                    logger.warning(f"Audio too short ({duration:.3f}s), skipping transcription")
-                    return {
-                        'success': True,
-                        'text': '',
-                        'confidence': 0.0,
-                        'processing_time': '0.00s',
-                        'mode': 'whisper_onnx',
-                        'audio_duration': f"{duration:.2f}s",
-                        'message': 'Audio too short'
-                    }
-                
-                # Validate audio amplitude - skip very quiet recordings  
-                rms = np.sqrt(np.mean(audio_array ** 2))
-                if rms < 0.001:  # Lowered threshold to be more sensitive to quiet audio
-                    logger.warning(f"Audio too quiet (RMS: {rms:.6f}), skipping transcription")
-                    return {
-                        'success': True,
-                        'text': '',
-                        'confidence': 0.0,
-                        'processing_time': '0.00s',
-                        'mode': 'whisper_onnx',
-                        'audio_duration': f"{duration:.2f}s",
-                        'message': 'Audio too quiet'
-                    }
-                
-                # Add simple noise gate - remove very quiet samples
-                noise_floor = rms * 0.1
-                audio_array = np.where(np.abs(audio_array) > noise_floor, audio_array, 0)
+            
+            return self._call_whisper_model(audio_array, sample_rate)
+            
+        except Exception as e:
+            logger.error(f"Failed to read audio file {audio_file_path}: {e}")
+            return {
+                'success': False,
+                'error': f'Audio file processing failed: {str(e)}'
+            }
+    
+    def _skipped_result(self, duration: float, message: str) -> Dict[str, Any]:
+        """Empty transcription result for audio rejected before inference"""
+        return {
+            'success': True,
+            'text': '',
+            'confidence': 0.0,
+            'processing_time': '0.00s',
+            'mode': 'whisper_onnx',
+            'audio_duration': f"{duration:.2f}s",
+            'message': message
+        }
+    
+    def _call_whisper_model(self, audio_array: np.ndarray, sample_rate: int) -> Dict[str, Any]:
+        """Transcribe mono int16 PCM or float32 audio in [-1, 1] with the ONNX Whisper model directly"""
+        
+        if not self.whisper_model:
+            return self._demo_transcription(audio_array, sample_rate)
+        
+        try:
+            duration = len(audio_array) / sample_rate
+            
+            # Validate audio length - skip very short recordings
+            if duration < MIN_AUDIO_SECONDS:
+                logger.warning(f"Audio too short ({duration:.3f}s), skipping transcription")
+                return self._skipped_result(duration, 'Audio too short')
+            
+            # Normalize, measure and noise-gate the samples in one fused pass
+            audio_array, rms = _normalize_and_gate(audio_array)
+            
+            # Validate audio amplitude - skip very quiet recordings  
+            if rms < SILENCE_RMS:
+                logger.warning(f"Audio too quiet (RMS: {rms:.6f}), skipping transcription")
+                return self._skipped_result(duration, 'Audio too quiet')
             
             logger.info(f"Processing audio: {duration:.2f}s, {sample_rate}Hz, RMS: {rms:.4f}")
             
             # Transcribe using the ONNX model with proper audio format
             start_time = time.time()
-            transcribed_text = self.whisper_model.transcribe(audio_array, sample_rate)
+            transcribed_text = self._transcribe_array(audio_array, sample_rate)
             processing_time = time.time() - start_time
             
             # Clean up the transcription result
@@ -375,37 +650,17 @@ class WhisperVoiceController:
             
             # Filter out obviously wrong transcriptions
             if transcribed_text:
-                # Common Whisper hallucination patterns to filter out
-                hallucination_patterns = [
-                    r"see you in the next video",
-                    r"thanks for watching",
-                    r"subscribe and",
-                    r"like and subscribe",
-                    r"don't forget to",
-                    r"and I'll see you",
-                    r"outro|intro|ending",
-                    r"bye\.?\s*(bye\.?\s*){3,}",  # Multiple "bye bye bye"
-                    r"(thank you|thanks).*next.*time",
-                    r"until next time"
-                ]
-                
-                text_lower = transcribed_text.lower()
-                for pattern in hallucination_patterns:
-                    if re.search(pattern, text_lower):
-                        logger.warning(f"Detected likely hallucination pattern: {pattern}")
-                        transcribed_text = ''
-                        break
+                # Filter out common Whisper hallucination patterns
+                match = _HALLUCINATION_RE.search(transcribed_text)
+                if match:
+                    logger.warning(f"Detected likely hallucination pattern: {match.group(0)!r}")
+                    transcribed_text = ''
                 
                 # Check for repetitive patterns that indicate transcription errors
-                words = transcribed_text.split()
+                words = _WORD_RE.findall(transcribed_text.lower())
                 if len(words) > 10:
                     # Check for excessive repetition (same word repeated >5 times)
-                    word_counts = {}
-                    for word in words:
-                        word_lower = word.lower().strip('.,!?')
-                        word_counts[word_lower] = word_counts.get(word_lower, 0) + 1
-                    
-                    max_repetitions = max(word_counts.values())
+                    max_repetitions = Counter(words).most_common(1)[0][1]
                     if max_repetitions > 5:
                         logger.warning(f"Detected excessive repetition in transcription, likely error")
                         transcribed_text = ''
@@ -426,28 +681,56 @@ class WhisperVoiceController:
                 'audio_duration': f"{duration:.2f}s",
                 'audio_quality': {
                     'sample_rate': sample_rate,
-                    'channels': n_channels,
+                    'channels': 1,
                     'rms': f"{rms:.4f}",
                     'duration': f"{duration:.2f}s"
                 }
             }
                 
         except Exception as e:
-            logger.error(f"Failed to process audio with Whisper model: {e}")
-            import traceback
-            traceback.print_exc()
-            return self._demo_transcription(audio_file_path)
+            logger.exception(f"Failed to process audio with Whisper model: {e}")
+            return self._demo_transcription(audio_array, sample_rate)
+    
+    def _compute_log_mel(self, audio_array: np.ndarray) -> np.ndarray:
+        """
+        Compute Whisper's log-Mel input for up to 30 s of 16 kHz float32 audio in NumPy
+        
+        Args:
+            audio_array: Mono float32 samples in [-1, 1]
+            
+        Returns:
+            Log-Mel spectrogram of shape (1, 80, 3000)
+        """
+        # Zero-pad to the 30 s window, then reflect-pad like a centered STFT
+        audio = np.pad(audio_array, (0, WHISPER_CHUNK_SAMPLES - len(audio_array)))
+        audio = np.pad(audio, WHISPER_N_FFT // 2, mode='reflect')
+        
+        # Strided frame view (no copy); the last frame is dropped as in the reference STFT
+        frames = sliding_window_view(audio, WHISPER_N_FFT)[::WHISPER_HOP_LENGTH][:-1]
+        spectrum = np.fft.rfft(frames * self._window, axis=-1)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2).astype(np.float32)
+        
+        mel_spec = self._mel_fb @ power.T
+        log_spec = np.log10(np.maximum(mel_spec, 1e-10))
+        log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
+        log_spec = (log_spec + 4.0) / 4.0
+        return log_spec[np.newaxis].astype(np.float32)
+    
+    def _transcribe_array(self, audio_array: np.ndarray, sample_rate: int) -> str:
+        """Transcribe float32 audio, feeding the encoder precomputed mel features when it fits one window"""
+        if sample_rate == WHISPER_SAMPLE_RATE and len(audio_array) <= WHISPER_CHUNK_SAMPLES:
+            return self.whisper_model.transcribe_mel(self._compute_log_mel(audio_array))
+        return self.whisper_model.transcribe(audio_array, sample_rate)
     
-    def _demo_transcription(self, audio_file_path: str) -> Dict[str, Any]:
+    def _demo_transcription(self, audio_array: np.ndarray, sample_rate: int) -> Dict[str, Any]:
         """Fallback demo transcription when executable is not available"""
         try:
-            # Analyze the audio file to provide intelligent demo responses
-            with wave.open(audio_file_path, 'rb') as wav_file:
-                frames = wav_file.getnframes()
-                duration = frames / wav_file.getframerate()
-                audio_data = wav_file.readframes(frames)
-                audio_array = np.frombuffer(audio_data, dtype=np.int16)
-                rms = np.sqrt(np.mean(audio_array.astype(np.float32) ** 2))
+            # Analyze the audio to provide intelligent demo responses
+            duration = len(audio_array) / sample_rate
+            samples = audio_array.astype(np.float32)
+            if audio_array.dtype != np.int16:
+                samples *= 32768.0  # Report on the int16 scale
+            rms = np.sqrt(np.mean(samples ** 2))
             
             logger.info(f"Demo mode - Audio: {duration:.2f}s, RMS: {rms:.2f}")
             
@@ -491,44 +774,19 @@ class WhisperVoiceController:
         
         logger.info(f"Processing voice command: '{command_text}'")
         
-        # Enhanced command matching with fuzzy matching and common variations
-        command_patterns = {
-            'play': ['play', 'start', 'begin', 'resume', 'continue'],
-            'pause': ['pause', 'stop', 'halt', 'wait'],
-            'repeat': ['repeat', 'again', 'once more', 'say again', 'replay'],
-            'next': ['next', 'forward', 'continue', 'proceed'],
-            'previous': ['previous', 'back', 'prior', 'before'],
-            'question': ['question', 'ask', 'quiz']
-        }
-        
-        # First check exact registered command handlers
-        for command_key, handler in self.command_handlers.items():
-            if command_key in command_lower:
-                try:
-                    handler(command_text)
-                    logger.info(f"✅ Executed handler for command: {command_key}")
-                    return
-                except Exception as e:
-                    logger.error(f"❌ Error executing command handler: {e}")
-                return
-        
-        # Then check pattern variations
-        for base_command, patterns in command_patterns.items():
-            if base_command in self.command_handlers:
-                for pattern in patterns:
-                    if pattern in command_lower:
-                        try:
-                            handler = self.command_handlers[base_command]
-                            handler(command_text)
-                            logger.info(f"✅ Executed handler for command pattern '{pattern}' -> {base_command}")
-                            return
-                        except Exception as e:
-                            logger.error(f"❌ Error executing pattern handler: {e}")
-                        break
+        # Registered commands first, then their common variations - one pass over the text
+        match = self._match_command(command_lower)
+        if match:
+            _, pattern, command_key = match
+            try:
+                self.command_handlers[command_key](command_text)
+                logger.info(f"✅ Executed handler for command pattern '{pattern}' -> {command_key}")
+            except Exception as e:
+                logger.error(f"❌ Error executing command handler: {e}")
+            return
         
         # Check for number patterns in commands (for "repeat question one", etc.)
-        import re
-        numbers = re.findall(r'\b(?:one|two|three|four|five|six|seven|eight|nine|ten|\d+)\b', command_lower)
+        numbers = _NUMBER_RE.findall(command_lower)
         if numbers and any(pattern in command_lower for pattern in ['repeat', 'question', 'again']):
             if 'repeat' in self.command_handlers:
                 try:
@@ -548,9 +806,8 @@ class WhisperVoiceController:
             if self.is_listening:
                 self.stop_listening()
                 
-            if self.pyaudio_instance:
-                self.pyaudio_instance.terminate()
-                self.pyaudio_instance = None
+            # The PyAudio instance is shared by all controllers and terminated at exit
+            self.pyaudio_instance = None
                 
         except Exception as e:
             logger.error(f"Cleanup error: {e}")
@@ -578,7 +835,6 @@ class PipelineVoiceCommands:
         logger.info(f"Voice command: {command_text}")
         
         # Parse which question to repeat
-        import re
         numbers = re.findall(r'\d+', command_text)
         if numbers:
             question_num = int(numbers[0]) - 1  # Convert to 0-based index
@@ -589,9 +845,6 @@ class PipelineVoiceCommands:
                 # Generate and play audio for this specific question
                 if self.tts_engine:
                     try:
-                        import tempfile
-                        import uuid
-                        
                         audio_filename = f"repeat_{uuid.uuid4().hex}.wav"
                         audio_path = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
                         
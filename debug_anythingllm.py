@@ -6,6 +6,13 @@ Direct test of AnythingLLM API to debug the empty response issue
 import requests
 import json
 import yaml
+from requests.adapters import HTTPAdapter
+
+# Shared session so repeated calls reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+_SESSION.headers.update({"accept": "application/json"})
 
 def test_direct_api():
     """Test AnythingLLM API directly using the working chatbot format"""
@@ -22,7 +29,6 @@ def test_direct_api():
     url = f"{base_url}/workspace/{workspace_slug}/chat"
     
     headers = {
-        "accept": "application/json",
         "Content-Type": "application/json",
         "Authorization": "Bearer " + api_key
     }
@@ -41,7 +47,7 @@ def test_direct_api():
     print("-" * 50)
     
     try:
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        response = _SESSION.post(url, headers=headers, json=data, timeout=30)
         
         print(f"Status Code: {response.status_code}")
         print(f"Response Headers: {dict(response.headers)}")
@@ -5,29 +5,177 @@ Combines PDF reading, text extraction, TTS, and Whisper transcription
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-import threading
-import queue
+import collections
+import concurrent.futures
 import os
 import sys
 import yaml
+import json
+import hashlib
 from pathlib import Path
+from dataclasses import dataclass
 import time
 
 # Import custom modules
 try:
-    from standalone_whisper import StandaloneWhisperApp
+    import onnxruntime
+    from standalone_model import (StandaloneWhisperModel, create_session_options,
+                                  ensure_quantized, accelerator_available)
 except ImportError:
-    print("Warning: StandaloneWhisperApp not found. Transcription will be disabled.")
-    StandaloneWhisperApp = None
+    print("Warning: StandaloneWhisperModel not found. Transcription will be disabled.")
+    StandaloneWhisperModel = None
 
 try:
-    from pdf_processor import PDFProcessor
+    import numpy as np
+    import sounddevice as sd
+except ImportError:
+    print("Warning: sounddevice not found. Voice capture will be disabled.")
+    np = None
+    sd = None
+
+try:
+    from pdf_processor import PDFProcessor, file_digest
     from tts_engine import AudioController
 except ImportError as e:
     print(f"Warning: Required modules not found: {e}")
     PDFProcessor = None
+    file_digest = None
     AudioController = None
 
+# Prefer libyaml's C parser when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Application settings from config.yaml, flattened and type-checked once at startup"""
+    sample_rate: int = 16000
+    chunk_duration: float = 4
+    channels: int = 1
+    max_workers: int = 4
+    silence_threshold: float = 0.001
+    queue_timeout: float = 1.0
+    low_memory: bool = False
+    encoder_path: str = 'models/WhisperEncoder.onnx'
+    decoder_path: str = 'models/WhisperDecoder.onnx'
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Config from the nested audio/processing/model_paths sections of config.yaml"""
+        data = data or {}
+        audio = data.get('audio') or {}
+        processing = data.get('processing') or {}
+        model_paths = data.get('model_paths') or {}
+        defaults = cls()
+        return cls(
+            sample_rate=int(audio.get('sample_rate', defaults.sample_rate)),
+            chunk_duration=float(audio.get('chunk_duration', defaults.chunk_duration)),
+            channels=int(audio.get('channels', defaults.channels)),
+            max_workers=int(processing.get('max_workers') or defaults.max_workers),
+            silence_threshold=float(processing.get('silence_threshold', defaults.silence_threshold)),
+            queue_timeout=float(processing.get('queue_timeout', defaults.queue_timeout)),
+            low_memory=bool(processing.get('low_memory', defaults.low_memory)),
+            encoder_path=str(model_paths.get('encoder_path', defaults.encoder_path)),
+            decoder_path=str(model_paths.get('decoder_path', defaults.decoder_path)),
+        )
+
+# Parsed config files keyed by (resolved path, mtime in ns)
+_CFG_CACHE = {}
+
+# Synthesized question audio kept ready for playback, keyed by (question text, speed)
+TTS_PREFETCH_CACHE_SIZE = 8
+
+# Microphone capture: blocks per second delivered by the input callback, and seconds buffered before dropping
+CAPTURE_BLOCKS_PER_SECOND = 10
+CAPTURE_BUFFER_SECONDS = 30
+
+# A window identical to the previous one within this many seconds is not transcribed again
+DUPLICATE_WINDOW_SECONDS = 2.0
+
+
+class SPSCRing:
+    """
+    Single-producer/single-consumer float32 ring buffer for audio samples.
+    The producer only advances `head` and the consumer only advances `tail`, each after
+    its copy is done, so the PortAudio callback never takes a lock.
+    """
+    
+    def __init__(self, capacity):
+        self.buf = np.zeros(capacity, dtype=np.float32)
+        self.capacity = capacity
+        self.head = 0  # Total samples written
+        self.tail = 0  # Total samples read
+    
+    def available(self):
+        """Number of samples ready to read"""
+        return self.head - self.tail
+    
+    def write(self, samples):
+        """Append samples; returns False (dropping them) if the ring is full"""
+        n = len(samples)
+        if n > self.capacity - (self.head - self.tail):
+            return False
+        
+        start = self.head % self.capacity
+        first = min(n, self.capacity - start)
+        np.copyto(self.buf[start:start + first], samples[:first])
+        np.copyto(self.buf[:n - first], samples[first:])
+        self.head += n
+        return True
+    
+    def read_into(self, out):
+        """Fill `out` with the oldest samples; returns False if fewer than len(out) are ready"""
+        n = len(out)
+        if n > self.head - self.tail:
+            return False
+        
+        start = self.tail % self.capacity
+        first = min(n, self.capacity - start)
+        np.copyto(out[:first], self.buf[start:start + first])
+        np.copyto(out[first:], self.buf[:n - first])
+        self.tail += n
+        return True
+
+# Extracted text display: characters inserted per idle callback, and above what size the
+# widget only holds a window of pages (80x50 characters each) around the scroll position.
+# The window slides once the view gets within TEXT_WINDOW_EDGE (fraction) of either end.
+TEXT_INSERT_CHUNK = 65536
+TEXT_WINDOW_THRESHOLD = 1024 * 1024
+TEXT_PAGE_CHARS = 80 * 50
+TEXT_WINDOW_PAGES = 10
+TEXT_WINDOW_EDGE = 0.1
+
+# (play, pause, stop) button states for each audio status reported by AudioController
+_BUTTON_STATES = {
+    'playing': ("disabled", "normal", "normal"),
+    'paused': ("normal", "disabled", "normal"),
+    'stopped': ("normal", "disabled", "disabled"),
+    'completed': ("normal", "disabled", "disabled"),
+    'error': ("normal", "disabled", "disabled"),
+}
+
+# Speed slider: values snap to 0.1x steps, and prefetched audio is rebuilt once the
+# slider has rested this long
+SPEED_SETTLE_MS = 200
+
+# Widget updates requested within one frame (~60 Hz) are applied together
+UI_FLUSH_MS = 16
+
+# Transcription log: utterances kept in memory, lines kept in the widget, and the
+# delay used to coalesce scroll-to-end requests (20 redraws per second at most)
+TRANSCRIPT_HISTORY_LINES = 2000
+TRANSCRIPT_VISIBLE_LINES = 500
+TRANSCRIPT_SCROLL_DELAY_MS = 50
+
+# Processed PDFs keyed by (sha256 of the file, use_ocr, extract_questions): recent results
+# in memory, a larger LRU set as JSON on disk
+PDF_MEMORY_CACHE_SIZE = 16
+PDF_CACHE_DIR = Path.home() / ".cache" / "ilumina" / "pdf"
+PDF_DISK_CACHE_SIZE = 64  # Least recently used results beyond this are deleted
+
 class TestApplication:
     def __init__(self, root):
         self.root = root
@@ -36,22 +184,44 @@ class TestApplication:
         
         # Initialize variables
         self.pdf_text = ""
+        self._text_stream_id = 0
+        self._text_window = None  # (start, stop) offsets of pdf_text held by a windowed display
+        self._text_recenter_job = None
         self.questions = []
         self.current_question_index = 0
-        self.audio_queue = queue.Queue()
         self.is_playing = False
         self.is_paused = False
         self.current_audio_file = None
         self.is_transcribing = False
+        self._log_lines = collections.deque(maxlen=TRANSCRIPT_HISTORY_LINES)
+        self._scroll_pending = False
+        self._pending_ui = {}  # Latest widget update per key, applied by _flush_ui
+        self._ui_flush_scheduled = False
+        self._last_speed = 1.0
+        self._speed_settle_job = None
+        
+        # Background synthesis of nearby questions so Play is usually a cache hit
+        self._tts_cache = collections.OrderedDict()
+        self._tts_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='tts')
+        
+        # Results of previously processed PDFs so re-processing the same file is instant
+        self._pdf_cache = collections.OrderedDict()
         
         # Load config
         self.config = self.load_config()
         
+        # Long-lived workers for PDF processing, live transcription and warmup (at least two,
+        # so a PDF can be processed while listening)
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(2, self.config.max_workers), thread_name_prefix='ilumina'
+        )
+        
         # Initialize components
         self.pdf_processor = PDFProcessor() if PDFProcessor else None
         self.audio_controller = AudioController(self.audio_status_callback) if AudioController else None
         self.transcriber = None
         self.init_whisper()
+        self._warmup()
         
         # Setup GUI
         self.create_widgets()
@@ -59,61 +229,75 @@ class TestApplication:
 
     def audio_status_callback(self, status, message):
         """Callback for audio status updates"""
-        def update_ui():
-            if status == 'playing':
-                self.play_button.config(state="disabled")
-                self.pause_button.config(state="normal")
-                self.stop_button.config(state="normal")
-                self.status_bar.config(text=message)
-            elif status == 'paused':
-                self.play_button.config(state="normal")
-                self.pause_button.config(state="disabled")
-                self.stop_button.config(state="normal")
-                self.status_bar.config(text=message)
-            elif status == 'stopped' or status == 'completed':
-                self.play_button.config(state="normal")
-                self.pause_button.config(state="disabled")
-                self.stop_button.config(state="disabled")
-                self.status_bar.config(text=message)
-            elif status == 'error':
-                self.play_button.config(state="normal")
-                self.pause_button.config(state="disabled")
-                self.stop_button.config(state="disabled")
-                self.status_bar.config(text=f"Error: {message}")
-        
-        # Schedule UI update in main thread
-        self.root.after(0, update_ui)
+        states = _BUTTON_STATES.get(status)
+        if states is None:
+            return
+        if status == 'error':
+            message = f"Error: {message}"
+        
+        # Schedule UI update in main thread; statuses within one frame collapse into the last
+        self._schedule_ui('audio_status', self._apply_button_states, states, message)
+
+    def _schedule_ui(self, key, func, *args):
+        """Queue a widget update for the next frame, replacing any pending update with the same key"""
+        self._pending_ui[key] = (func, args)
+        if not self._ui_flush_scheduled:
+            self._ui_flush_scheduled = True
+            self.root.after(UI_FLUSH_MS, self._flush_ui)
+
+    def _flush_ui(self):
+        """Apply all pending widget updates (main thread)"""
+        self._ui_flush_scheduled = False
+        while self._pending_ui:
+            _, (func, args) = self._pending_ui.popitem()
+            func(*args)
+
+    def _apply_button_states(self, states, message):
+        """Apply (play, pause, stop) button states and a status message"""
+        for button, state in zip((self.play_button, self.pause_button, self.stop_button), states):
+            button.config(state=state)
+        self.status_bar.config(text=message)
 
     def load_config(self):
         """Load configuration from config.yaml"""
         config_path = Path("config.yaml")
         if config_path.exists():
-            with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
+            key = (str(config_path.resolve()), config_path.stat().st_mtime_ns)
+            if key not in _CFG_CACHE:
+                with open(config_path, 'r') as f:
+                    _CFG_CACHE[key] = Config.from_dict(yaml.load(f, Loader=SafeLoader))
+            return _CFG_CACHE[key]  # Frozen, safe to share between instances
         else:
             # Default config if file not found
-            return {
-                'audio': {
-                    'sample_rate': 16000,
-                    'chunk_duration': 4,
-                    'channels': 1
-                },
-                'processing': {
-                    'max_workers': 4,
-                    'silence_threshold': 0.001,
-                    'queue_timeout': 1.0
-                },
-                'model_paths': {
-                    'encoder_path': 'models/WhisperEncoder.onnx',
-                    'decoder_path': 'models/WhisperDecoder.onnx'
-                }
-            }
+            return Config()
 
     def init_whisper(self):
-        """Initialize Whisper transcriber if available"""
+        """Initialize Whisper transcriber from the ONNX encoder/decoder if available"""
         try:
-            if StandaloneWhisperApp:
-                self.transcriber = StandaloneWhisperApp()
+            if StandaloneWhisperModel:
+                encoder_path = self.config.encoder_path
+                decoder_path = self.config.decoder_path
+                
+                # int8 encoder weights on CPU; the decoder stays FP32 for accuracy
+                if not accelerator_available():
+                    encoder_path = ensure_quantized(encoder_path)
+                
+                # Full graph optimization, one intra-op thread per configured worker;
+                # processing.low_memory trades allocation speed for a smaller footprint
+                session_options = create_session_options(self.config.max_workers, self.config.low_memory)
+                
+                # With a CUDA GPU, run the encoder there and the decoder on the CPU so the
+                # two halves of consecutive windows can overlap (see _transcription_thread)
+                encoder_providers = decoder_providers = None
+                if 'CUDAExecutionProvider' in onnxruntime.get_available_providers():
+                    encoder_providers = [('CUDAExecutionProvider', {'device_id': 0}), 'CPUExecutionProvider']
+                    decoder_providers = ['CPUExecutionProvider']
+                
+                self.transcriber = StandaloneWhisperModel(
+                    encoder_path, decoder_path, session_options,
+                    encoder_providers=encoder_providers,
+                    decoder_providers=decoder_providers
+                )
                 print("Whisper transcriber initialized successfully")
             else:
                 print("Whisper transcriber not available")
@@ -121,6 +305,17 @@ class TestApplication:
             print(f"Error initializing Whisper: {e}")
             self.transcriber = None
 
+    def _warmup(self):
+        """Run one throwaway inference per model in the background so the first real one is fast"""
+        if self.transcriber and np is not None:
+            # Silent mel: one encoder run and a single decoder step (no-speech exit)
+            silent_mel = np.zeros((1, 80, 3000), dtype=np.float32)
+            self._pool.submit(self.transcriber.transcribe_mel, silent_mel)
+        
+        if self.audio_controller:
+            # Same worker as the prefetches, so it never races a real synthesis
+            self._tts_executor.submit(self.audio_controller.tts.text_to_wav_bytes, "Warming up", 1.0)
+
     def create_widgets(self):
         """Create all GUI widgets"""
         
@@ -200,6 +395,10 @@ class TestApplication:
             state="disabled"
         )
         self.text_display.pack(fill="both", expand=True)
+        # Every kind of scrolling (wheel, scrollbar, keys) reports here, so a windowed display can slide
+        self.text_display.config(yscrollcommand=self._on_text_scrolled)
+        # Disabled Text widgets don't take focus on click; keyboard scrolling needs it
+        self.text_display.bind("<Button-1>", lambda event: self.text_display.focus_set(), add="+")
 
     def create_audio_widgets(self):
         """Create audio control widgets"""
@@ -256,16 +455,14 @@ class TestApplication:
             to=2.0, 
             variable=self.speed_var,
             orient="horizontal",
-            length=200
+            length=200,
+            command=self.update_speed_label
         )
         self.speed_scale.pack(side="left", padx=10)
         
         self.speed_label = ttk.Label(speed_frame, text="1.0x")
         self.speed_label.pack(side="left", padx=5)
         
-        # Update speed label
-        self.speed_var.trace('w', self.update_speed_label)
-        
         # Playback Controls
         playback_frame = ttk.Frame(audio_controls_frame)
         playback_frame.pack(fill="x", pady=10)
@@ -367,7 +564,7 @@ class TestApplication:
         self.process_button.config(state="disabled")
         
         # Run processing in separate thread to avoid blocking UI
-        threading.Thread(target=self._process_pdf_thread, daemon=True).start()
+        self._pool.submit(self._process_pdf_thread)
 
     def _process_pdf_thread(self):
         """PDF processing thread"""
@@ -375,13 +572,24 @@ class TestApplication:
             if not self.pdf_processor:
                 raise Exception("PDF processor not available")
                 
+            use_ocr = self.use_ocr.get()
+            extract_questions = self.extract_questions.get()
+            cache_key = self._pdf_cache_key(self.pdf_file_path, use_ocr, extract_questions)
+            cached = self._load_cached_pdf(cache_key)
+            if cached:
+                self.pdf_text, self.questions = cached
+                self.root.after(0, self._update_ui_after_processing)
+                return
+            
             self.root.after(0, lambda: self.status_bar.config(text="Extracting text from PDF..."))
             
-            # Extract text from PDF
-            use_ocr = self.use_ocr.get()
-            self.pdf_text = self.pdf_processor.extract_text_from_pdf(
+            # Extract text from PDF, pages split across worker processes
+            self.pdf_text = self.pdf_processor.extract_text_parallel(
                 self.pdf_file_path, 
-                use_ocr=use_ocr
+                use_ocr=use_ocr,
+                workers=self.config.max_workers,
+                progress_callback=self._report_pdf_progress,
+                digest=cache_key[0]
             )
             
             if not self.pdf_text.strip():
@@ -390,7 +598,7 @@ class TestApplication:
             self.root.after(0, lambda: self.status_bar.config(text="Processing extracted text..."))
             
             # Extract questions if requested
-            if self.extract_questions.get():
+            if extract_questions:
                 self.questions = self.pdf_processor.extract_questions(self.pdf_text)
                 if not self.questions:
                     # If no questions found, use the full text
@@ -399,6 +607,8 @@ class TestApplication:
                 # Split text into manageable chunks
                 self.questions = self.pdf_processor.chunk_text_by_sentences(self.pdf_text)
             
+            self._store_cached_pdf(cache_key, self.pdf_text, self.questions)
+            
             # Update UI in main thread
             self.root.after(0, self._update_ui_after_processing)
             
@@ -408,13 +618,79 @@ class TestApplication:
             self.root.after(0, lambda: self.process_button.config(state="normal"))
             self.root.after(0, lambda: self.status_bar.config(text="Processing failed"))
 
+    def _pdf_cache_key(self, pdf_path, use_ocr, extract_questions):
+        """Cache key for a PDF: content hash plus the options that change the result"""
+        # Same digest the processor keys its page cache by; it is passed along so the file is hashed once
+        return (file_digest(pdf_path), bool(use_ocr), bool(extract_questions))
+
+    def _pdf_cache_file(self, key):
+        """Disk location of a cached PDF result"""
+        pdf_hash, use_ocr, extract_questions = key
+        return PDF_CACHE_DIR / f"{pdf_hash}-ocr{int(use_ocr)}-q{int(extract_questions)}.json"
+
+    def _load_cached_pdf(self, key):
+        """Return (text, questions) from the memory or disk cache, or None"""
+        if key in self._pdf_cache:
+            self._pdf_cache.move_to_end(key)
+            return self._pdf_cache[key]
+        
+        cache_file = self._pdf_cache_file(key)
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            result = (data['text'], data['questions'])
+            os.utime(cache_file)  # Mark as recently used for pruning
+        except (OSError, ValueError, KeyError):
+            return None
+        
+        self._remember_pdf(key, result)
+        return result
+
+    def _store_cached_pdf(self, key, text, questions):
+        """Save a processed PDF to the memory and disk caches"""
+        self._remember_pdf(key, (text, list(questions)))
+        try:
+            PDF_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(self._pdf_cache_file(key), 'w', encoding='utf-8') as f:
+                json.dump({'text': text, 'questions': list(questions)}, f)
+            self._prune_pdf_cache()
+        except OSError as e:
+            print(f"Warning: Could not write PDF cache: {e}")
+
+    def _prune_pdf_cache(self):
+        """Delete the least recently used cached results beyond PDF_DISK_CACHE_SIZE"""
+        # Only our own <hash>-ocrN-qN.json files; the backend keeps its cache in the same directory
+        cache_files = sorted(PDF_CACHE_DIR.glob("*-ocr[01]-q[01].json"),
+                             key=lambda path: path.stat().st_mtime, reverse=True)
+        for stale in cache_files[PDF_DISK_CACHE_SIZE:]:
+            stale.unlink(missing_ok=True)
+
+    def _remember_pdf(self, key, result):
+        """Add a result to the in-memory LRU"""
+        self._pdf_cache[key] = result
+        self._pdf_cache.move_to_end(key)
+        while len(self._pdf_cache) > PDF_MEMORY_CACHE_SIZE:
+            self._pdf_cache.popitem(last=False)
+
+    def _report_pdf_progress(self, pages_done, total_pages):
+        """Show extraction progress (called from the processing thread)"""
+        message = f"Extracting text from PDF... {pages_done}/{total_pages} pages"
+        self.root.after(0, lambda: self.status_bar.config(text=message))
+
     def _update_ui_after_processing(self):
         """Update UI after PDF processing is complete"""
-        # Update text display
-        self.text_display.config(state="normal")
-        self.text_display.delete(1.0, tk.END)
-        self.text_display.insert(1.0, self.pdf_text)
-        self.text_display.config(state="disabled")
+        # Update text display without pushing the whole extraction into Tk at once
+        self._text_stream_id += 1
+        if len(self.pdf_text) > TEXT_WINDOW_THRESHOLD:
+            self._show_text_window(0)
+        else:
+            self._text_window = None
+            self.text_display.config(state="normal")
+            self.text_display.delete(1.0, tk.END)
+            self._stream_insert(self.pdf_text, 0, TEXT_INSERT_CHUNK, self._text_stream_id)
+        
+        # Syntheses still queued for the previous document are no longer needed
+        self._invalidate_tts_cache()
         
         # Enable audio controls if questions found
         if self.questions:
@@ -425,6 +701,57 @@ class TestApplication:
         self.process_button.config(state="normal")
         self.status_bar.config(text=f"Processing complete - Found {len(self.questions)} question(s)")
 
+    def _stream_insert(self, text, offset, chunk, stream_id):
+        """Insert text one chunk per idle callback so the UI stays responsive"""
+        if stream_id != self._text_stream_id:
+            return  # A newer PDF replaced this one
+        
+        self.text_display.insert(tk.END, text[offset:offset + chunk])
+        if offset + chunk < len(text):
+            self.root.after_idle(self._stream_insert, text, offset + chunk, chunk, stream_id)
+        else:
+            self.text_display.config(state="disabled")
+
+    def _show_text_window(self, offset):
+        """
+        Back the text widget with only the pages around character `offset` of pdf_text (large PDFs),
+        with `offset` at the top of the view. The scrollbar then spans this window, not the document.
+        """
+        span = TEXT_WINDOW_PAGES * TEXT_PAGE_CHARS
+        start = max(0, offset - span)
+        stop = min(len(self.pdf_text), offset + span)
+        
+        self._text_window = (start, stop)
+        self.text_display.config(state="normal")
+        self.text_display.delete(1.0, tk.END)
+        self.text_display.insert(1.0, self.pdf_text[start:stop])
+        self.text_display.config(state="disabled")
+        self.text_display.yview(f"1.0 + {offset - start} chars")
+
+    def _on_text_scrolled(self, first, last):
+        """yscrollcommand: update the scrollbar, and slide a windowed display nearing either end"""
+        self.text_display.vbar.set(first, last)
+        if self._text_window is None or self._text_recenter_job is not None:
+            return
+        
+        first, last = float(first), float(last)
+        if first <= 0 and last >= 1:
+            return  # Not laid out yet (e.g. tab hidden) - nothing to measure against
+        
+        start, stop = self._text_window
+        if ((first < TEXT_WINDOW_EDGE and start > 0)
+                or (last > 1 - TEXT_WINDOW_EDGE and stop < len(self.pdf_text))):
+            # Not from inside the scroll callback: Tk is still mid-update
+            self._text_recenter_job = self.root.after_idle(self._recenter_text_window)
+
+    def _recenter_text_window(self):
+        """Rebuild the window around the first visible character, keeping the view where it is"""
+        self._text_recenter_job = None
+        if self._text_window is None or not self.text_display.winfo_viewable():
+            return
+        visible = self.text_display.count("1.0", "@0,0", "chars")
+        self._show_text_window(self._text_window[0] + (visible[0] if visible else 0))
+
     def update_question_display(self):
         """Update the current question display"""
         if self.questions and 0 <= self.current_question_index < len(self.questions):
@@ -435,18 +762,88 @@ class TestApplication:
             self.question_display.insert(1.0, question)
             self.question_display.config(state="disabled")
             
-            # Update counter
-            self.question_counter.config(
-                text=f"Question {self.current_question_index + 1} of {len(self.questions)}"
+            # Update counter and navigation buttons in one frame
+            self._schedule_ui(
+                'question_nav',
+                self._apply_question_nav,
+                f"Question {self.current_question_index + 1} of {len(self.questions)}",
+                "normal" if self.current_question_index > 0 else "disabled",
+                "normal" if self.current_question_index < len(self.questions) - 1 else "disabled"
             )
             
-            # Update navigation buttons
-            self.prev_button.config(
-                state="normal" if self.current_question_index > 0 else "disabled"
-            )
-            self.next_button.config(
-                state="normal" if self.current_question_index < len(self.questions) - 1 else "disabled"
-            )
+            # The user usually presses Play next - start synthesizing now
+            self._prefetch_audio()
+
+    def _apply_question_nav(self, counter_text, prev_state, next_state):
+        """Apply the question counter and previous/next button states"""
+        self.question_counter.config(text=counter_text)
+        self.prev_button.config(state=prev_state)
+        self.next_button.config(state=next_state)
+
+    def _prefetch_audio(self):
+        """Queue synthesis of the current, next and previous questions at the current speed"""
+        if not self.audio_controller:
+            return
+        
+        speed = self._current_speed()
+        index = self.current_question_index
+        if 0 <= index < len(self.questions):
+            # The current question goes first on its own so it isn't held up by its neighbours
+            self._get_audio_future(index, speed)
+        neighbours = [n for n in (index + 1, index - 1) if 0 <= n < len(self.questions)]
+        self._get_audio_futures(neighbours, speed)
+
+    def _get_audio_future(self, index, speed):
+        """Return the (possibly pending) synthesis of a question, submitting it if not cached"""
+        return self._get_audio_futures([index], speed)[0]
+
+    def _get_audio_futures(self, indices, speed):
+        """
+        Return the (possibly pending) syntheses of several questions.
+        Uncached ones are submitted as one job, rendered in a single TTS engine run.
+        """
+        futures = []
+        pending = []
+        for index in indices:
+            # Keyed by the text, not the index, so a newly loaded PDF never reuses another's audio
+            text = self.questions[index]
+            key = (text, speed)
+            future = self._tts_cache.get(key)
+            if future is None:
+                future = concurrent.futures.Future()
+                self._tts_cache[key] = future
+                pending.append((text, future))
+            else:
+                self._tts_cache.move_to_end(key)
+            futures.append(future)
+        
+        if pending:
+            self._tts_executor.submit(self._synthesize_batch, pending, speed)
+            while len(self._tts_cache) > TTS_PREFETCH_CACHE_SIZE:
+                _, evicted = self._tts_cache.popitem(last=False)
+                evicted.cancel()
+        return futures
+
+    def _synthesize_batch(self, pending, speed):
+        """Executor job: synthesize (text, future) pairs together, skipping any cancelled while queued"""
+        pending = [(text, future) for text, future in pending if future.set_running_or_notify_cancel()]
+        if not pending:
+            return
+        
+        try:
+            results = self.audio_controller.tts.texts_to_wav_bytes([text for text, _ in pending], speed)
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            return
+        for (_, future), audio_data in zip(pending, results):
+            future.set_result(audio_data)
+
+    def _invalidate_tts_cache(self):
+        """Drop prefetched audio (e.g. after a speed change), cancelling syntheses not yet started"""
+        for future in self._tts_cache.values():
+            future.cancel()
+        self._tts_cache.clear()
 
     def enable_audio_controls(self):
         """Enable audio control buttons"""
@@ -467,8 +864,27 @@ class TestApplication:
 
     def update_speed_label(self, *args):
         """Update speed display label"""
-        speed = self.speed_var.get()
+        speed = self._current_speed()
+        if speed == self._last_speed:
+            return  # Still within the same 0.1x step
+        self._last_speed = speed
         self.speed_label.config(text=f"{speed:.1f}x")
+        
+        # Rebuild prefetched audio once the drag settles, not at every step
+        if self._speed_settle_job is not None:
+            self.root.after_cancel(self._speed_settle_job)
+        self._speed_settle_job = self.root.after(SPEED_SETTLE_MS, self._on_speed_settled)
+
+    def _on_speed_settled(self):
+        """Drop audio synthesized at the old speed and prefetch at the new one"""
+        self._speed_settle_job = None
+        self._invalidate_tts_cache()
+        if self.questions:
+            self._prefetch_audio()
+
+    def _current_speed(self):
+        """Speaking rate from the slider, snapped to 0.1x steps"""
+        return round(self.speed_var.get() * 10) / 10
 
     def play_current_question(self):
         """Play the current question using TTS"""
@@ -477,10 +893,11 @@ class TestApplication:
             return
         
         question = self.questions[self.current_question_index]
-        speed = self.speed_var.get()
+        speed = self._current_speed()
         
-        # Play using the audio controller
-        success = self.audio_controller.play_text(question, speed)
+        # Play using the audio controller, from the prefetched synthesis when available
+        audio_future = self._get_audio_future(self.current_question_index, speed)
+        success = self.audio_controller.play_text(question, speed, audio_future)
         
         if not success:
             messagebox.showerror("Error", "Failed to start audio playback")
@@ -503,11 +920,12 @@ class TestApplication:
             
         # Get the current question and speed, then play it
         question = self.questions[self.current_question_index]
-        speed = self.speed_var.get()
+        speed = self._current_speed()
         
-        # Stop current playback and play again
+        # Stop current playback and play again, from the prefetched synthesis when available
         self.audio_controller.stop()
-        success = self.audio_controller.play_text(question, speed)
+        audio_future = self._get_audio_future(self.current_question_index, speed)
+        success = self.audio_controller.play_text(question, speed, audio_future)
         
         if not success:
             messagebox.showerror("Error", "Failed to repeat audio playback")
@@ -531,7 +949,7 @@ class TestApplication:
             self.transcription_status.config(text="Listening...")
             
             # Start transcription in separate thread
-            threading.Thread(target=self._transcription_thread, daemon=True).start()
+            self._pool.submit(self._transcription_thread)
         else:
             # Stop transcription
             self.is_transcribing = False
@@ -539,33 +957,110 @@ class TestApplication:
             self.transcription_status.config(text="Ready")
 
     def _transcription_thread(self):
-        """Handle voice transcription in separate thread"""
+        """Capture microphone audio and transcribe each new window of speech as it fills"""
+        if sd is None:
+            self.root.after(0, lambda: self.transcription_status.config(text="Error: sounddevice not available"))
+            return
+        
+        sample_rate = self.config.sample_rate
+        window_samples = int(sample_rate * self.config.chunk_duration)
+        silence_threshold = self.config.silence_threshold
+        block_seconds = 1.0 / CAPTURE_BLOCKS_PER_SECOND
+        
+        # Lock-free hand-off from the PortAudio callback; blocks are dropped rather than blocking it
+        ring = SPSCRing(max(sample_rate * CAPTURE_BUFFER_SECONDS, 2 * window_samples))
+        
+        def audio_callback(indata, frames, time_info, status):
+            ring.write(indata[:, 0])
+        
+        # Tokens of the last decoded window, fed back so the next window continues the text
+        self._prev_tokens = []
+        
+        # Two-stage pipeline: the encoder works on window N+1 while the decoder finishes window N
+        encode_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='whisper-encode')
+        decode_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='whisper-decode')
+        
+        last_fingerprint = None
+        last_submit = 0.0
+        
         try:
-            while self.is_transcribing:
-                # This would integrate with your existing Whisper transcription
-                # For now, simulate transcription
-                time.sleep(1)
-                
-                # In real implementation, this would capture audio and transcribe
-                # Example integration with existing transcriber:
-                # if self.transcriber:
-                #     result = self.transcriber.transcribe_live()
-                #     if result:
-                #         self.root.after(0, lambda: self.update_transcription_display(result))
+            with sd.InputStream(
+                samplerate=sample_rate,
+                channels=1,
+                dtype='float32',
+                blocksize=sample_rate // CAPTURE_BLOCKS_PER_SECOND,
+                callback=audio_callback
+            ):
+                while self.is_transcribing:
+                    if ring.available() < window_samples:
+                        time.sleep(block_seconds)
+                        continue
+                    
+                    # Only audio captured since the last window goes to Whisper - nothing is re-encoded
+                    audio = np.empty(window_samples, dtype=np.float32)
+                    ring.read_into(audio)
+                    
+                    if np.abs(audio).mean() > silence_threshold:
+                        # Devices that replay a stale buffer deliver identical windows; skip the repeat
+                        fingerprint = hashlib.blake2b(audio, digest_size=8).digest()
+                        now = time.monotonic()
+                        if fingerprint == last_fingerprint and now - last_submit < DUPLICATE_WINDOW_SECONDS:
+                            continue
+                        last_fingerprint = fingerprint
+                        last_submit = now
+                        
+                        encoded = encode_pool.submit(self.transcriber.encode, audio, sample_rate)
+                        decode_pool.submit(self._decode_window, encoded)
                 
         except Exception as e:
             print(f"Transcription error: {e}")
-            self.root.after(0, lambda: self.transcription_status.config(text=f"Error: {e}"))
+            self.root.after(0, lambda msg=f"Error: {e}": self.transcription_status.config(text=msg))
+        finally:
+            encode_pool.shutdown(wait=True)
+            decode_pool.shutdown(wait=True)
+
+    def _decode_window(self, encoded):
+        """Decoder stage: wait for a window's encoder output, decode it and post the text"""
+        try:
+            text, tokens = self.transcriber.decode_with_prompt(encoded.result(), self._prev_tokens)
+            text = text.strip()
+            if tokens:
+                self._prev_tokens = tokens
+            if text:
+                self.root.after(0, self.update_transcription_display, text)
+        except Exception as e:
+            print(f"Transcription error: {e}")
 
     def update_transcription_display(self, text):
         """Update transcription display with new text"""
+        self._log_lines.append(text)
+        
+        # Only the most recent lines stay in the widget; the full history is in _log_lines
+        lines = int(self.transcription_display.index('end-1c').split('.')[0])
+        if lines > TRANSCRIPT_VISIBLE_LINES:
+            self.transcription_display.delete('1.0', f'{lines - TRANSCRIPT_VISIBLE_LINES}.0')
         self.transcription_display.insert(tk.END, text + "\n")
+        
+        if not self._scroll_pending:
+            self._scroll_pending = True
+            self.root.after(TRANSCRIPT_SCROLL_DELAY_MS, self._scroll_end)
+
+    def _scroll_end(self):
+        """Scroll the transcription display to the newest line (coalesced)"""
+        self._scroll_pending = False
         self.transcription_display.see(tk.END)
 
+    def shutdown(self):
+        """Stop background work so the worker pools can exit with the app"""
+        self.is_transcribing = False
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._tts_executor.shutdown(wait=False, cancel_futures=True)
+
 def main():
     root = tk.Tk()
     app = TestApplication(root)
     root.mainloop()
+    app.shutdown()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,191 @@
+"""
+TensorRT OCR Backend
+Runs EasyOCR's CRAFT detector and CRNN recognizer through ONNX Runtime's
+TensorRT execution provider (FP16, engines cached per GPU) instead of eager PyTorch
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+
+import numpy as np
+import torch
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+# Exported ONNX graphs and built TensorRT engines (ORT names engines per GPU and shape profile)
+TRT_CACHE_DIR = Path.home() / ".cache" / "ilumina" / "trt"
+
+# Recognizer input height used by EasyOCR's bundled models, and a representative line width
+RECOGNIZER_HEIGHT = 64
+RECOGNIZER_EXPORT_WIDTH = 256
+
+# TensorRT optimization profile for recognizer crops: EasyOCR pads each batch to a multiple of
+# the line height, so widths between these bounds share one engine; wider lines run on PyTorch
+RECOGNIZER_MIN_WIDTH = RECOGNIZER_HEIGHT
+RECOGNIZER_OPT_WIDTH = 512
+RECOGNIZER_MAX_WIDTH = 2048
+
+# Defaults for the detector profile: pages per call and the size EasyOCR resizes them to
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_PAGE_HEIGHT = 1200
+DEFAULT_PAGE_WIDTH = 800
+
+logger = logging.getLogger(__name__)
+
+
+def _pad32(size):
+    """CRAFT input sides are padded up to a multiple of 32 before the detector runs"""
+    return -(-size // 32) * 32
+
+
+def _shape_spec(dims):
+    """TensorRT EP profile shape string for the single 'image' input, e.g. image:1x3x640x640"""
+    return "image:" + "x".join(str(d) for d in dims)
+
+
+def _weights_digest(model):
+    """Short hash of a model's weights, so a changed checkpoint never reuses a stale export"""
+    digest = hashlib.blake2b(digest_size=8)
+    for name, tensor in model.state_dict().items():
+        digest.update(name.encode())
+        digest.update(tensor.detach().cpu().numpy().tobytes())
+    return digest.hexdigest()
+
+
+def trt_available():
+    """True if ONNX Runtime was built with the TensorRT execution provider"""
+    return onnxruntime is not None and 'TensorrtExecutionProvider' in onnxruntime.get_available_providers()
+
+
+class _ImageOnly(torch.nn.Module):
+    """Export wrapper: EasyOCR's recognizers take an unused `text` argument"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, image):
+        return self.model(image, None)
+
+
+class _OrtModule:
+    """
+    Drop-in callable for an EasyOCR torch model: takes the same input tensor,
+    runs the ONNX graph and hands back torch tensors on the caller's device.
+    Inputs outside the engine's optimization profile go to the original model instead.
+    """
+
+    def __init__(self, session, fallback, min_shape, max_shape):
+        self.session = session
+        self.input_name = session.get_inputs()[0].name
+        self.fallback = fallback
+        self.min_shape = min_shape
+        self.max_shape = max_shape
+
+    def __call__(self, x, *unused):
+        if any(not lo <= n <= hi for n, lo, hi in zip(x.shape, self.min_shape, self.max_shape)):
+            return self.fallback(x, *unused)
+        outputs = self.session.run(None, {self.input_name: x.detach().cpu().numpy().astype(np.float32)})
+        tensors = [torch.from_numpy(output).to(x.device) for output in outputs]
+        return tensors[0] if len(tensors) == 1 else tuple(tensors)
+
+    def eval(self):
+        return self
+
+
+class TRTOCR:
+    """Swaps an EasyOCR Reader's detector and recognizer for TensorRT-backed sessions"""
+
+    def __init__(self, reader, cache_dir=TRT_CACHE_DIR, fp16=True, batch_size=DEFAULT_BATCH_SIZE,
+                 page_height=DEFAULT_PAGE_HEIGHT, page_width=DEFAULT_PAGE_WIDTH):
+        self.reader = reader
+        self.cache_dir = Path(cache_dir)
+        self.fp16 = fp16
+        self.batch_size = batch_size
+        self.page_height = _pad32(page_height)
+        self.page_width = _pad32(page_width)
+
+    def install(self):
+        """
+        Export (once) and load both models, then patch them into the reader.
+        Returns False, leaving the reader untouched, if anything is unsupported.
+        """
+        if not trt_available():
+            logger.info("TensorRT execution provider not available; keeping PyTorch OCR")
+            return False
+        if getattr(self.reader, 'detect_network', 'craft') != 'craft':
+            logger.info("TensorRT OCR only supports the CRAFT detector; keeping PyTorch OCR")
+            return False
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Pages arrive resized to one common size, so only the batch dimension varies
+            page = (3, self.page_height, self.page_width)
+            detector = self._load(
+                "easyocr_detector",
+                self.reader.detector,
+                self._unwrap(self.reader.detector),
+                torch.zeros(1, *page),
+                {'image': {0: 'batch', 2: 'height', 3: 'width'}},
+                (1, *page), (self.batch_size, *page), (self.batch_size, *page)
+            )
+            # One recognizer per script, as EasyOCR picks its model from the languages
+            recognizer = self._load(
+                f"easyocr_recognizer_{getattr(self.reader, 'model_lang', 'english')}",
+                self.reader.recognizer,
+                _ImageOnly(self._unwrap(self.reader.recognizer)),
+                torch.zeros(1, 1, RECOGNIZER_HEIGHT, RECOGNIZER_EXPORT_WIDTH),
+                {'image': {0: 'batch', 3: 'width'}},
+                (1, 1, RECOGNIZER_HEIGHT, RECOGNIZER_MIN_WIDTH),
+                (self.batch_size, 1, RECOGNIZER_HEIGHT, RECOGNIZER_OPT_WIDTH),
+                (self.batch_size, 1, RECOGNIZER_HEIGHT, RECOGNIZER_MAX_WIDTH)
+            )
+        except Exception as e:
+            logger.error(f"TensorRT OCR setup failed, keeping PyTorch OCR: {e}")
+            return False
+
+        self.reader.detector = detector
+        self.reader.recognizer = recognizer
+        logger.info("EasyOCR detector and recognizer running on TensorRT")
+        return True
+
+    def _unwrap(self, model):
+        """EasyOCR wraps GPU models in DataParallel; export the inner module"""
+        return model.module if isinstance(model, torch.nn.DataParallel) else model
+
+    def _load(self, name, original, model, example, dynamic_axes, min_shape, opt_shape, max_shape):
+        """
+        Export `model` to ONNX on first use and open it on the TensorRT provider with an explicit
+        optimization profile, so the engine is built once instead of per new input shape
+        """
+        onnx_path = self.cache_dir / f"{name}_{_weights_digest(model)}.onnx"
+        if not onnx_path.exists():
+            logger.info(f"Exporting {name} to ONNX...")
+            model = model.float().eval()
+            example = example.to(next(model.parameters()).device)
+            with torch.no_grad():
+                torch.onnx.export(
+                    model, example, str(onnx_path),
+                    input_names=['image'],
+                    dynamic_axes=dynamic_axes,
+                    opset_version=17
+                )
+
+        providers = [
+            ('TensorrtExecutionProvider', {
+                'trt_fp16_enable': self.fp16,
+                'trt_engine_cache_enable': True,
+                'trt_engine_cache_path': str(self.cache_dir),
+                'trt_profile_min_shapes': _shape_spec(min_shape),
+                'trt_profile_opt_shapes': _shape_spec(opt_shape),
+                'trt_profile_max_shapes': _shape_spec(max_shape),
+            }),
+            'CUDAExecutionProvider',
+            'CPUExecutionProvider',
+        ]
+        session = onnxruntime.InferenceSession(str(onnx_path), providers=providers)
+        return _OrtModule(session, original, min_shape, max_shape)
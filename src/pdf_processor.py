@@ -7,99 +7,443 @@ import fitz  # PyMuPDF
 import easyocr
 import re
 import numpy as np
-from PIL import Image
-import io
+import os
 import logging
+import hashlib
+import mmap
+import shutil
+from pathlib import Path
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Optional torch, used only to detect a CUDA device for EasyOCR
+try:
+    import torch
+except ImportError:
+    torch = None
+
+# Optional Numba, used to compile the question-mark scanner
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Optional TensorRT backend for the OCR models (needs torch and onnxruntime-gpu)
+try:
+    from ocr_backend_trt import TRTOCR, trt_available
+except ImportError:
+    TRTOCR = None
+    trt_available = None
+
+# Plain text only: no ligature-preservation bookkeeping, no image blocks
+TEXT_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
+
+# Documents shorter than this are extracted in-process; worker start-up would dominate
+PARALLEL_MIN_PAGES = 8
+
+# Extracted page text, one file per (PDF content hash, page, OCR mode)
+PAGE_CACHE_DIR = Path.home() / ".cache" / "ilumina" / "pdf_text"
+PAGE_CACHE_MAX_DOCUMENTS = 64  # Least recently used documents beyond this are pruned
+
+# Part of each document's cache directory name - bump whenever page extraction output changes
+# (TEXT_FLAGS, OCR render size or confidence filter); directories of older formats age out
+PAGE_CACHE_FORMAT = 2
+
+# OCR: upper bound on the page render zoom (small pages), and pages recognized per
+# readtext_batched call at a common size
+OCR_MAX_RENDER_ZOOM = 3.0
+OCR_BATCH_SIZE = 8
+OCR_BATCH_WIDTH = 800
+OCR_BATCH_HEIGHT = 1200
+
+# Pages whose embedded text layer is shorter than this are treated as scanned and OCR'd
+OCR_MIN_TEXT_CHARS = 50
+
+# Detections at or below this EasyOCR confidence are dropped
+OCR_MIN_CONFIDENCE = 0.5
+
+# Question detection patterns, compiled once at import instead of per call
+_NUMBERED_QUESTION_RE = re.compile(r'^(?:Question|Q\.?)\s*(?:\d+|[a-zA-Z])[\.\)\:]\s*(.+?)(?=(?:Question|Q\.?|\n\n|\Z))',
+                                   re.MULTILINE | re.DOTALL | re.IGNORECASE)
+_QUESTION_MARK_RE = re.compile(r'([^.!?]*\?)', re.MULTILINE)
+# Common question starters as one alternation, so the text is scanned once rather than per starter.
+# The match is captured inside a lookahead so a starter inside an earlier match is still reported.
+_QUESTION_STARTER_RE = re.compile(
+    r'\b(?=('
+    r'(?:What|How|Why|When|Where|Who|Which|Can|Could|Would|Should|Do|Does|Did|Is|Are|Will|Have|Has)\b.*\?'
+    r'|(?:Explain|Describe|Discuss|Analyze|Compare)\b.*[\.?]'
+    r'))',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Near-duplicate questions: word n-gram size, and the share of the shorter question's
+# n-grams found in the other above which they count as the same question
+SHINGLE_WORDS = 5
+NEAR_DUPLICATE_OVERLAP = 0.8
+MAX_QUESTIONS = 20
+
+# Question text clean-up and sentence splitting
+_WHITESPACE_RE = re.compile(r'\s+')
+_PAGE_MARKER_RE = re.compile(r'--- Page \d+ ---')
+_LEADING_NUMBER_RE = re.compile(r'^\d+[\.\)]\s*')
+_LEADING_LETTER_RE = re.compile(r'^[a-zA-Z][\.\)]\s*')
+
+# Opening words that make an unterminated candidate a question rather than a statement
+_QUESTION_WORDS = frozenset({'what', 'how', 'why', 'when', 'where', 'who', 'which'})
+
+# Per-process PDFProcessor for pool workers (keeps the OCR reader loaded between ranges)
+_worker_processor = None
+
+
+def _extract_page_range(pdf_path, page_nums, use_ocr):
+    """Pool worker: extract the given pages of a PDF in a separate process"""
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = PDFProcessor()
+    
+    doc = fitz.open(pdf_path)
+    try:
+        return _worker_processor._extract_pages(doc, page_nums, use_ocr)
+    finally:
+        doc.close()
+
+def file_digest(pdf_path):
+    """SHA-256 hex digest of a file's contents, hashed through a read-only memory map"""
+    with open(pdf_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()  # Empty files cannot be mapped
+        # Hash straight from the page cache, without copying the file into Python bytes
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(mm).hexdigest()
+
+def _cuda_available():
+    """True if torch can see a CUDA device for EasyOCR"""
+    return torch is not None and torch.cuda.is_available()
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _question_spans_kernel(data):
+        """(start, end) byte offsets of each run since the last '.', '!' or '?' that ends in '?'"""
+        n = data.shape[0]
+        count = 0
+        for i in range(n):
+            if data[i] == 63:  # '?'
+                count += 1
+        spans = np.empty((count, 2), dtype=np.int64)
+        start = 0
+        k = 0
+        for i in range(n):
+            c = data[i]
+            if c == 63:  # '?'
+                spans[k, 0] = start
+                spans[k, 1] = i + 1
+                k += 1
+                start = i + 1
+            elif c == 46 or c == 33:  # '.' or '!'
+                start = i + 1
+        return spans
+
+
+def _question_mark_fragments(text):
+    """
+    Fragments matched by _QUESTION_MARK_RE, from one linear byte scan when Numba is available.
+    The terminators are ASCII bytes, which never occur inside a UTF-8 multi-byte sequence,
+    so every span decodes cleanly.
+    """
+    if numba is None:
+        return [match.group(1) for match in _QUESTION_MARK_RE.finditer(text)]
+    
+    data = text.encode('utf-8', 'surrogatepass')
+    spans = _question_spans_kernel(np.frombuffer(data, dtype=np.uint8))
+    return [data[start:end].decode('utf-8', 'surrogatepass') for start, end in spans.tolist()]
+
+def _shingles(words):
+    """Set of SHINGLE_WORDS-word n-grams (the whole question if it is shorter)"""
+    if len(words) < SHINGLE_WORDS:
+        return {tuple(words)}
+    return {tuple(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+def _split_sentences(text):
+    """
+    Split text at '.', '!' and '?' using str.replace/str.split (memchr-based C loops).
+    Unlike re.split(r'[.!?]+') a run of terminators leaves empty pieces between them,
+    which callers skip along with other blank pieces.
+    """
+    return text.replace('!', '.').replace('?', '.').split('.')
 
 class PDFProcessor:
-    def __init__(self):
+    def __init__(self, cache_dir=None):
         self.ocr_reader = None
         self.setup_logging()
+        
+        # Per-page text cache so re-opening a PDF skips parsing and OCR
+        self.cache_dir = Path(cache_dir) if cache_dir else PAGE_CACHE_DIR
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            self.logger.warning(f"Page cache disabled - cannot create {self.cache_dir}: {e}")
+            self.cache_dir = None
     
     def setup_logging(self):
         """Setup logging for PDF processing"""
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
     
-    def init_ocr(self, languages=['en']):
-        """Initialize OCR reader (lazy loading)"""
+    def init_ocr(self, languages=['en'], gpu=None, use_trt=None):
+        """Initialize OCR reader (lazy loading), on the GPU when CUDA is available"""
         try:
             if self.ocr_reader is None:
-                self.logger.info("Initializing EasyOCR...")
-                self.ocr_reader = easyocr.Reader(languages, gpu=False)
+                if gpu is None:
+                    gpu = _cuda_available()
+                if use_trt is None:
+                    use_trt = gpu and TRTOCR is not None and trt_available()
+                self.logger.info(f"Initializing EasyOCR ({'GPU' if gpu else 'CPU'})...")
+                self.ocr_reader = easyocr.Reader(languages, gpu=gpu, cudnn_benchmark=gpu)
+                if use_trt and TRTOCR:
+                    # FP16 TensorRT engines; falls back to the PyTorch models if the export fails
+                    TRTOCR(
+                        self.ocr_reader, batch_size=OCR_BATCH_SIZE,
+                        page_height=OCR_BATCH_HEIGHT, page_width=OCR_BATCH_WIDTH
+                    ).install()
+                if gpu:
+                    # Let cuDNN benchmark its kernels for the batch shape once, up front
+                    self.ocr_reader.readtext_batched(
+                        np.zeros((OCR_BATCH_SIZE, OCR_BATCH_HEIGHT, OCR_BATCH_WIDTH, 3), dtype=np.uint8),
+                        n_width=OCR_BATCH_WIDTH, n_height=OCR_BATCH_HEIGHT, batch_size=OCR_BATCH_SIZE
+                    )
                 self.logger.info("EasyOCR initialized successfully")
             return True
         except Exception as e:
             self.logger.error(f"Failed to initialize OCR: {e}")
             return False
     
-    def extract_text_from_pdf(self, pdf_path, use_ocr=False):
+    def extract_text_from_pdf(self, pdf_path, use_ocr=False, force_refresh=False, digest=None):
         """
         Extract text from PDF file
         
         Args:
             pdf_path (str): Path to PDF file
             use_ocr (bool): Whether to use OCR for text extraction
+            force_refresh (bool): Ignore cached pages and extract everything again
+            digest (str): file_digest() of the PDF, if the caller already has it
             
         Returns:
             str: Extracted text content
         """
         try:
             doc = fitz.open(pdf_path)
-            full_text = ""
+            try:
+                digest = digest or file_digest(pdf_path)
+                pages = self._load_cached_pages(digest, doc.page_count, use_ocr, force_refresh)
+                missing = [n for n, page in enumerate(pages) if page is None]
+                for page_num, page in zip(missing, self._extract_pages(doc, missing, use_ocr)):
+                    pages[page_num] = page
+                    self._cache_page(digest, page_num, use_ocr, page)
+            finally:
+                doc.close()
+            if missing:
+                self._prune_page_cache()
+            return "".join(pages).strip()
             
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
-                
-                # Try to extract text directly first
-                text = page.get_text()
-                
-                # If no text found or OCR is forced, use OCR
-                if (not text.strip() and use_ocr) or (use_ocr and len(text.strip()) < 50):
-                    self.logger.info(f"Using OCR for page {page_num + 1}")
-                    text = self._extract_text_with_ocr(page)
-                
-                if text.strip():
-                    full_text += f"\n\n--- Page {page_num + 1} ---\n"
-                    full_text += text
+        except Exception as e:
+            self.logger.error(f"Error extracting text from PDF: {e}")
+            return ""
+    
+    def extract_text_parallel(self, pdf_path, use_ocr=False, workers=None, progress_callback=None,
+                              force_refresh=False, digest=None):
+        """
+        Extract text from PDF file, splitting the pages across worker processes
+        
+        Args:
+            pdf_path (str): Path to PDF file
+            use_ocr (bool): Whether to use OCR for text extraction
+            workers (int): Number of worker processes (defaults to the CPU count)
+            progress_callback (callable): Called with (pages_done, total_pages) as ranges finish
+            force_refresh (bool): Ignore cached pages and extract everything again
+            digest (str): file_digest() of the PDF, if the caller already has it
             
-            doc.close()
-            return full_text.strip()
+        Returns:
+            str: Extracted text content, pages in document order
+        """
+        try:
+            with fitz.open(pdf_path) as doc:
+                page_count = doc.page_count
+            
+            # Only pages missing from the cache need extracting
+            digest = digest or file_digest(pdf_path)
+            pages = self._load_cached_pages(digest, page_count, use_ocr, force_refresh)
+            missing = [n for n, page in enumerate(pages) if page is None]
+            if not missing:
+                return "".join(pages).strip()
+            
+            workers = min(workers or os.cpu_count() or 1, len(missing))
+            # GPU OCR batches pages itself; one reader per process would only contend for the device
+            if len(missing) < PARALLEL_MIN_PAGES or workers <= 1 or (use_ocr and _cuda_available()):
+                return self.extract_text_from_pdf(pdf_path, use_ocr=use_ocr, force_refresh=force_refresh,
+                                                  digest=digest)
+            
+            # One contiguous run of missing pages per worker; each opens the document once
+            chunks = [missing[len(missing) * i // workers:len(missing) * (i + 1) // workers]
+                      for i in range(workers)]
+            pages_done = page_count - len(missing)
+            
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(_extract_page_range, pdf_path, chunks[i], use_ocr): i
+                    for i in range(workers)
+                }
+                for future in as_completed(futures):
+                    chunk = chunks[futures[future]]
+                    for page_num, page in zip(chunk, future.result()):
+                        pages[page_num] = page
+                        self._cache_page(digest, page_num, use_ocr, page)
+                    pages_done += len(chunk)
+                    if progress_callback:
+                        progress_callback(pages_done, page_count)
+            
+            self._prune_page_cache()
+            return "".join(pages).strip()
             
         except Exception as e:
-            self.logger.error(f"Error extracting text from PDF: {e}")
+            self.logger.error(f"Error extracting text from PDF in parallel: {e}")
             return ""
     
-    def _extract_text_with_ocr(self, page):
-        """Extract text from PDF page using OCR"""
+    def _extract_pages(self, doc, page_nums, use_ocr):
+        """
+        Extract the given pages of an open document, each prefixed with its page marker.
+        Returns one string per page number ("" for pages without text).
+        """
+        texts = {}
+        ocr_pages = []
+        for page_num in page_nums:
+            page = doc[page_num]
+            
+            # Try to extract text directly first
+            text = page.get_text("text", flags=TEXT_FLAGS)
+            
+            # Only pages without a usable text layer go to OCR (batched below)
+            if use_ocr and len(text.strip()) < OCR_MIN_TEXT_CHARS:
+                self.logger.info(f"Using OCR for page {page_num + 1}")
+                ocr_pages.append(page_num)
+            texts[page_num] = text
+        
+        for i in range(0, len(ocr_pages), OCR_BATCH_SIZE):
+            batch = ocr_pages[i:i + OCR_BATCH_SIZE]
+            for page_num, text in zip(batch, self._extract_text_with_ocr([doc[n] for n in batch])):
+                texts[page_num] = text
+        
+        pages = []
+        for page_num in page_nums:
+            text = texts[page_num]
+            pages.append(f"\n\n--- Page {page_num + 1} ---\n{text}" if text.strip() else "")
+        return pages
+    
+    def _page_cache_dir(self, digest):
+        """Cache directory for one document's pages in the current extraction format"""
+        return self.cache_dir / f"{digest}.v{PAGE_CACHE_FORMAT}"
+    
+    def _page_cache_path(self, digest, page_num, use_ocr):
+        """Cache file for one page's extracted text"""
+        return self._page_cache_dir(digest) / f"page_{page_num}.{'ocr' if use_ocr else 'text'}.txt"
+    
+    def _load_cached_pages(self, digest, page_count, use_ocr, force_refresh=False):
+        """Return cached page texts for a document, None for pages not cached yet"""
+        pages = [None] * page_count
+        if not self.cache_dir or force_refresh:
+            return pages
+        for page_num in range(page_count):
+            try:
+                with open(self._page_cache_path(digest, page_num, use_ocr), 'r', encoding='utf-8', newline='') as f:
+                    pages[page_num] = f.read()
+            except OSError:
+                pass
+        if any(page is not None for page in pages):
+            try:
+                os.utime(self._page_cache_dir(digest))  # Mark the document as recently used for pruning
+            except OSError:
+                pass
+        return pages
+    
+    def _prune_page_cache(self):
+        """Remove the least recently used documents' page directories beyond PAGE_CACHE_MAX_DOCUMENTS"""
+        if not self.cache_dir:
+            return
+        try:
+            documents = [entry for entry in os.scandir(self.cache_dir) if entry.is_dir(follow_symlinks=False)]
+            if len(documents) <= PAGE_CACHE_MAX_DOCUMENTS:
+                return
+            documents.sort(key=lambda entry: entry.stat(follow_symlinks=False).st_mtime, reverse=True)
+        except OSError as e:
+            self.logger.warning(f"Could not scan page cache: {e}")
+            return
+        for entry in documents[PAGE_CACHE_MAX_DOCUMENTS:]:
+            shutil.rmtree(entry.path, ignore_errors=True)
+    
+    def _cache_page(self, digest, page_num, use_ocr, text):
+        """Store one page's text (atomic replace, failures only logged)"""
+        if not self.cache_dir or (use_ocr and not text):
+            return  # An empty OCR page may be a failed OCR run; try it again next time
+        cache_path = self._page_cache_path(digest, page_num, use_ocr)
+        tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            cache_path.parent.mkdir(exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(text)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            self.logger.warning(f"Could not write page cache entry: {e}")
+    
+    def _extract_text_with_ocr(self, pages):
+        """Extract text from PDF pages using one batched OCR call; returns one string per page"""
         try:
             # Initialize OCR if not already done
             if not self.init_ocr():
-                return ""
-            
-            # Convert PDF page to image
-            mat = fitz.Matrix(2.0, 2.0)  # Increase resolution
-            pix = page.get_pixmap(matrix=mat)
-            img_data = pix.tobytes("png")
+                return [""] * len(pages)
             
-            # Convert to PIL Image
-            image = Image.open(io.BytesIO(img_data))
-            img_array = np.array(image)
+            # Render pages straight to HxWx3 RGB arrays (no PNG round trip);
+            # colorspace and alpha are fixed at render time so the samples never need converting
+            images = []
+            for page in pages:
+                zoom = self._ocr_render_zoom(page)
+                mat = fitz.Matrix(zoom, zoom)
+                pix = page.get_pixmap(matrix=mat, colorspace=fitz.csRGB, alpha=False)
+                images.append(np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n))
             
-            # Perform OCR
-            results = self.ocr_reader.readtext(img_array)
+            # Perform OCR; EasyOCR resizes every page to the common batch size
+            batch_results = self.ocr_reader.readtext_batched(
+                images, n_width=OCR_BATCH_WIDTH, n_height=OCR_BATCH_HEIGHT, batch_size=OCR_BATCH_SIZE
+            )
             
-            # Extract text from results
-            text_parts = []
-            for (bbox, text, confidence) in results:
-                if confidence > 0.5:  # Filter low confidence results
-                    text_parts.append(text)
+            # Flatten the (bbox, text, confidence) tuples of all pages into parallel arrays,
+            # then filter low confidence results with one vectorized comparison
+            counts = [len(results) for results in batch_results]
+            detections = [detection for results in batch_results for detection in results]
+            if not detections:
+                return [""] * len(pages)
+            confidences = np.fromiter((d[2] for d in detections), dtype=np.float64, count=len(detections))
+            texts = np.array([d[1] for d in detections], dtype=object)
+            page_ids = np.repeat(np.arange(len(counts)), counts)
             
-            return " ".join(text_parts)
+            keep = confidences > OCR_MIN_CONFIDENCE
+            texts = texts[keep]
+            bounds = np.searchsorted(page_ids[keep], np.arange(len(counts) + 1))
+            return [" ".join(texts[bounds[i]:bounds[i + 1]].tolist()) for i in range(len(counts))]
             
         except Exception as e:
             self.logger.error(f"OCR processing failed: {e}")
-            return ""
+            return [""] * len(pages)
+    
+    @staticmethod
+    def _ocr_render_zoom(page):
+        """
+        Smallest zoom at which the page covers the OCR batch size: EasyOCR resizes every page
+        to OCR_BATCH_WIDTH x OCR_BATCH_HEIGHT, so pixels rendered beyond that are thrown away
+        """
+        rect = page.rect
+        if rect.width <= 0 or rect.height <= 0:
+            return 1.0
+        zoom = max(OCR_BATCH_WIDTH / rect.width, OCR_BATCH_HEIGHT / rect.height)
+        return min(zoom, OCR_MAX_RENDER_ZOOM)
     
     def extract_questions(self, text):
         """
@@ -111,61 +455,50 @@ class PDFProcessor:
         Returns:
             list: List of extracted questions
         """
-        questions = []
-        
+        # Candidates in pattern order, each with the word count it must exceed
         # Pattern 1: Lines starting with "Question" followed by number/letter
-        pattern1 = re.compile(r'^(?:Question|Q\.?)\s*(?:\d+|[a-zA-Z])[\.\)\:]\s*(.+?)(?=(?:Question|Q\.?|\n\n|\Z))', 
-                             re.MULTILINE | re.DOTALL | re.IGNORECASE)
+        candidates = [(match.group(1), 0) for match in _NUMBERED_QUESTION_RE.finditer(text)]
         
-        matches1 = pattern1.findall(text)
-        for match in matches1:
-            clean_question = self._clean_question_text(match)
-            if clean_question:
-                questions.append(clean_question)
-        
-        # Pattern 2: Lines ending with question mark
-        pattern2 = re.compile(r'([^.!?]*\?)', re.MULTILINE)
-        matches2 = pattern2.findall(text)
-        
-        for match in matches2:
-            clean_question = self._clean_question_text(match)
-            if clean_question and len(clean_question.split()) > 3:  # Filter short fragments
-                # Check if not already added
-                if not any(clean_question.lower() in existing.lower() or 
-                          existing.lower() in clean_question.lower() 
-                          for existing in questions):
-                    questions.append(clean_question)
+        # Pattern 2: Lines ending with question mark (filter short fragments)
+        candidates.extend((fragment, 3) for fragment in _question_mark_fragments(text))
         
         # Pattern 3: Common question starters
-        question_starters = [
-            r'\b(?:What|How|Why|When|Where|Who|Which|Can|Could|Would|Should|Do|Does|Did|Is|Are|Will|Have|Has)\b.*\?',
-            r'\bExplain\b.*[\.?]',
-            r'\bDescribe\b.*[\.?]',
-            r'\bDiscuss\b.*[\.?]',
-            r'\bAnalyze\b.*[\.?]',
-            r'\bCompare\b.*[\.?]',
-        ]
+        candidates.extend((match.group(1), 4) for match in _QUESTION_STARTER_RE.finditer(text))
         
-        for starter_pattern in question_starters:
-            pattern = re.compile(starter_pattern, re.IGNORECASE | re.MULTILINE)
-            matches = pattern.findall(text)
-            
-            for match in matches:
-                clean_question = self._clean_question_text(match)
-                if clean_question and len(clean_question.split()) > 4:
-                    # Check if not already added
-                    if not any(clean_question.lower() in existing.lower() or 
-                              existing.lower() in clean_question.lower() 
-                              for existing in questions):
-                        questions.append(clean_question)
-        
-        # Remove duplicates and filter
+        # One dedupe pass: exact matches by set lookup, near-duplicates (one question mostly
+        # inside another) by counting shared shingles through an inverted index
         unique_questions = []
-        for q in questions:
-            if len(q.split()) >= 5 and len(q) <= 500:  # Reasonable length questions
-                unique_questions.append(q)
+        seen_exact = set()
+        shingle_index = {}  # shingle -> indices of kept questions containing it
+        shingle_counts = []  # number of shingles of each kept question
+        kept = 0
+        for raw, min_words in candidates:
+            clean_question = self._clean_question_text(raw)
+            words = clean_question.lower().split()
+            if len(words) <= min_words:
+                continue
+            
+            key = " ".join(words)
+            if key in seen_exact:
+                continue
+            shingles = _shingles(words)
+            shared = Counter(i for s in shingles for i in shingle_index.get(s, ()))
+            if any(n >= NEAR_DUPLICATE_OVERLAP * min(len(shingles), shingle_counts[i])
+                   for i, n in shared.items()):
+                continue
+            
+            seen_exact.add(key)
+            for s in shingles:
+                shingle_index.setdefault(s, []).append(kept)
+            shingle_counts.append(len(shingles))
+            kept += 1
+            
+            if len(words) >= 5 and len(clean_question) <= 500:  # Reasonable length questions
+                unique_questions.append(clean_question)
+                if len(unique_questions) == MAX_QUESTIONS:
+                    break  # Later candidates cannot change the first MAX_QUESTIONS
         
-        return unique_questions[:20]  # Limit to 20 questions
+        return unique_questions
     
     def _clean_question_text(self, text):
         """Clean and format question text"""
@@ -173,14 +506,14 @@ class PDFProcessor:
             return ""
         
         # Remove excessive whitespace
-        cleaned = re.sub(r'\s+', ' ', text.strip())
+        cleaned = _WHITESPACE_RE.sub(' ', text.strip())
         
         # Remove page markers
-        cleaned = re.sub(r'--- Page \d+ ---', '', cleaned)
+        cleaned = _PAGE_MARKER_RE.sub('', cleaned)
         
         # Remove leading numbers/letters if they look like question numbering
-        cleaned = re.sub(r'^\d+[\.\)]\s*', '', cleaned)
-        cleaned = re.sub(r'^[a-zA-Z][\.\)]\s*', '', cleaned)
+        cleaned = _LEADING_NUMBER_RE.sub('', cleaned)
+        cleaned = _LEADING_LETTER_RE.sub('', cleaned)
         
         # Ensure proper capitalization
         cleaned = cleaned.strip()
@@ -189,7 +522,8 @@ class PDFProcessor:
         
         # Ensure ends with question mark or period
         if cleaned and not cleaned.endswith(('?', '.')):
-            if any(word in cleaned.lower() for word in ['what', 'how', 'why', 'when', 'where', 'who', 'which']):
+            first_word = cleaned.split(None, 1)[0].lower().rstrip(',:;')
+            if first_word in _QUESTION_WORDS:
                 cleaned += '?'
             else:
                 cleaned += '.'
@@ -208,7 +542,7 @@ class PDFProcessor:
             list: List of text chunks
         """
         # Split by sentences
-        sentences = re.split(r'[.!?]+', text)
+        sentences = _split_sentences(text)
         
         chunks = []
         current_chunk = ""
@@ -256,12 +590,14 @@ class PDFProcessor:
                 'has_text': False
             }
             
-            # Check if PDF has extractable text
+            # Check if PDF has extractable text (first 3 pages, stopping once enough is seen)
             text_length = 0
-            for page_num in range(min(3, doc.page_count)):  # Check first 3 pages
+            for page_num in range(min(3, doc.page_count)):
                 page = doc[page_num]
-                text = page.get_text()
+                text = page.get_text("text", flags=TEXT_FLAGS)
                 text_length += len(text.strip())
+                if text_length > 100:
+                    break
             
             info['has_text'] = text_length > 100
             doc.close()
@@ -25,33 +25,93 @@ except ImportError:
         from standalone_whisper import StandaloneWhisperApp, TorchNumpyAdapter
 
 
-def get_onnx_session_with_fallback(path):
+def create_session_options(intra_op_num_threads=None, low_memory=False):
     """
-    Create ONNX Runtime session with QNN provider fallback to CPU.
-    More robust for PyInstaller executables.
+    Build SessionOptions tuned for Whisper inference on this host.
+    ORT defaults to basic graph optimization and one intra-op thread per core,
+    which oversubscribes small machines; cap the pool at 4 threads.
+    With low_memory, the CPU arena and memory-pattern planning are disabled:
+    peak RAM drops sharply at the cost of slower allocations per run.
     """
+    onnxruntime.set_default_logger_severity(3)
+    
     options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+    options.intra_op_num_threads = intra_op_num_threads or min(4, os.cpu_count() or 1)
+    options.enable_mem_pattern = not low_memory
+    options.enable_cpu_mem_arena = not low_memory
+    options.add_session_config_entry('session.use_env_allocators', '1')
+    # Fuse the encoder's erf-based Gelu into the faster tanh approximation
+    options.add_session_config_entry('optimization.enable_gelu_approximation', '1')
+    return options
+
+
+def ensure_quantized(model_path):
+    """
+    Return the path of an int8 dynamically quantized copy of an ONNX model,
+    creating it next to the original on first use. Only the MatMul/Attention/Gemm
+    weights are quantized. Falls back to the FP32 model if quantization fails.
+    """
+    quantized_path = os.path.splitext(model_path)[0] + '.int8.onnx'
+    if os.path.exists(quantized_path):
+        return quantized_path
     
-    # First, try QNN provider (for Snapdragon X Elite optimization)
     try:
-        session = onnxruntime.InferenceSession(
-            path,
-            sess_options=options,
-            providers=["QNNExecutionProvider"],
-            provider_options=[
-                {
-                    "backend_path": "QnnHtp.dll",
-                    "htp_performance_mode": "burst",
-                    "high_power_saver": "sustained_high_performance",
-                    "enable_htp_fp16_precision": "1",
-                    "htp_graph_finalization_optimization_mode": "3",
-                }
-            ],
-        )
-        return session
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        
+        tmp_path = quantized_path + '.tmp'
+        quantize_dynamic(model_path, tmp_path, weight_type=QuantType.QInt8,
+                         op_types_to_quantize=['MatMul', 'Attention', 'Gemm'])
+        os.replace(tmp_path, quantized_path)
+        print(f"✅ Quantized {os.path.basename(model_path)} to int8")
+        return quantized_path
     except Exception as e:
-        # Fall back to CPU provider silently
-        pass
+        print(f"⚠️  int8 quantization skipped for {os.path.basename(model_path)}: {e}")
+        return model_path
+
+
+def accelerator_available():
+    """True when ONNX Runtime can run the models on an NPU/GPU, which want the FP32 graph"""
+    providers = onnxruntime.get_available_providers()
+    return any(p in providers for p in ('QNNExecutionProvider', 'CUDAExecutionProvider', 'DmlExecutionProvider'))
+
+
+def get_onnx_session_with_fallback(path, session_options=None, providers=None):
+    """
+    Create ONNX Runtime session with QNN provider fallback to CPU.
+    More robust for PyInstaller executables.
+    An explicit providers list (e.g. to pin a model to CUDA or CPU) replaces the QNN attempt.
+    """
+    options = session_options or onnxruntime.SessionOptions()
+    
+    if providers:
+        try:
+            return onnxruntime.InferenceSession(path, sess_options=options, providers=providers)
+        except Exception as e:
+            # Fall back to CPU provider below
+            pass
+    else:
+        # First, try QNN provider (for Snapdragon X Elite optimization)
+        try:
+            session = onnxruntime.InferenceSession(
+                path,
+                sess_options=options,
+                providers=["QNNExecutionProvider"],
+                provider_options=[
+                    {
+                        "backend_path": "QnnHtp.dll",
+                        "htp_performance_mode": "burst",
+                        "high_power_saver": "sustained_high_performance",
+                        "enable_htp_fp16_precision": "1",
+                        "htp_graph_finalization_optimization_mode": "3",
+                    }
+                ],
+            )
+            return session
+        except Exception as e:
+            # Fall back to CPU provider silently
+            pass
     
     # Fall back to CPU provider
     try:
@@ -69,8 +129,8 @@ def get_onnx_session_with_fallback(path):
 
 class StandaloneONNXEncoder:
     """Standalone ONNX encoder wrapper"""
-    def __init__(self, encoder_path):
-        self.session = get_onnx_session_with_fallback(encoder_path)
+    def __init__(self, encoder_path, session_options=None, providers=None):
+        self.session = get_onnx_session_with_fallback(encoder_path, session_options, providers)
 
     def __call__(self, audio):
         try:
@@ -89,8 +149,8 @@ class StandaloneONNXEncoder:
 
 class StandaloneONNXDecoder:
     """Standalone ONNX decoder wrapper"""
-    def __init__(self, decoder_path):
-        self.session = get_onnx_session_with_fallback(decoder_path)
+    def __init__(self, decoder_path, session_options=None, providers=None):
+        self.session = get_onnx_session_with_fallback(decoder_path, session_options, providers)
 
     def __call__(self, x, index, k_cache_cross, v_cache_cross, k_cache_self, v_cache_self):
         try:
@@ -122,27 +182,90 @@ class StandaloneWhisperModel:
     Standalone Whisper model that works without AI Hub dependencies.
     Complete replacement for WhisperBaseEnONNX and WhisperApp.
     """
-    def __init__(self, encoder_path, decoder_path):
+    def __init__(self, encoder_path, decoder_path, session_options=None,
+                 encoder_providers=None, decoder_providers=None):
         # Create ONNX model wrappers (use directly, no TorchNumpyAdapter needed)
-        self.encoder = StandaloneONNXEncoder(encoder_path)
-        self.decoder = StandaloneONNXDecoder(decoder_path)
+        self.encoder = StandaloneONNXEncoder(encoder_path, session_options, encoder_providers)
+        self.decoder = StandaloneONNXDecoder(decoder_path, session_options, decoder_providers)
         
         # Model parameters for Whisper Base EN
         self.num_decoder_blocks = 6
         self.num_decoder_heads = 8
         self.attention_dim = 512
+        
+        # One app per model so the mel filterbank is loaded once, not on every call
+        self.app = StandaloneWhisperApp(
+            encoder=self.encoder,
+            decoder=self.decoder,
+            num_decoder_blocks=self.num_decoder_blocks,
+            num_decoder_heads=self.num_decoder_heads,
+            attention_dim=self.attention_dim,
+        )
+
+    @property
+    def mel_filter(self) -> np.ndarray:
+        """Mel filterbank (N_MELS x N_FFT // 2 + 1) matching the encoder's input features"""
+        return self.app.mel_filter
 
     def transcribe(self, audio: np.ndarray, sample_rate: int) -> str:
         """Transcribe audio to text"""
         try:
-            app = StandaloneWhisperApp(
-                encoder=self.encoder,
-                decoder=self.decoder,
-                num_decoder_blocks=self.num_decoder_blocks,
-                num_decoder_heads=self.num_decoder_heads,
-                attention_dim=self.attention_dim,
+            return self.app.transcribe(audio, sample_rate)
+        except Exception as e:
+            print(f"❌ Error during transcription: {e}")
+            sys.stdout.flush()
+            return ""
+
+    def encode(self, audio: np.ndarray, sample_rate: int) -> list:
+        """
+        Run only the encoder: cross-attention caches for each 30 s chunk of the audio.
+        Pair with decode() to pipeline the two halves on different devices/threads.
+        """
+        return [
+            self.encoder(self.app._log_mel_spectrogram(chunk))
+            for chunk in self.app._chunk_and_resample_audio(audio, sample_rate)
+        ]
+
+    def decode(self, encoded: list) -> str:
+        """Run only the decoder over the output of encode()"""
+        try:
+            return " ".join(
+                self.app.decode(k_cache_cross, v_cache_cross)
+                for k_cache_cross, v_cache_cross in encoded
             )
-            return app.transcribe(audio, sample_rate)
+        except Exception as e:
+            print(f"❌ Error during transcription: {e}")
+            sys.stdout.flush()
+            return ""
+
+    def decode_with_prompt(self, encoded: list, prompt_tokens: list = None) -> tuple:
+        """
+        Decode the output of encode() continuing from prompt_tokens (typically the
+        previous window's tokens). Returns (text, tokens of the last chunk).
+        """
+        try:
+            texts = []
+            for k_cache_cross, v_cache_cross in encoded:
+                prompt_tokens = self.app.decode_tokens(k_cache_cross, v_cache_cross, prompt_tokens)
+                texts.append(self.app.tokens_to_text(prompt_tokens))
+            return " ".join(texts), prompt_tokens or []
+        except Exception as e:
+            print(f"❌ Error during transcription: {e}")
+            sys.stdout.flush()
+            return "", []
+
+    def transcribe_batch(self, audios, sample_rate: int) -> list:
+        """
+        Transcribe several utterances with the shared app, one encoder run each.
+        The exported encoder has a fixed batch of 1 and its cross-attention
+        caches carry no batch axis, so inputs cannot be stacked into one run.
+        """
+        return [self.transcribe(audio, sample_rate) for audio in audios]
+
+    def transcribe_mel(self, mel: np.ndarray) -> str:
+        """Transcribe a precomputed (1, 80, 3000) log-Mel spectrogram to text"""
+        try:
+            return self.app.transcribe_mel(mel)
         except Exception as e:
             print(f"❌ Error during transcription: {e}")
             sys.stdout.flush()
@@ -29,7 +29,9 @@ TOKEN_BLANK = 220  # " "
 TOKEN_NO_TIMESTAMP = 50362
 TOKEN_TIMESTAMP_BEGIN = 50363
 TOKEN_NO_SPEECH = 50361
+TOKEN_SOT_PREV = 50360  # Start of previous-text prompt
 NO_SPEECH_THR = 0.6
+MAX_PROMPT_TOKENS = 8  # Previous-window tokens fed back as the decoder prompt
 
 # Non-speech tokens to suppress
 NON_SPEECH_TOKENS = [
@@ -205,11 +207,40 @@ class StandaloneWhisperApp:
 
     def _transcribe_single_chunk(self, audio: np.ndarray) -> str:
         """Transcribe an audio chunk to text."""
-        mel_input = self._log_mel_spectrogram(audio)
+        return self.transcribe_mel(self._log_mel_spectrogram(audio))
+
+    def transcribe_mel(self, mel_input: np.ndarray) -> str:
+        """
+        Transcribe a precomputed log-Mel spectrogram of shape (1, N_MELS, MELS_AUDIO_LEN) to text.
+        """
         k_cache_cross, v_cache_cross = self.encoder(mel_input)
-        
+        return self.decode(k_cache_cross, v_cache_cross)
+
+    def decode(self, k_cache_cross: np.ndarray, v_cache_cross: np.ndarray) -> str:
+        """
+        Greedy-decode text from the encoder's cross-attention caches.
+        """
+        return self.tokens_to_text(self.decode_tokens(k_cache_cross, v_cache_cross))
+
+    def decode_tokens(
+        self,
+        k_cache_cross: np.ndarray,
+        v_cache_cross: np.ndarray,
+        prompt_tokens: Optional[list[int]] = None,
+    ) -> list[int]:
+        """
+        Greedy-decode tokens from the encoder's cross-attention caches.
+        If prompt_tokens is given (e.g. the previous window's tokens), its tail is
+        forced in front of TOKEN_SOT so decoding continues the earlier text.
+        """
+        forced = [TOKEN_SOT]
+        if prompt_tokens:
+            prompt = [t for t in prompt_tokens if t < TOKEN_EOT][-MAX_PROMPT_TOKENS:]
+            forced = [TOKEN_SOT_PREV, *prompt, TOKEN_SOT]
+        prompt_len = len(forced) - 1
+
         # Start decoding
-        x = np.array([[TOKEN_SOT]])
+        x = np.array([[forced[0]]])
         decoded_tokens = [TOKEN_SOT]
         sample_len = self.mean_decode_len
         
@@ -239,16 +270,22 @@ class StandaloneWhisperApp:
             k_cache_self = decoder_out[1]
             v_cache_self = decoder_out[2]
 
+            if i < prompt_len:
+                # Still feeding the prompt, nothing to sample yet
+                x = np.array([[forced[i + 1]]])
+                continue
+            step = i - prompt_len
+
             logits = logits[0, -1]  # consider only the last token
 
             # Apply filters
-            if i == 0:
+            if step == 0:
                 logits[[TOKEN_EOT, TOKEN_BLANK]] = -np.inf
             logits[NON_SPEECH_TOKENS] = -np.inf
 
             logits, logprobs = self._apply_timestamp_rules(logits, decoded_tokens)
 
-            if i == 0:
+            if step == 0:
                 # detect no_speech
                 no_speech_prob = np.exp(logprobs[TOKEN_NO_SPEECH])
                 if no_speech_prob > NO_SPEECH_THR:
@@ -261,12 +298,15 @@ class StandaloneWhisperApp:
             x = np.array([[next_token]])
             decoded_tokens.append(int(next_token))
 
-        # Decode tokens to text
+        return decoded_tokens[1:]  # remove TOKEN_SOT
+
+    def tokens_to_text(self, tokens: list[int]) -> str:
+        """Convert decoded tokens to text"""
         try:
             tokenizer = whisper.decoding.get_tokenizer(
                 multilingual=False, language="en", task="transcribe"
             )
-            text = tokenizer.decode(decoded_tokens[1:])  # remove TOKEN_SOT
+            text = tokenizer.decode(tokens)
             return text.strip()
         except Exception as e:
             print(f"⚠ Warning: Could not decode tokens properly: {e}")
@@ -274,12 +314,12 @@ class StandaloneWhisperApp:
             try:
                 import tiktoken
                 encoding = tiktoken.get_encoding("gpt2")
-                text = encoding.decode(decoded_tokens[1:])  # remove TOKEN_SOT
+                text = encoding.decode(tokens)
                 return text.strip()
             except Exception as e2:
                 print(f"⚠ Warning: Fallback tokenizer also failed: {e2}")
                 # Last resort: return token count info
-                return f"[Decoded {len(decoded_tokens)-1} tokens but cannot convert to text]"
+                return f"[Decoded {len(tokens)} tokens but cannot convert to text]"
 
     def _log_mel_spectrogram(self, audio_np: np.ndarray) -> np.ndarray:
         """Compute the log-Mel spectrogram"""
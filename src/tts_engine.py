@@ -8,20 +8,115 @@ import pygame
 import threading
 import queue
 import tempfile
+import io
+import wave
 import os
 import time
 from pathlib import Path
 import logging
 
+# Optional NumPy (and numba JIT) for trimming silence off synthesized speech
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import numba
+    NUMBA_AVAILABLE = np is not None
+except ImportError:
+    numba = None
+    NUMBA_AVAILABLE = False
+
+# int16 amplitude treated as silence (0.001 of full scale), and quiet kept around the speech
+TTS_SILENCE_THRESHOLD = 33
+TTS_SILENCE_PAD_SECONDS = 0.05
+
+# Mixer output format: pyttsx3 voices are mono, so a mono mixer at the synth's rate
+# plays them without upmixing; 256 frames is ~12 ms of buffering at 22.05 kHz
+TTS_MIXER_RATE = 22050
+TTS_MIXER_CHANNELS = 1
+TTS_MIXER_BUFFER = 256
+
+# Extra wait while the mixer drains its last buffer after a sound's nominal end
+PLAYBACK_END_GRACE = 0.01
+
+# pyttsx3 needs a real file to render into; use RAM-backed storage for it where the OS has one
+TTS_SCRATCH_DIR = '/dev/shm' if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else None
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True, fastmath=True)
+    def _silence_bounds_kernel(samples, threshold):
+        n = samples.shape[0]
+        start = 0
+        while start < n and -threshold <= samples[start] <= threshold:
+            start += 1
+        stop = n
+        while stop > start and -threshold <= samples[stop - 1] <= threshold:
+            stop -= 1
+        return start, stop
+
+
+def _silence_bounds(samples, threshold):
+    """Return [start, stop) of the span between the first and last sample louder than threshold"""
+    if NUMBA_AVAILABLE:
+        return _silence_bounds_kernel(samples, threshold)
+    
+    # NumPy fallback: one boolean pass instead of abs(), which overflows at -32768
+    loud = np.flatnonzero((samples > threshold) | (samples < -threshold))
+    if loud.size == 0:
+        return 0, 0
+    return int(loud[0]), int(loud[-1]) + 1
+
+
+def _trim_wav_silence(wav_bytes):
+    """Drop leading/trailing silence from 16-bit PCM WAV bytes so playback starts on speech"""
+    if np is None:
+        return wav_bytes
+    
+    try:
+        with wave.open(io.BytesIO(wav_bytes), 'rb') as src:
+            params = src.getparams()
+            frames = src.readframes(params.nframes)
+    except (wave.Error, EOFError):
+        return wav_bytes  # Not plain PCM WAV; play it as is
+    if params.sampwidth != 2 or not frames:
+        return wav_bytes
+    
+    channels = params.nchannels
+    start, stop = _silence_bounds(np.frombuffer(frames, dtype=np.int16), TTS_SILENCE_THRESHOLD)
+    if start >= stop:
+        return wav_bytes  # All silence; leave it alone
+    
+    pad = int(TTS_SILENCE_PAD_SECONDS * params.framerate)
+    first = max(0, start // channels - pad)
+    last = min(params.nframes, (stop - 1) // channels + 1 + pad)
+    if first == 0 and last == params.nframes:
+        return wav_bytes
+    
+    out = io.BytesIO()
+    with wave.open(out, 'wb') as dst:
+        dst.setnchannels(channels)
+        dst.setsampwidth(2)
+        dst.setframerate(params.framerate)
+        dst.writeframes(frames[first * channels * 2:last * channels * 2])
+    return out.getvalue()
+
 class TTSEngine:
-    def __init__(self):
+    def __init__(self, mixer_channels=TTS_MIXER_CHANNELS):
         self.engine = None
+        self.mixer_channels = mixer_channels  # 2 only if some output genuinely needs stereo
         self.pygame_initialized = False
         self.current_audio_file = None
+        self.current_sound = None
+        self.current_channel = None
         self.is_playing = False
         self.is_paused = False
         self.playback_thread = None
         self.audio_queue = queue.Queue()
+        self.engine_lock = threading.Lock()  # pyttsx3 is not safe to drive from two threads
+        self._playback_changed = threading.Event()  # Set on pause/resume/stop to wake play_buffer
         self.setup_logging()
         
         self.init_engine()
@@ -62,14 +157,43 @@ class TTSEngine:
     def init_pygame(self):
         """Initialize pygame for audio playback"""
         try:
-            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+            # Open the device at the synth's native format so sounds need no resampling
+            pygame.mixer.pre_init(
+                frequency=self._detect_synth_rate(),
+                size=-16,
+                channels=self.mixer_channels,
+                buffer=TTS_MIXER_BUFFER
+            )
+            pygame.mixer.init()
             self.pygame_initialized = True
-            self.logger.info("Pygame audio mixer initialized")
+            self.logger.info(f"Pygame audio mixer initialized: {pygame.mixer.get_init()}")
             return True
         except Exception as e:
             self.logger.error(f"Failed to initialize pygame: {e}")
             return False
     
+    def _detect_synth_rate(self):
+        """Sample rate the TTS voice renders at (pyttsx3 has no API for it, so probe once)"""
+        if not self.engine:
+            return TTS_MIXER_RATE
+        
+        fd, filename = tempfile.mkstemp(suffix='.wav', prefix='tts_probe_', dir=TTS_SCRATCH_DIR)
+        os.close(fd)
+        try:
+            with self.engine_lock:
+                self.engine.save_to_file("a", filename)
+                self.engine.runAndWait()
+            with wave.open(filename, 'rb') as probe:
+                return probe.getframerate()
+        except Exception as e:
+            self.logger.warning(f"Could not detect TTS sample rate, using {TTS_MIXER_RATE} Hz: {e}")
+            return TTS_MIXER_RATE
+        finally:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+    
     def get_available_voices(self):
         """Get list of available TTS voices"""
         if not self.engine:
@@ -153,20 +277,19 @@ class TTSEngine:
             return None
         
         try:
-            # Set speed
-            self.set_speed(speed)
-            
-            # Generate filename if not provided
+            # Generate a unique filename if not provided, so concurrent calls never collide
             if not filename:
-                temp_dir = tempfile.gettempdir()
-                filename = os.path.join(temp_dir, f"tts_audio_{int(time.time())}.wav")
-            
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(filename), exist_ok=True)
+                with tempfile.NamedTemporaryFile(prefix="tts_audio_", suffix=".wav", delete=False) as f:
+                    filename = f.name
+            elif os.path.dirname(filename):
+                # Ensure caller-supplied directory exists
+                os.makedirs(os.path.dirname(filename), exist_ok=True)
             
             # Convert text to speech and save to file
-            self.engine.save_to_file(text, filename)
-            self.engine.runAndWait()
+            with self.engine_lock:
+                self.set_speed(speed)
+                self.engine.save_to_file(text, filename)
+                self.engine.runAndWait()
             
             if os.path.exists(filename):
                 self.logger.info(f"Audio file created: {filename}")
@@ -179,6 +302,90 @@ class TTSEngine:
             self.logger.error(f"Error creating audio file: {e}")
             return None
     
+    def text_to_audio_files(self, texts, filenames=None, speed=1.0):
+        """
+        Convert several texts to audio files in a single engine run
+        Args:
+            texts (list): Texts to convert
+            filenames (list): Output filenames, one per text (optional)
+            speed (float): Speaking rate multiplier
+        Returns:
+            list: Path to each generated audio file, or None where synthesis failed
+        """
+        if not self.engine or not texts:
+            return [None] * len(texts)
+        
+        try:
+            if not filenames:
+                filenames = []
+                for _ in texts:
+                    with tempfile.NamedTemporaryFile(prefix="tts_audio_", suffix=".wav", delete=False) as f:
+                        filenames.append(f.name)
+            
+            # Queue every utterance, then start/finalize the synth session once for all of them
+            with self.engine_lock:
+                self.set_speed(speed)
+                for text, filename in zip(texts, filenames):
+                    self.engine.save_to_file(text, filename)
+                self.engine.runAndWait()
+            
+            created = [
+                filename if os.path.exists(filename) and os.path.getsize(filename) > 0 else None
+                for filename in filenames
+            ]
+            self.logger.info(f"Created {sum(1 for f in created if f)}/{len(texts)} audio files in one engine run")
+            return created
+            
+        except Exception as e:
+            self.logger.error(f"Error creating audio files: {e}")
+            return [None] * len(texts)
+    
+    def text_to_wav_bytes(self, text, speed=1.0):
+        """
+        Convert text to WAV audio held in memory
+        Args:
+            text (str): Text to convert
+            speed (float): Speaking rate multiplier
+        Returns:
+            bytes: WAV file contents, or None on failure
+        """
+        return self.texts_to_wav_bytes([text], speed)[0]
+    
+    def texts_to_wav_bytes(self, texts, speed=1.0):
+        """
+        Convert several texts to in-memory WAV audio in a single engine run
+        Args:
+            texts (list): Texts to convert
+            speed (float): Speaking rate multiplier
+        Returns:
+            list: WAV file contents for each text, or None where synthesis failed
+        """
+        # pyttsx3 can only render to a file: read each scratch WAV once, then drop it
+        filenames = []
+        try:
+            for _ in texts:
+                fd, filename = tempfile.mkstemp(suffix='.wav', prefix='tts_audio_', dir=TTS_SCRATCH_DIR)
+                os.close(fd)
+                filenames.append(filename)
+            
+            results = []
+            for filename in self.text_to_audio_files(texts, filenames, speed):
+                if filename is None:
+                    results.append(None)
+                    continue
+                with open(filename, 'rb') as f:
+                    results.append(_trim_wav_silence(f.read()))
+            return results
+        except Exception as e:
+            self.logger.error(f"Error reading synthesized audio: {e}")
+            return [None] * len(texts)
+        finally:
+            for filename in filenames:
+                try:
+                    os.remove(filename)
+                except OSError:
+                    pass
+    
     def speak_text_direct(self, text, speed=1.0):
         """
         Speak text directly without saving to file
@@ -190,9 +397,10 @@ class TTSEngine:
             return
         
         try:
-            self.set_speed(speed)
-            self.engine.say(text)
-            self.engine.runAndWait()
+            with self.engine_lock:
+                self.set_speed(speed)
+                self.engine.say(text)
+                self.engine.runAndWait()
         except Exception as e:
             self.logger.error(f"Error speaking text: {e}")
     
@@ -227,14 +435,103 @@ class TTSEngine:
             self.logger.error(f"Error playing audio file: {e}")
             return False
     
+    def play_audio_buffer(self, audio_data):
+        """
+        Play in-memory WAV audio using pygame
+        Args:
+            audio_data (bytes): WAV file contents
+        Returns:
+            bool: Success status
+        """
+        if not self.pygame_initialized:
+            self.logger.error("Pygame not initialized")
+            return False
+        
+        try:
+            # Stop current playback if any
+            self.stop_playback()
+            
+            # Decode from memory and play on a mixer channel (keep the Sound referenced while it plays)
+            self.current_sound = pygame.mixer.Sound(file=io.BytesIO(audio_data))
+            self.current_channel = self.current_sound.play()
+            
+            self.is_playing = True
+            self.is_paused = False
+            
+            self.logger.info(f"Started playing {len(audio_data)} bytes from memory")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error playing audio buffer: {e}")
+            return False
+    
+    def play_buffer(self, audio_data, callback=None):
+        """
+        Play in-memory WAV audio and block until playback completes
+        Args:
+            audio_data (bytes): WAV file contents
+            callback (function): Callback function when playback completes
+        """
+        try:
+            if not self.play_audio_buffer(audio_data):
+                if callback:
+                    callback(False, "Failed to play audio")
+                return
+            
+            # Wait for playback to complete
+            sound = self.current_sound
+            self._wait_for_playback_end(sound)
+            
+            # Clean up (unless another utterance has already replaced this one)
+            if self.current_sound is sound:
+                self.stop_playback()
+            
+            if callback:
+                callback(True, "Playback completed")
+                
+        except Exception as e:
+            self.logger.error(f"Error in buffer playback: {e}")
+            if callback:
+                callback(False, str(e))
+    
+    def _wait_for_playback_end(self, sound):
+        """
+        Block until `sound` finishes, is stopped or is replaced. Sleeps until the sound's
+        known end time instead of polling; pause/resume/stop wake it to re-plan.
+        """
+        deadline = time.monotonic() + sound.get_length()
+        while True:
+            self._playback_changed.clear()
+            if self.current_sound is not sound:
+                return
+            
+            if self.is_paused:
+                # The end moves back by however long playback stays paused
+                paused_at = time.monotonic()
+                self._playback_changed.wait()
+                deadline += time.monotonic() - paused_at
+                continue
+            
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                self._playback_changed.wait(remaining)
+            elif self.current_channel is not None and self.current_channel.get_busy():
+                self._playback_changed.wait(PLAYBACK_END_GRACE)
+            else:
+                return
+    
     def pause_playback(self):
         """Pause current audio playback"""
         if not self.pygame_initialized or not self.is_playing:
             return False
         
         try:
-            pygame.mixer.music.pause()
+            if self.current_channel:
+                self.current_channel.pause()
+            else:
+                pygame.mixer.music.pause()
             self.is_paused = True
+            self._playback_changed.set()
             self.logger.info("Audio playback paused")
             return True
         except Exception as e:
@@ -247,8 +544,12 @@ class TTSEngine:
             return False
         
         try:
-            pygame.mixer.music.unpause()
+            if self.current_channel:
+                self.current_channel.unpause()
+            else:
+                pygame.mixer.music.unpause()
             self.is_paused = False
+            self._playback_changed.set()
             self.logger.info("Audio playback resumed")
             return True
         except Exception as e:
@@ -262,6 +563,10 @@ class TTSEngine:
         
         try:
             pygame.mixer.music.stop()
+            if self.current_channel:
+                self.current_channel.stop()
+            self.current_channel = None
+            self.current_sound = None
             self.is_playing = False
             self.is_paused = False
             
@@ -273,6 +578,7 @@ class TTSEngine:
                     pass  # Ignore errors when cleaning up temp files
             
             self.current_audio_file = None
+            self._playback_changed.set()
             self.logger.info("Audio playback stopped")
             return True
         except Exception as e:
@@ -285,7 +591,11 @@ class TTSEngine:
             return False
         
         try:
-            return pygame.mixer.music.get_busy() and not self.is_paused
+            if self.current_channel:
+                busy = self.current_channel.get_busy()
+            else:
+                busy = pygame.mixer.music.get_busy()
+            return busy and not self.is_paused
         except:
             return False
     
@@ -311,29 +621,15 @@ class TTSEngine:
         """
         def async_speak():
             try:
-                # Generate audio file
-                audio_file = self.text_to_audio_file(text, speed=speed)
-                if not audio_file:
+                # Generate audio in memory
+                audio_data = self.text_to_wav_bytes(text, speed=speed)
+                if not audio_data:
                     if callback:
                         callback(False, "Failed to generate audio")
                     return
                 
-                # Play the audio file
-                success = self.play_audio_file(audio_file)
-                if not success:
-                    if callback:
-                        callback(False, "Failed to play audio")
-                    return
-                
-                # Wait for playback to complete
-                while self.is_playing_audio():
-                    time.sleep(0.1)
-                
-                # Clean up
-                self.stop_playback()
-                
-                if callback:
-                    callback(True, "Playback completed")
+                # Play it and wait for playback to complete
+                self.play_buffer(audio_data, callback)
                     
             except Exception as e:
                 self.logger.error(f"Error in async speak: {e}")
@@ -367,9 +663,34 @@ class AudioController:
         self.update_callback = update_callback
         self.current_text = ""
         self.current_speed = 1.0
+        self._last_pcm = None  # ((text, speed), wav bytes) of the last synthesis, for Repeat
     
-    def play_text(self, text, speed=1.0):
-        """Play text with given speed"""
+    def play_text_buffer(self, text, speed=1.0):
+        """
+        Synthesize text to in-memory WAV audio, reusing the last result for the same text and speed
+        Args:
+            text (str): Text to convert
+            speed (float): Speaking rate multiplier
+        Returns:
+            bytes: WAV file contents, or None on failure
+        """
+        key = (text, speed)
+        if self._last_pcm and self._last_pcm[0] == key:
+            return self._last_pcm[1]
+        
+        audio_data = self.tts.text_to_wav_bytes(text, speed)
+        if audio_data:
+            self._last_pcm = (key, audio_data)
+        return audio_data
+    
+    def play_text(self, text, speed=1.0, audio_future=None):
+        """
+        Play text with given speed
+        Args:
+            text (str): Text to speak
+            speed (float): Speaking rate multiplier
+            audio_future (Future): Pending or finished synthesis of this text, if already started
+        """
         self.current_text = text
         self.current_speed = speed
         
@@ -377,10 +698,29 @@ class AudioController:
             if self.update_callback:
                 self.update_callback('completed' if success else 'error', message)
         
+        def synthesize_and_play():
+            audio_data = None
+            if audio_future is not None:
+                try:
+                    audio_data = audio_future.result()
+                except Exception as e:
+                    # Prefetch was dropped or failed - synthesize here instead
+                    self.tts.logger.warning(f"Prefetched audio unavailable, synthesizing again: {e!r}")
+                if audio_data:
+                    self._last_pcm = ((text, speed), audio_data)
+            if not audio_data:
+                audio_data = self.play_text_buffer(text, speed)
+            if not audio_data:
+                playback_callback(False, "Failed to generate audio")
+                return
+            self.tts.play_buffer(audio_data, playback_callback)
+        
         if self.update_callback:
             self.update_callback('playing', f"Playing text at {speed}x speed")
         
-        return self.tts.speak_text_async(text, speed, playback_callback)
+        thread = threading.Thread(target=synthesize_and_play, daemon=True)
+        thread.start()
+        return True
     
     def pause(self):
         """Pause current playback"""